@@ -9,13 +9,18 @@ import re
 import time
 
 from evennia import default_cmds
-from world import status_functions
+from world import status_functions, exp_ledger
 from evennia import utils
 from evennia.utils.logger import log_info
 
 from world.rules import damage, actions, body, skills
 from utils.um_utils import highlighter
+from utils.permission_flags import is_developer
 from utils.emote import um_emote
+from utils import cmd_metrics, cmd_profiler, cmd_recorder
+
+# evennia's numbered search syntax, IE: "2-droid"
+_RE_NUMBERED_SEARCH = re.compile(r"^\d+-")
 
 
 class Command(default_cmds.MuxCommand):
@@ -312,6 +317,10 @@ class Command(default_cmds.MuxCommand):
 
     def at_post_cmd(self):
         """This hook is called after the command has finished executing (after self.func())."""
+        # pause a profile of this command, utils.cmd_profiler
+        if cmd_profiler.SESSION:
+            cmd_profiler.stop(self)
+
         # get the caller's statuses
         caller_statuses = self.caller.statuses()
 
@@ -321,6 +330,10 @@ class Command(default_cmds.MuxCommand):
             if self == status['cmd']:
                 return
 
+        # the command's run is complete, it did not defer
+        if cmd_profiler.SESSION:
+            cmd_profiler.stop(self, run_complete=True)
+
         # This command is not a deferred command. Clean up attributes changed during command run.
         self.set_instance_attributes()
 
@@ -350,6 +363,8 @@ class Command(default_cmds.MuxCommand):
         if defer_successful:
             self.start_message()
 
+    @cmd_profiler.profile_pre_cmd
+    @cmd_metrics.measured('parse')
     def at_pre_cmd(self):
         """
         Important
@@ -386,6 +401,9 @@ class Command(default_cmds.MuxCommand):
             Evennia note: at_pre_cmd(): If this returns anything truthy, execution is aborted.
             Behavior note: returning anything stops the exection of the command.
         """
+        # record the command, utils.cmd_recorder
+        if cmd_recorder.RECORDER:
+            cmd_recorder.RECORDER.record(self)
         caller = self.caller
         self.set_instance_attributes()
         # stop the command if basic requirements are not met
@@ -448,6 +466,9 @@ class Command(default_cmds.MuxCommand):
                         return True  # stop the command
         if target:  # a target(s) were found
             self.target = target  # target is good, collect an instance of it in Command
+            # catch up on regeneration the target missed while idle
+            if hasattr(target, 'catch_up_regeneration'):
+                target.catch_up_regeneration()
         else:  # no target was found
             if self.target_required:
                 if len(target_name) == 0:  # caller provided no target name
@@ -487,6 +508,7 @@ class Command(default_cmds.MuxCommand):
         self.start_time = time.time()  # time the command starts
         return super().at_pre_cmd()
 
+    @cmd_metrics.measured('requirements')
     def requirements(self, basic=False, custom=False, target=False):
         """Verify requirements for command are met.
 
@@ -565,6 +587,7 @@ class Command(default_cmds.MuxCommand):
     def successful(self, success=True):
         """Record if the command was successful."""
 
+    @cmd_metrics.measured('defer')
     def defer(self, defer_time=3, status_type='busy'):
         """
         Defer or delay the action of a command.
@@ -663,7 +686,7 @@ class Command(default_cmds.MuxCommand):
         """
         if not target:
             target = self.caller
-        if utils.inherits_from(target, 'typeclasses.characters.Character'):
+        if getattr(target, 'is_character', False):
             return target.status_stop_request(status_type, stop_message, stop_cmd)
         else:
             return False
@@ -953,10 +976,7 @@ class Command(default_cmds.MuxCommand):
 
         # for unit tests add support for always hit or always miss
         if hasattr(caller, 'account'):  # caller has an account
-            perm_str = ''
-            if hasattr(caller.account, 'permissions'):
-                perm_str = str(caller.account.permissions)
-            if 'developer' in perm_str:  # if the caller is a developer
+            if is_developer(caller):  # if the caller is a developer, from cached permission flags
                 if 'unit_test_succ' in self.switches:  # attack always succeeds
                     result = 95
                     action_result = 100
@@ -1022,7 +1042,7 @@ class Command(default_cmds.MuxCommand):
         self.send_emote(caller_msg, receivers=caller)
         # only show message to target if it is a Character
         # should be switched to if controlled by a session
-        if utils.inherits_from(target, 'typeclasses.characters.Character'):
+        if getattr(target, 'is_character', False):
             self.send_emote(target_msg, receivers=target)
         # message the location
         caller.location.emote_contents(room_msg, caller, target, exclude=(target, caller))
@@ -1142,7 +1162,9 @@ class Command(default_cmds.MuxCommand):
             target_number = 0
         # if set search the caller only, if not search the room
         if self.search_caller_only:
-            target = caller.search(target_name, quiet=True, candidates=caller.contents)
+            target = self.indexed_search(target_name, (caller,), target_number + 1)
+            if not target:
+                target = caller.search(target_name, quiet=True, candidates=caller.contents)
         else:  # search somewhere other than caller
             standard_search = True  # a stanard search is needed
             target_name, location_name = self.split_target_name(target_name)
@@ -1152,13 +1174,72 @@ class Command(default_cmds.MuxCommand):
                 search_candidates = self.target_search(location_name)
                 # search for the target
                 if search_candidates:  # caller provided useable search location
-                    target = caller.search(target_name, quiet=True, candidates=search_candidates.contents)
+                    target = self.indexed_search(target_name, (search_candidates,),
+                                                 target_number + 1)
+                    if not target:
+                        target = caller.search(target_name, quiet=True,
+                                               candidates=search_candidates.contents)
             if standard_search:  # a standard search is required.
-                target = caller.search(target_name, quiet=True, candidates=search_candidates)
+                # only the default candidates are indexed, the caller's location and contents
+                if search_candidates is None:
+                    target = self.indexed_search(target_name, (caller.location, caller),
+                                                target_number + 1)
+                if not target:
+                    target = caller.search(target_name, quiet=True, candidates=search_candidates)
         if target:  # a target(s) was found
             target = target[target_number]  # get the correct target number
             return target
 
+    def indexed_search(self, target_name, containers, min_results=1):
+        """
+        Search for a target with the search index of containers.
+        Narrows the candidates passed to caller.search, to objects with
+            words that start with each word in the target name.
+
+        Arguments:
+            target_name (str): name of the target, without a leading number.
+            containers (iterable): objects whose contents are searched.
+                IE: (caller.location, caller)
+            min_results (int): number of results the caller needs.
+                "2 droid" requires 2 results.
+
+        Returns:
+            target (list): the one object caller.search found in the narrowed candidates.
+                An empty list if the index can not answer the search.
+
+        Notes:
+            An empty return does not mean the target does not exist.
+                Searches the index can not answer, like dbrefs, 'me' and 'here'
+                return an empty list. Callers should fall back to a standard
+                caller.search when nothing is returned.
+            Only unique matches are answered. Numbered searches, "2 droid" or
+                "2-droid", and searches matching more than one object are left to
+                the standard search, which decides the order of a multimatch.
+            The index candidates include every object the standard search can
+                match by name, so a unique match here is unique there.
+            Recogs of the caller are searched as a per caller overlay.
+            Refer to typeclasses.mixins.SearchIndex
+
+        Unit Tests:
+            typeclasses.tests.TestSearchIndex
+        """
+        # numbered searches are ordered by the standard search
+        if min_results > 1 or _RE_NUMBERED_SEARCH.match(target_name):
+            return []
+        caller = self.caller
+        candidates = []
+        for container in containers:
+            search_index = getattr(container, 'search_index', None)
+            if search_index is None:  # container does not support indexing
+                return []
+            candidates.extend(search_index.search(target_name, looker=caller))
+        if not candidates:
+            return []
+        target = caller.search(target_name, quiet=True, candidates=candidates)
+        if len(target) != 1:  # not found or a multimatch
+            return []
+        return target
+
     def detail_search(self):
         """Use caller's command arguments to search for a room detail.
 
@@ -1399,19 +1480,23 @@ class Command(default_cmds.MuxCommand):
         # convert it to a float
         if isinstance(end_time, str):
             end_time = float(end_time)
-        # get the skill set instance than the exp value for this command
-        skill_set = getattr(caller.skills, skill_set_name, False)
-        if not skill_set:
-            return 0
-        if skill_name+"_exp" not in skill_set:
-            return 0
         # calculate the experience gained (time the command ran)
-        # record the experience gained
+        # record the experience gained, it is written to the database by world.exp_ledger
         exp_gained = end_time - start_time
-        skill_set[skill_name+"_exp"] += exp_gained
+        exp_total = exp_ledger.add_exp(caller, skill_set_name, skill_name, exp_gained)
+        if exp_total is None:  # the caller does not have this skill
+            return 0
+        # skills already ready for a new rank need no threshold check
+        if skill_name in caller.increasable_skills:
+            return exp_gained
         # message caller if new rank is possible
-        exp_required = skills.rank_requirement(skill_set[skill_name]+1, self.learn_diff)
-        if exp_required <= skill_set[skill_name+"_exp"] and skill_set[skill_name+"_msg"]:
-            caller.msg(f'You have enough experience with {skill_name} to learn rank {skill_set[skill_name]+1}.')
-            skill_set[skill_name+"_msg"] = 0
+        skill_set = getattr(caller.skills, skill_set_name)
+        skill_info = skills.get_skill(skill_name)
+        learn_diff = skill_info.learn_diff if skill_info else self.learn_diff
+        exp_required = skills.rank_requirement(skill_set[skill_name]+1, learn_diff)
+        if exp_required <= exp_total:
+            skills.update_increasable(caller, skill_name, True)
+            if skill_set[skill_name+"_msg"]:
+                caller.msg(f'You have enough experience with {skill_name} to learn rank {skill_set[skill_name]+1}.')
+                skill_set[skill_name+"_msg"] = 0
         return exp_gained
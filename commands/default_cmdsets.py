@@ -22,7 +22,7 @@ from commands.combat.evasion import EvasionCmdSet
 from commands.abilities.request import RequestCmdSet
 from commands.combat.one_handed import OneHandedCmdSet
 from typeclasses.equipment.clothing import UMClothedCharacterCmdSet
-from commands.standard_cmds import StandardCmdsCmdSet, UMRPSystemCmdSet, UMExtendedRoomCmdSet
+from commands.standard_cmds import StandardCmdsCmdSet, UMRPSystemCmdSet, UMExtendedRoomCmdSet, CmdQuell
 from typeclasses.equipment.wieldable import WieldableCmdSet
 
 
@@ -152,6 +152,7 @@ class AccountCmdSet(default_cmds.AccountCmdSet):
         #
         # any commands you add below will overload the default ones.
         #
+        self.add(CmdQuell)
 
 
 class UnloggedinCmdSet(default_cmds.UnloggedinCmdSet):
@@ -1,7 +1,9 @@
 from commands.command import Command
 from evennia import CmdSet
+from evennia.utils import evtable
 from world.rules import stats
 from utils.um_utils import string_to_data
+from utils import cmd_metrics, cmd_profiler, cmd_recorder
 
 
 class DeveloperCmdSet(CmdSet):
@@ -26,6 +28,11 @@ class DeveloperCmdSet(CmdSet):
         self.add(CmdViewObj)
         self.add(CmdContrlOther)
         self.add(CmdCmdFuncTest)
+        self.add(CmdBenchParser)
+        self.add(CmdCmdMetrics)
+        self.add(CmdProfileCmd)
+        self.add(CmdRecordCmds)
+        self.add(CmdBenchHands)
 
 
 class DeveloperCommand(Command):
@@ -697,3 +704,217 @@ class CmdCmdAttrTest(DeveloperCommand):
         for argument in self.rhslist:
             value = getattr(self, argument, '!Missing!')
             self.caller.msg(f"{argument}: {value}")
+
+
+class CmdBenchParser(DeveloperCommand):
+    """
+    Compare parse time of the project command parser against evennia's default parser.
+
+    Usage:
+        bench_parser [iterations] = line, line, line
+        bench_parser = look, get sword, 2-look
+
+    Notes:
+        Lines are parsed against the caller's current merged cmdset.
+        iterations defaults to 1000 parses of each line, per parser.
+        Times are displayed in microseconds per parse.
+        The same column displays if both parsers matched the same commands.
+        Refer to server.conf.cmdparser.benchmark
+    """
+    key = "bench_parser"
+
+    def func(self):
+        # import here to keep the parser's settings import out of command loading
+        from server.conf import cmdparser
+        caller = self.caller
+        lines = self.rhslist
+        if not lines:
+            caller.msg("Provide lines to parse. Example: bench_parser = look, get sword")
+            return
+        iterations = self.lhs.strip()
+        iterations = int(iterations) if iterations.isdigit() else 1000
+        cmdset = self.cmdset if self.cmdset else caller.cmdset.current
+        results = cmdparser.benchmark(lines, cmdset, caller, iterations)
+        for line, result in results.items():
+            default_time = result['default'] * 1000000
+            trie_time = result['trie'] * 1000000
+            caller.msg(f"{line} | default: {default_time:.2f}us | trie: {trie_time:.2f}us | "
+                       f"same: {result['same']}")
+
+
+class CmdCmdMetrics(DeveloperCommand):
+    """
+    View command latency and query count percentiles.
+
+    Usage:
+        cmd_metrics [command key]
+        cmd_metrics/queries punch
+        cmd_metrics/reset
+
+    Switches:
+        queries, display django query counts instead of wall time.
+        reset, remove all measurements.
+        on, enable measurement.
+        off, disable measurement.
+
+    Notes:
+        Times are displayed in milliseconds.
+        Phases are parse, requirements, defer, completion, deferred_action and emote.
+        Refer to utils.cmd_metrics for what each phase measures.
+    """
+    key = "cmd_metrics"
+
+    def func(self):
+        caller = self.caller
+        switches = self.switches
+        if 'reset' in switches:
+            cmd_metrics.reset()
+            caller.msg("Command metrics reset.")
+            return
+        if 'on' in switches or 'off' in switches:
+            cmd_metrics.enable('on' in switches)
+            caller.msg(f"Command metrics enabled: {cmd_metrics.ENABLED}.")
+            return
+        metric = 'queries' if 'queries' in switches else 'time'
+        cmd_key = self.args.strip()
+        cmd_keys = (cmd_key,) if cmd_key else sorted(cmd_metrics.METRICS)
+        rows = []
+        for key in cmd_keys:
+            for phase in cmd_metrics.PHASES:
+                result = cmd_metrics.percentiles(key, phase, metric)
+                if not result:
+                    continue
+                values = [result[percent] for percent in ('p50', 'p95', 'p99')]
+                if metric == 'time':  # microseconds to milliseconds
+                    values = [f"{value / 1000:.3f}" for value in values]
+                rows.append([key, phase, result['count']] + values)
+        if not rows:
+            caller.msg("No command metrics recorded.")
+            return
+        unit = "queries" if metric == 'queries' else "ms"
+        header = ("command", "phase", "count", f"p50 {unit}", f"p95 {unit}", f"p99 {unit}")
+        # evtable accepts columns
+        columns = [list(column) for column in zip(*rows)]
+        caller.msg(str(evtable.EvTable(*header, table=columns, border=None, pad_left=4)))
+
+
+class CmdProfileCmd(DeveloperCommand):
+    """
+    Profile the next runs of a command, or the next seconds of a Character's commands.
+
+    Usage:
+        profile_cmd <command key> [= runs]
+        profile_cmd/char <character> [= seconds]
+        profile_cmd/stop
+
+    Examples:
+        profile_cmd look = 20  # profile the next 20 runs of look
+        profile_cmd/char Char2 = 60  # profile Char2's commands for 60 seconds
+
+    Switches:
+        char, profile a Character instead of a command.
+        stop, end the running profile now.
+
+    Notes:
+        runs defaults to 10, seconds defaults to 30.
+        When done a .pstats file is written to the server's log directory, in
+            the profiles folder. A summary of the top 20 functions is sent to you.
+        Only one profile can run at a time.
+        Refer to utils.cmd_profiler
+    """
+    key = "profile_cmd"
+
+    def func(self):
+        caller = self.caller
+        if 'stop' in self.switches:
+            if not cmd_profiler.end_session():
+                caller.msg("No profile is running.")
+            return
+        name = self.lhs.strip()
+        amount = self.rhs.strip() if self.rhs else ''
+        amount = int(amount) if amount.isdigit() else None
+        if not name:
+            caller.msg("Provide a command key or Character to profile.")
+            return
+        if 'char' in self.switches:
+            char = caller.search(name, quiet=True)
+            if not char:
+                caller.msg(f"You can not find {name}.")
+                return
+            char = char[0]
+            session = cmd_profiler.start_session(caller, char=char, seconds=amount or 30)
+        else:
+            session = cmd_profiler.start_session(caller, cmd_key=name, runs=amount or 10)
+        if not session:
+            caller.msg("A profile is already running. Use profile_cmd/stop to end it.")
+            return
+        if session.cmd_key:
+            caller.msg(f"Profiling the next {session.runs} runs of {session.cmd_key}.")
+        else:
+            caller.msg(f"Profiling {session.char.get_display_name(caller)} for "
+                       f"{session.seconds} seconds.")
+
+
+class CmdRecordCmds(DeveloperCommand):
+    """
+    Record the commands Characters issue, to replay them in a test world.
+
+    Usage:
+        record_cmds [name]
+        record_cmds/stop
+
+    Switches:
+        stop, stop the running recording.
+
+    Notes:
+        Recordings are written to the server's log directory, in the recordings folder.
+        Characters are recorded as numbered slots, their names are not recorded.
+        Replay a recording with utils.cmd_recorder.replay
+        Refer to utils.cmd_recorder
+    """
+    key = "record_cmds"
+
+    def func(self):
+        caller = self.caller
+        if 'stop' in self.switches:
+            path, count = cmd_recorder.stop_recording()
+            if path:
+                caller.msg(f"Recorded {count} commands to {path}.")
+            else:
+                caller.msg("No recording is running.")
+            return
+        recorder = cmd_recorder.start_recording(self.args.strip())
+        if not recorder:
+            caller.msg("A recording is already running. Use record_cmds/stop to end it.")
+            return
+        caller.msg(f"Recording commands to {recorder.path}.")
+
+
+class CmdBenchHands(DeveloperCommand):
+    """
+    Compare the time of hand queries resolved by held_items against a search per hand.
+
+    Usage:
+        bench_hands [iterations]
+        bench_hands 500
+
+    Notes:
+        Queries the caller's hands, hold or wield items first.
+        iterations defaults to 1000 queries, per method.
+        Times are displayed in microseconds per query.
+        The same column displays if both methods returned the same result.
+        Refer to typeclasses.characters.benchmark_hands
+    """
+    key = "bench_hands"
+
+    def func(self):
+        from typeclasses.characters import benchmark_hands
+        caller = self.caller
+        iterations = self.args.strip()
+        iterations = int(iterations) if iterations.isdigit() else 1000
+        results = benchmark_hands(caller, iterations)
+        for query, result in results.items():
+            search_time = result['search'] * 1000000
+            map_time = result['map'] * 1000000
+            caller.msg(f"{query} | search: {search_time:.2f}us | map: {map_time:.2f}us | "
+                       f"same: {result['same']}")
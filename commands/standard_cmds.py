@@ -3,21 +3,25 @@ import math
 from datetime import timedelta
 
 from evennia.utils import evtable, evmore
-from evennia.utils.utils import inherits_from, delay, iter_to_str
+from evennia.utils.utils import iter_to_str
 from evennia import default_cmds
 from evennia.contrib import rpsystem, extended_room
 from evennia import CmdSet
 from evennia.commands.default.help import CmdHelp as EvCmdHelp
 from evennia.commands.default.system import CmdObjects, CmdTime as EvCmdTime
 from evennia.commands.default.general import CmdLook as EvCmdLook
+from evennia.commands.default.account import CmdQuell as EvCmdQuell
 from evennia.utils.eveditor import EvEditor
 
 from commands.command import Command
 from world.rules import stats, skills
+from world import exp_ledger
 from utils.um_utils import highlighter, error_report
 from typeclasses.exits import STANDARD_EXITS
+from typeclasses.scripts import get_learning_queue
 from world.rules.body import CHARACTER_CONDITIONS
 from world.status_functions import status_delay_get, complete, STATUS_TYPES, get_status
+from utils import permission_flags
 
 
 class StandardCmdsCmdSet(default_cmds.CharacterCmdSet):
@@ -180,15 +184,10 @@ class CmdSkills(Command):
                     skill_title = highlighter(skill_name, click_cmd="help "+skill_name)
                     known_skills.append(skill_title)
                     known_skills_ranks.append(skill_set[skill_name])
-                    known_skills_exp.append(math.floor(skill_set[skill_name+'_exp']))
-                    # get the command instance for the skill
-                    for cmd_set in caller.cmdset.get():
-                        cmd_inst = cmd_set.get(skill_name)
-                        if cmd_inst:
-                            break
+                    known_skills_exp.append(math.floor(exp_ledger.get_exp(caller, set_name, skill_name)))
                     # get exp required for next rank in this skill
                     exp_required = skills.rank_requirement(skill_set[skill_name]+1,
-                                                           cmd_inst.learn_diff)
+                                                           skills.get_skill(skill_name).learn_diff)
                     known_skills_next_rank.append(exp_required)
             # display the skill if it has ranks or skill points
             if skill_points or known_skills:
@@ -347,29 +346,14 @@ class CmdLearn(Command):
         single_skill = args.replace('?', '') if args.endswith('?') else False
         # create a list of skills that have an increase available
         increaseable_skills = {}
-        for skill_set_name, skill_names in skills.SKILLS.items():
-            skill_set = getattr(caller.skills, skill_set_name, False)
-            for skill_name in skill_names:
-                if skill_name == 'skill_points':  # skip skill points attr
-                    continue
-                if caller_learning:  # skip skill currently being learned
-                    if skill_name == caller_learning.get('skill_name'):
-                        continue
-                # get an instance of the command
-                for set in caller.cmdset.get():
-                    cmd_inst = set.get(skill_name)
-                    if cmd_inst:
-                        break
-                exp_required = skills.rank_requirement(skill_set[skill_name]+1,
-                                                       cmd_inst.learn_diff)
-                # rank 0 commands require skill points to purchase
-                if skill_set[skill_name] == 0:
-                    increase_resource = skill_set['skill_points']
-                else:
-                    increase_resource = skill_set[skill_name+'_exp']
-                # If the skill is ready for an increase, add it to the list
-                if increase_resource >= exp_required:
-                    increaseable_skills.update({skill_name: skill_set[skill_name]+1})
+        caller_increasable = caller.increasable_skills  # maintained as experience is gained
+        learning_skill = caller_learning.get('skill_name') if caller_learning else None
+        for skill_name in skills.SKILL_NAMES:
+            # skip skills not ready and the skill currently being learned
+            if skill_name not in caller_increasable or skill_name == learning_skill:
+                continue
+            skill_set = getattr(caller.skills, skills.get_skill(skill_name).skill_set)
+            increaseable_skills.update({skill_name: skill_set[skill_name]+1})
         if args:  # check if argument is ready for a rank increase
             if not caller.ready():  # stop the if that caller is not ready
                 return False
@@ -426,22 +410,20 @@ class CmdLearn(Command):
         rank = None
         # get the learn time
         learn_time = skills.learn_time(caller, skill_name)
-        # create a persistent task
-        task = delay(learn_time, skills.learn, caller.dbref, skill_name, persistent=True)
         # get the time learning will complete
         comp_date = time.time() + learn_time
         # get the rank this skill is upgrading to
-        for skill_set_name, skill_names in skills.SKILLS.items():
-            if skill_name in skill_names:
-                skill_set = getattr(caller.skills, skill_set_name, False)
-                rank = skill_set[skill_name] + 1
+        skill_info = skills.get_skill(skill_name)
+        if skill_info:
+            rank = getattr(caller.skills, skill_info.skill_set)[skill_name] + 1
         if not rank:
             err_msg = f"Command learn, caller: {caller.id} | " \
                       f"failed to find skill {skill_name} in skills."
             error_report(err_msg, caller)
             return False
+        # queue the rank increase, world.rules.skills.learn is called when it is due
+        get_learning_queue().enqueue(caller, skill_name, learn_time)
         caller.condition.learning = {
-                            'task_id': task.get_id(),
                             'comp_date': comp_date,
                             'skill_name': skill_name,
                             'rank': rank
@@ -474,6 +456,8 @@ class CmdStatus(Command):
 
     def func(self):
         caller = self.caller
+        # catch up on regeneration missed while idle
+        caller.catch_up_regeneration()
         # display name and appearance
         caller.msg("|/", force=True)
         caller.msg(f"Statistics for: |w{caller.name.capitalize()}|n", force=True)
@@ -541,6 +525,8 @@ class CmdCondition(Command):
 
     def func(self):
         caller = self.caller
+        # catch up on regeneration missed while idle
+        caller.catch_up_regeneration()
 
         # display name and appearance
         caller.msg("|/", force=True)
@@ -740,10 +726,10 @@ class CmdLook(EvCmdLook, Command):
         self.msg((caller.at_look(target), {"type": "look"}), options=None)
 
         # if the character is looking at something other than the room.
-        if not inherits_from(target, "typeclasses.rooms.Room"):
+        if not getattr(target, 'is_room', False):
 
             # message objects in location of the callers look
-            if inherits_from(target, "typeclasses.exits.Exit"):
+            if getattr(target, 'is_exit', False):
                 if target.key in STANDARD_EXITS:  # if the target is a standard exit
                     room_msg = f"/Me looks /target."
                 else:
@@ -1646,6 +1632,10 @@ class CmdSdesc(rpsystem.CmdSdesc):
     locks = "perm(Builder)"
     help_category = "Building"
 
+    def func(self):
+        super().func()
+        self.caller.reindex_names()  # sdesc changed, update location's search index
+
 
 class CmdMask(rpsystem.CmdMask):
     # rpsystem overriden CmdMask
@@ -1661,6 +1651,14 @@ class CmdEmote(rpsystem.CmdEmote, Command):
     pass
 
 
+class CmdQuell(EvCmdQuell):
+    # evennia's quell and unquell, invalidate cached access results as permissions in use change
+
+    def func(self):
+        super().func()
+        permission_flags.invalidate()
+
+
 class UMExtendedRoomCmdSet(CmdSet):
     """
     Overridden extended_room system's commands.
@@ -1680,6 +1678,7 @@ def _clear_ext_room_cache(obj):
     """By deleteting the caches we force a re-load."""
     obj.ndb.last_season = None
     obj.ndb.last_timeslot = None
+    obj.clear_appearance_cache()  # room appearance is cached upon the description
 
 
 def _desc_edit_complete_msg(caller):
@@ -1687,7 +1686,7 @@ def _desc_edit_complete_msg(caller):
 
     target = caller.db.desc_editing_target
 
-    if inherits_from(target, "typeclasses.rooms.Room"):  # if the target is a room
+    if getattr(target, 'is_room', False):  # if the target is a room
         message_provided = False
         for season in caller.db.desc_editing_seasons:
             seasonal_desc = target.attributes.get(f'{season}_desc', False)
@@ -1704,7 +1703,7 @@ def _desc_load(caller):
 
     obj = caller.db.desc_editing_target
 
-    if inherits_from(obj, "typeclasses.rooms.Room"):  # object is a room
+    if getattr(obj, 'is_room', False):  # object is a room
         if caller.db.desc_editing_seasons:  # use the first season if one exists
             return obj.attributes.get(f'{caller.db.desc_editing_seasons[0]}_desc', '')
         else:  # if no seasons return the general description
@@ -1721,7 +1720,7 @@ def _desc_save(caller, buf):
 
     obj = caller.db.desc_editing_target
 
-    if inherits_from(obj, "typeclasses.rooms.Room"):  # object is a room
+    if getattr(obj, 'is_room', False):  # object is a room
         if caller.db.desc_editing_seasons:
             for season in caller.db.desc_editing_seasons:
                 obj.attributes.add(f'{season}_desc', buf)
@@ -1859,7 +1858,7 @@ class CmdExtendedRoomDesc(extended_room.CmdExtendedRoomDesc, Command):
         caller.db.desc_editing_target = target
         caller.db.desc_editing_seasons = []
         # if the target is a room
-        if inherits_from(target, "typeclasses.rooms.Room"):
+        if getattr(target, 'is_room', False):
             # gather seasons to edit, if any
             for switch in self.switches:
                 if switch in self.seasons:
@@ -1874,7 +1873,7 @@ class CmdExtendedRoomDesc(extended_room.CmdExtendedRoomDesc, Command):
 
         # create a list of descriptions to edit via command line args
         desc_to_edit = []
-        if inherits_from(target, "typeclasses.rooms.Room"):  # if the target is a room
+        if getattr(target, 'is_room', False):  # if the target is a room
             for season in caller.db.desc_editing_seasons:
                 desc_to_edit.append(f'{season}_desc')
             _clear_ext_room_cache(target)  # clear the room's desc cache to prep for change
@@ -1,9 +1,12 @@
 import time
+from unittest.mock import patch
 
 from evennia import create_object
 from evennia.utils import create
 
 from typeclasses.objects import Object
+from typeclasses.characters import benchmark_hands
+from typeclasses.scripts import get_learning_queue
 from typeclasses.equipment import clothing
 from commands import standard_cmds, developer_cmds
 from utils.unit_test_resources import UniqueMudCmdTest
@@ -11,6 +14,8 @@ from utils.emote import replace_cap
 from world.rules.stats import STATS, STAT_MAP_DICT
 from world.rules.body import HUMANOID_BODY
 from world.rules.actions import COST_LEVELS
+from world.rules import skills
+from world import exp_ledger
 from utils.element import Element
 
 ANSI_RED = "\033[1m" + "\033[31m"
@@ -2262,6 +2267,7 @@ class TestCommands(UniqueMudCmdTest):
         arg = f"/r gain_exp, char2, cmd_type:unarmed, end_time:{end_time}, skill_name:punch"
         wnt_msg = "gain_exp returned: 3.0"
         self.call(command(), arg, wnt_msg)
+        exp_ledger.flush()  # write experience held in the ledger
         self.assertTrue(self.char1.skills.unarmed.punch_exp > 3)
         self.assertTrue(self.char1.skills.unarmed.punch_exp < 3.5)
         self.char1.skills.unarmed.punch_exp = 0
@@ -2271,6 +2277,7 @@ class TestCommands(UniqueMudCmdTest):
         arg = f"/r gain_exp, char2, cmd_type:evasion, end_time:{end_time}, skill_name:dodge"
         wnt_msg = "gain_exp returned: 3.0"
         self.call(command(), arg, wnt_msg)
+        exp_ledger.flush()  # write experience held in the ledger
         self.assertTrue(self.char1.skills.evasion.dodge_exp > 3)
         self.assertTrue(self.char1.skills.evasion.dodge_exp < 3.5)
         self.char1.skills.evasion.dodge_exp = 0
@@ -2278,12 +2285,14 @@ class TestCommands(UniqueMudCmdTest):
         command = developer_cmds.CmdMultiCmd
         arg = "= punch char2, complete_cmd_early"
         self.call(command(), arg)
+        exp_ledger.flush()  # write experience held in the ledger
         self.assertTrue(self.char1.skills.unarmed.punch_exp > 0)
         self.char1.skills.unarmed.punch_exp = 0
         # Run the dodge command. Complete early without actually dodging
         command = developer_cmds.CmdMultiCmd
         arg = "= dodge, complete_cmd_early"
         self.call(command(), arg)
+        exp_ledger.flush()  # write experience held in the ledger
         self.assertTrue(self.char1.skills.evasion.dodge_exp == 0)
         self.char1.skills.evasion.dodge_exp = 0
         # test a succesful dodge.
@@ -2292,6 +2301,7 @@ class TestCommands(UniqueMudCmdTest):
         self.call(command(), arg, caller=self.char2)
         arg = "= punch char2, complete_cmd_early"
         self.call(command(), arg)
+        exp_ledger.flush()  # write experience held in the ledger
         self.assertTrue(self.char2.skills.evasion.dodge_exp > 0)
         # test message on rank available.
         command = developer_cmds.CmdCmdFuncTest
@@ -2409,7 +2419,6 @@ class TestLearn(UniqueMudCmdTest):
         self.call(command(), arg)
         learning_dict = self.char1.condition.learning
         self.assertTrue(isinstance(learning_dict.get('comp_date'), float))
-        self.assertTrue(isinstance(learning_dict.get('task_id'), int))
         self.assertTrue(isinstance(learning_dict.get('rank'), int))
         self.assertTrue(isinstance(learning_dict.get('skill_name'), str))
         self.task_handler.clock.advance(1801)
@@ -2426,15 +2435,39 @@ class TestLearn(UniqueMudCmdTest):
                   r"Learning will complete on \d+-\d+-\d+ \d+:\d+:\d+\.$"
         self.assertRegex(cmd_result, wnt_msg)
 
-    def test_task(self):
+    def test_learning_queue(self):
         self.char1.skills.unarmed.punch_exp = 600
+        self.char2.skills.unarmed.kick_exp = 600
         command = developer_cmds.CmdMultiCmd
         arg = "= learn punch, complete_cmd_early"
         self.call(command(), arg)
-        task_id = self.char1.condition.learning.get('task_id')
-        self.assertTrue(self.task_handler.exists(task_id))
+        self.call(command(), "= learn kick, complete_cmd_early", caller=self.char2)
+        queue = get_learning_queue()
+        self.assertEqual([entry[1:] for entry in queue.db.queue],
+                         [[self.char1.id, 'punch'], [self.char2.id, 'kick']])
+        # one delay is scheduled, for the earliest entry
+        self.assertEqual(queue.ndb.timer[0], queue.db.queue[0][0])
+        # a deleted Character's entry is dropped
+        self.char2.delete()
         self.task_handler.clock.advance(1801)
-        self.assertFalse(self.task_handler.exists(task_id))
+        self.assertEqual(self.char1.skills.unarmed.punch, 2)
+        self.assertFalse(queue.db.queue)
+        self.assertIsNone(queue.ndb.timer)
+        # learning tasks saved before the queue pass a dbref
+        skills.learn(self.char1.dbref, 'punch')
+        self.assertEqual(self.char1.skills.unarmed.punch, 3)
+        # an entry that fails is logged, the other entries complete
+        queue.enqueue(self.char1, 'kick', 0)
+        queue.enqueue(self.char1, 'punch', 0)
+        learn = skills.learn
+        with patch('world.rules.skills.learn', side_effect=lambda char, skill_name:
+                   learn(char, skill_name) if skill_name == 'punch' else 1 / 0):
+            with patch('typeclasses.scripts.logger.log_trace') as log_trace:
+                self.assertEqual(queue.drain(), 1)
+                log_trace.assert_called_once()
+        self.assertEqual(self.char1.skills.unarmed.punch, 4)
+        self.assertFalse(queue.db.queue)
+        self.assertIsNone(queue.ndb.timer)
 
     def test_single_skill(self):
         self.char1.skills.unarmed.punch_exp = 600
@@ -2446,6 +2479,38 @@ class TestLearn(UniqueMudCmdTest):
                   "Increase punch with learn punch."
         self.call(command(), arg, wnt_msg)
 
+    def test_increasable_skills(self):
+        char = self.char1
+        self.assertEqual(char.increasable_skills, set())
+        # skill points make rank 0 skills increasable
+        with patch.object(char, 'at_increasable_skills_change') as at_change:
+            self.assertEqual(skills.grant_skill_points(char, 'one_handed', 300), 300)
+            at_change.assert_called_once()
+        self.assertEqual(char.increasable_skills, {'stab'})
+        # gain_exp adds a skill when its threshold is crossed
+        char.skills.unarmed.punch_exp = 599
+        self.assertNotIn('punch', char.increasable_skills)
+        end_time = time.time() + 3.1
+        arg = f"/r gain_exp, char2, cmd_type:unarmed, end_time:{end_time}, skill_name:punch"
+        self.call(developer_cmds.CmdMultiCmd(), arg)
+        self.assertEqual(char.increasable_skills, {'stab', 'punch'})
+        # learn reads the set
+        wnt_msg = "Punch is ready for a new rank.\n" \
+                  "It will take 0:30:00 to learn this rank.\n" \
+                  "Increase punch with learn punch.\n" \
+                  "Stab is ready for a new rank."
+        self.call(developer_cmds.CmdMultiCmd(), "= learn", wnt_msg)
+        # learning a rank removes the skill
+        arg = "= learn punch, complete_cmd_early"
+        self.call(developer_cmds.CmdMultiCmd(), arg)
+        self.task_handler.clock.advance(1801)
+        self.assertEqual(char.skills.unarmed.punch, 2)
+        self.assertEqual(char.increasable_skills, {'stab'})
+        # the set is rebuilt from the Character's skills when deleted
+        char.skills.one_handed.skill_points = 0
+        del char.increasable_skills
+        self.assertEqual(char.increasable_skills, set())
+
 
 class TestStop(UniqueMudCmdTest):
     """Test the stop command"""
@@ -2886,3 +2951,247 @@ class TestCmdUniversalTime(UniqueMudCmdTest):
 
         # verify a cost has been taken
         self.assertTrue(self.char1.permission > 99.5)
+
+
+class TestCmdParser(UniqueMudCmdTest):
+
+    def test_cmdparser(self):
+        from evennia.commands import cmdparser as default_parser
+        from server.conf import cmdparser
+        from commands.default_cmdsets import CharacterCmdSet
+        from commands.standard_cmds import UMRPSystemCmdSet
+
+        cmdset = CharacterCmdSet()
+        lines = ('look', 'l here', 'get sword', 'stand', 'sit', 'say hello',
+                 'multi_cmd = look', 'not a command', '1-look', '')
+        # the trie parser matches as the default parser does
+        for line in lines:
+            default_matches = default_parser.cmdparser(line, cmdset, self.char1)
+            trie_matches = cmdparser.cmdparser(line, cmdset, self.char1)
+            self.assertEqual([(m[0], m[1], m[2].key) for m in default_matches],
+                             [(m[0], m[1], m[2].key) for m in trie_matches])
+        # the trie is cached per merged cmdset signature
+        trie = cmdparser.get_trie(cmdset, self.char1)
+        self.assertIs(cmdparser.get_trie(cmdset, self.char1), trie)
+        # adding or removing a cmdset builds a new trie
+        self.char1.cmdset.add(UMRPSystemCmdSet)
+        self.assertIsNot(cmdparser.get_trie(cmdset, self.char1), trie)
+        trie = cmdparser.get_trie(cmdset, self.char1)
+        self.char1.cmdset.remove(UMRPSystemCmdSet)
+        self.assertIsNot(cmdparser.get_trie(cmdset, self.char1), trie)
+        # benchmark reports both parsers
+        results = cmdparser.benchmark(('look',), cmdset, self.char1, iterations=2)
+        self.assertTrue(results['look']['same'])
+        # developer command displays the benchmark
+        command = developer_cmds.CmdBenchParser
+        self.call(command(), "2 = look", "look | default:")
+
+
+class TestCmdMetrics(UniqueMudCmdTest):
+
+    def test_cmd_metrics(self):
+        from utils import cmd_metrics
+
+        # histogram percentiles
+        histogram = cmd_metrics.Histogram()
+        for value in range(1, 1001):
+            histogram.record(value)
+        self.assertEqual(histogram.count, 1000)
+        for percent, wanted in ((50, 500), (95, 950), (99, 990)):
+            # values are within the histogram's bucket precision
+            self.assertTrue(abs(histogram.percentile(percent) - wanted) <= wanted * .04)
+        # measurement is off by default
+        self.assertFalse(cmd_metrics.ENABLED)
+        self.addCleanup(cmd_metrics.enable, False)
+        self.call(developer_cmds.CmdCmdMetrics(), "/on", "Command metrics enabled: True.")
+        # command phases are recorded
+        cmd_metrics.reset()
+        command = developer_cmds.CmdMultiCmd
+        self.call(command(), "= defer_cmd, complete_cmd_early")
+        for phase in ('parse', 'defer', 'completion'):
+            self.assertTrue(cmd_metrics.percentiles('defer_cmd', phase))
+        # the developer command displays percentiles
+        command = developer_cmds.CmdCmdMetrics
+        self.call(command(), "defer_cmd", "command")
+        self.call(command(), "/reset", "Command metrics reset.")
+        self.assertFalse(cmd_metrics.percentiles('defer_cmd', 'parse'))
+        # turning measurement off stops counting queries
+        self.call(command(), "/off", "Command metrics enabled: False.")
+        self.assertFalse(cmd_metrics._count_queries in cmd_metrics.connection.execute_wrappers)
+
+
+class TestCmdProfiler(UniqueMudCmdTest):
+
+    def test_cmd_profiler(self):
+        import os
+        import shutil
+        import tempfile
+        from utils import cmd_profiler
+
+        # write profiles to a temporary directory, removed after the test
+        profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profile_dir, ignore_errors=True)
+        patcher = patch.object(cmd_profiler, 'PROFILE_DIR', profile_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # no session, no profile
+        self.assertIsNone(cmd_profiler.SESSION)
+        # profile the next 2 runs of look
+        command = developer_cmds.CmdProfileCmd
+        self.call(command(), "look = 2", "Profiling the next 2 runs of look.")
+        self.assertEqual(cmd_profiler.SESSION.cmd_key, 'look')
+        # only one session at a time
+        self.call(command(), "look", "A profile is already running.")
+        self.call(standard_cmds.CmdLook(), "")
+        self.assertEqual(cmd_profiler.SESSION.completed_runs, 1)
+        # the second run ends the session, writes stats and a summary
+        cmd_result = self.call(standard_cmds.CmdLook(), "")
+        self.assertIsNone(cmd_profiler.SESSION)
+        self.assertTrue("Profile of cmd_look, 2 runs, saved to" in cmd_result)
+        stats_files = [name for name in os.listdir(profile_dir)
+                       if name.startswith('cmd_look_')]
+        self.assertTrue(stats_files)
+        # profile a Character for a number of seconds
+        self.call(command(), "/char Char2 = 5", "Profiling Char2")
+        self.char2.execute_cmd('look')
+        self.task_handler.clock.advance(6)
+        self.assertIsNone(cmd_profiler.SESSION)
+        self.assertTrue([name for name in os.listdir(profile_dir)
+                         if name.startswith(f'char_{self.char2.id}_')])
+        # stop with no session running
+        self.call(command(), "/stop", "No profile is running.")
+        # a cancelled deferred command ends it's run
+        from world import status_functions
+        session = cmd_profiler.start_session(self.char1, cmd_key='look', runs=1)
+        look = standard_cmds.CmdLook()
+        look.caller = self.char1
+        cmd_profiler.start(look)
+        status_functions.status_delay_set(self.char1, look, 3)
+        status_functions.complete(self.char1, 'busy', False)
+        self.assertIsNone(cmd_profiler.SESSION)
+        self.assertEqual(session.completed_runs, 1)
+        # command keys can not write outside of PROFILE_DIR
+        session = cmd_profiler.ProfileSession(self.char1, cmd_key='../../x y')
+        self.assertEqual(session.label, 'cmd_______x_y')
+
+
+class TestHeldItems(UniqueMudCmdTest):
+
+    def test_held_items(self):
+        char = self.char1
+        command = developer_cmds.CmdMultiCmd
+        self.call(command(), "= get sword, complete_cmd_early", caller=char)
+        self.call(command(), "= wield sword", "You wield a sword in your", caller=char)
+        # hand queries resolve items from the map, without a search
+        with patch.object(char, 'search') as search:
+            self.assertEqual(char.wielding(), [self.sword])
+            self.assertTrue(char.is_wielding(self.sword))
+            self.assertEqual(len(char.open_hands()), 1)
+            search.assert_not_called()
+        self.assertIs(char.held_items[self.sword.dbref], self.sword)
+        # the benchmark compares both methods
+        results = benchmark_hands(char, iterations=2)
+        self.assertTrue(results['open_hands']['same'])
+        self.assertTrue(results['wielding']['same'])
+        self.call(developer_cmds.CmdBenchHands(), "2", "open_hands | search:")
+        # deleting a held item empties the hand through Object.at_object_delete
+        sword_dbref = self.sword.dbref
+        self.sword.delete()
+        self.assertNotIn(sword_dbref, char.held_items)
+        for hand in char.hands():
+            self.assertNotEqual(hand.occupied, sword_dbref)
+            self.assertNotEqual(hand.wielding, sword_dbref)
+        self.assertEqual(len(char.open_hands()), 2)
+
+
+class TestLoadTest(UniqueMudCmdTest):
+
+    def test_load_test(self):
+        from utils import load_test
+
+        harness = load_test.LoadTest(characters=4, rooms=2, seed=1)
+        harness.build()
+        self.assertEqual(len(harness.chars), 4)
+        self.assertEqual(len(harness.rooms[0].exits), 2)
+        report = harness.run(seconds=20)
+        # the task handler's clock was restored
+        self.assertIsNot(self.task_handler.clock, harness.clock)
+        self.assertTrue(report['commands'])
+        mix_keys = {template.split(' ', 1)[0] for template, _ in load_test.COMMAND_MIX}
+        mix_keys.update(load_test.EXIT_NAMES)
+        self.assertTrue(set(report['latency']) <= mix_keys)
+        # every deferred command completed
+        self.assertFalse(harness.clock.getDelayedCalls())
+        self.assertTrue(report['completion_lag']['count'])
+        self.assertTrue("commands per second" in load_test.format_report(report))
+        # the same seed issues the same commands
+        commands = [harness.command(harness.chars[0]) for _ in range(5)]
+        harness.random.seed(1)
+        self.assertEqual(commands, [harness.command(harness.chars[0]) for _ in range(5)])
+        harness.cleanup()
+        self.assertFalse(harness.chars)
+
+
+class TestCmdRecorder(UniqueMudCmdTest):
+
+    def test_cmd_recorder(self):
+        import os
+        from utils import cmd_recorder
+
+        command = developer_cmds.CmdRecordCmds
+        self.call(command(), "/stop", "No recording is running.")
+        self.call(command(), "test_recording", "Recording commands to")
+        self.call(command(), "", "A recording is already running.")
+        self.call(standard_cmds.CmdLook(), "Char2")
+        self.call(standard_cmds.CmdLook(), "", caller=self.char2)
+        path = cmd_recorder.RECORDER.path
+        # developer commands are not recorded
+        self.call(command(), "/stop", "Recorded 2 commands to")
+        self.assertIsNone(cmd_recorder.RECORDER)
+        entries = cmd_recorder.load_recording(path)
+        self.assertEqual(len(entries), 2)
+        # Characters are recorded by slot, names are replaced
+        offset, char_slot, room_slot, raw_string = entries[0]
+        self.assertEqual(room_slot, 0)
+        self.assertNotIn('Char2', raw_string)
+        self.assertRegex(raw_string, r'^look loader\d$')
+        self.assertNotEqual(char_slot, entries[1][1])
+        # the slot table sizes the replay world
+        self.assertEqual(cmd_recorder.load_slots(path), (2, 1))
+        # replay in a fresh world
+        report = cmd_recorder.replay(path, speed=10)
+        self.assertEqual(report['characters'], 2)
+        self.assertEqual(report['commands'], 2)
+        self.assertEqual(report['latency']['look']['count'], 2)
+        os.remove(path)
+        # free text is scrubbed, emote references are kept
+        scrub = cmd_recorder.CommandRecorder.scrub
+        cmd = standard_cmds.CmdSay()
+        cmd.cmdstring = 'say'
+        self.assertEqual(scrub("say Hi there 42", cmd), "say xx xxxxx xx")
+        cmd = standard_cmds.CmdWhisper()
+        cmd.cmdstring = 'whisper'
+        self.assertEqual(scrub("whisper loader1 = a secret", cmd), "whisper loader1 = x xxxxxx")
+        cmd = standard_cmds.CmdEmote()
+        cmd.cmdstring = 'emote'
+        self.assertEqual(scrub("emote /me waves at /loader1", cmd), "emote /me xxxxx xx /loader1")
+        # commands without free text are not scrubbed
+        cmd = standard_cmds.CmdLook()
+        self.assertEqual(scrub("look loader1", cmd), "look loader1")
+        # recordings are always written to RECORD_DIR
+        recorder = cmd_recorder.start_recording('../../anonymize_test')
+        self.assertEqual(recorder.path,
+                         os.path.join(cmd_recorder.RECORD_DIR, 'anonymize_test.cmds.gz'))
+        # only Characters named in a command are given a slot
+        self.assertEqual(recorder.anonymize("look", self.room1), "look")
+        self.assertFalse(recorder.char_slots)
+        self.assertEqual(recorder.anonymize("look Char2", self.room1), "look loader0")
+        self.assertEqual(recorder.char_slots, {self.char2.id: 0})
+        # the room's name pattern is reused until a name changes
+        pattern = recorder.name_patterns[self.room1.id][2]
+        recorder.anonymize("look Char", self.room1)
+        self.assertIs(recorder.name_patterns[self.room1.id][2], pattern)
+        self.char2.usdesc = 'Droid'
+        self.assertEqual(recorder.anonymize("look droid", self.room1), "look loader0")
+        path, count = cmd_recorder.stop_recording()
+        os.remove(path)
@@ -20,16 +20,33 @@ def at_server_start():
     """
     This is called every time the server starts up, regardless of
     how it was shut down.
+
+    UniqueMud:
+        Moves Characters from their NaturalHealing scripts to the global
+            RegenerationService.
+        Starts the ReferenceSweeper, if it does not exist.
+        Builds the skill registry, world.rules.skills.SKILL_REGISTRY
+        Starts the LearningQueue, if it does not exist.
     """
-    pass
+    from typeclasses.scripts import (migrate_natural_healing, get_reference_sweeper,
+                                     get_learning_queue)
+    from world.rules import skills
+    migrate_natural_healing()
+    get_reference_sweeper()
+    get_learning_queue()
+    skills.build_skill_registry()
 
 
 def at_server_stop():
     """
     This is called just before the server is shut down, regardless
     of it is for a reload, reset or shutdown.
+
+    UniqueMud:
+        Writes experience held in the experience ledger, world.exp_ledger
     """
-    pass
+    from world import exp_ledger
+    exp_ledger.flush()
 
 
 def at_server_reload_start():
@@ -29,8 +29,182 @@ your settings file:
 
     COMMAND_PARSER = "server.conf.cmdparser.cmdparser"
 
+UniqueMud:
+    Behaves as evennia.commands.cmdparser.cmdparser, the default parser.
+    Instead of comparing the input to every key and alias of every command in
+    the merged cmdset, the names are stored in a trie (prefix tree).
+    Walking the trie with the input finds every name the input starts with,
+    in one pass over the input's characters.
+
+    A trie is built once per merged cmdset signature and cached,
+        see CmdsetTrie and get_trie.
+        The signature is the cmdset version, utils.cmdset_version, and who the
+        cmdset was merged for. It is read without walking the cmdset's commands.
+    Multimatch (1-look, 2-look) and Command.arg_regex are supported as the
+        default parser supports them.
+
+    Use benchmark to compare parse time per input line against the default parser.
+        The developer command bench_parser runs it against the caller's cmdset.
+
+    Unit Tests:
+        commands.tests.TestCmdParser
 """
 
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from evennia.commands import cmdparser as default_parser
+from evennia.commands.cmdparser import create_match, try_num_prefixes
+
+from utils import cmdset_version
+
+_CMD_IGNORE_PREFIXES = settings.CMD_IGNORE_PREFIXES
+
+# maximum number of merged cmdset tries stored
+TRIE_CACHE_SIZE = 256
+# signature: CmdsetTrie, oldest first
+_TRIE_CACHE = OrderedDict()
+
+
+class CmdsetTrie:
+    """
+    A prefix tree of the names (keys and aliases) of commands in a cmdset.
+
+    Arguments:
+        cmdset (CmdSet): merged cmdset to build the trie from.
+
+    Attributes:
+        root (dict): the root node of the names as typed, for include_prefixes matches.
+        stripped_root (dict): root node of names with CMD_IGNORE_PREFIXES removed.
+
+    Notes:
+        A node is a dictionary of character: node.
+        A node at the end of a name has an entry under the None key.
+            A list of (position, cmdname, cmd, raw_cmdname)
+            position records the order the default parser would find the match.
+    """
+
+    def __init__(self, cmdset):
+        self.root = dict()
+        self.stripped_root = dict()
+        position = 0
+        for cmd in cmdset:
+            for raw_cmdname in [cmd.key] + cmd.aliases:
+                if raw_cmdname:
+                    self.insert(self.root, raw_cmdname, (position, raw_cmdname, cmd, raw_cmdname))
+                    cmdname = (raw_cmdname.lstrip(_CMD_IGNORE_PREFIXES)
+                               if len(raw_cmdname) > 1 else raw_cmdname)
+                    if cmdname:
+                        self.insert(self.stripped_root, cmdname,
+                                    (position, cmdname, cmd, raw_cmdname))
+                position += 1
+
+    @staticmethod
+    def insert(root, name, entry):
+        """Add an entry to the trie at root, under the lower cased name."""
+        node = root
+        for character in name.lower():
+            node = node.setdefault(character, dict())
+        node.setdefault(None, list()).append(entry)
+
+    @staticmethod
+    def walk(root, l_raw_string):
+        """
+        Returns every entry whose name the string starts with.
+
+        Arguments:
+            root (dict): the root node to walk from
+            l_raw_string (str): the lower cased input string
+
+        Returns:
+            entries (list): of (position, cmdname, cmd, raw_cmdname), in position order.
+        """
+        entries = []
+        node = root
+        for character in l_raw_string:
+            node = node.get(character)
+            if node is None:
+                break
+            entries.extend(node.get(None, ()))
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+
+def cmdset_signature(cmdset, caller):
+    """
+    Returns a hashable signature of a merged cmdset.
+    Cmdsets merged for the same caller, puppet and location, while no cmdset
+        has been added or removed, share a signature.
+
+    Arguments:
+        cmdset (CmdSet): the merged cmdset.
+        caller (Session, Account or Object): who the cmdset was merged for.
+
+    Notes:
+        utils.cmdset_version.CMDSET_VERSION is incremented when any object's or
+            account's cmdsets change, and when an exit is moved or deleted.
+        The cmdset's key and length separate cmdsets merged differently for
+            the same caller, as the caller's own cmdset used by bench_parser.
+    """
+    puppet = getattr(caller, 'puppet', None) or caller
+    location = getattr(puppet, 'location', None)
+    return (cmdset_version.CMDSET_VERSION, id(caller), id(puppet), id(location),
+            cmdset.key, len(cmdset))
+
+
+def get_trie(cmdset, caller=None):
+    """
+    Returns the CmdsetTrie of a merged cmdset, from the cache if available.
+    The cache is least recently used, holding TRIE_CACHE_SIZE tries.
+
+    Arguments:
+        cmdset (CmdSet): the merged cmdset.
+        caller (Session, Account or Object, optional): who the cmdset was merged for.
+    """
+    signature = cmdset_signature(cmdset, caller)
+    trie = _TRIE_CACHE.get(signature)
+    if trie:
+        _TRIE_CACHE.move_to_end(signature)
+        return trie
+    trie = CmdsetTrie(cmdset)
+    _TRIE_CACHE[signature] = trie
+    if len(_TRIE_CACHE) > TRIE_CACHE_SIZE:
+        _TRIE_CACHE.popitem(last=False)
+    return trie
+
+
+def build_matches(raw_string, cmdset, include_prefixes=False, caller=None):
+    """
+    Build match tuples by matching raw_string against available commands.
+    A trie version of evennia.commands.cmdparser.build_matches
+
+    Args:
+        raw_string (str): Input string that can look in any way; the only assumption is
+            that the sought command's name/alias must be *first* in the string.
+        cmdset (CmdSet): The current cmdset to pick Commands from.
+        include_prefixes (bool): If set, include prefixes like @, ! etc (specified in settings)
+            in the match, otherwise strip them before matching.
+        caller (Session, Account or Object, optional): who the cmdset was merged for.
+
+    Returns:
+        matches (list) A list of match tuples created by `create_match`.
+    """
+    trie = get_trie(cmdset, caller)
+    if include_prefixes:
+        root = trie.root
+    else:
+        # strip prefixes set in settings
+        raw_string = (raw_string.lstrip(_CMD_IGNORE_PREFIXES)
+                      if len(raw_string) > 1 else raw_string)
+        root = trie.stripped_root
+    l_raw_string = raw_string.lower()
+    matches = []
+    for _, cmdname, cmd, raw_cmdname in CmdsetTrie.walk(root, l_raw_string):
+        if not cmd.arg_regex or cmd.arg_regex.match(l_raw_string[len(cmdname):]):
+            matches.append(create_match(cmdname, raw_string, cmd, raw_cmdname))
+    return matches
+
 
 def cmdparser(raw_string, cmdset, caller, match_index=None):
     """
@@ -51,5 +225,93 @@ def cmdparser(raw_string, cmdset, caller, match_index=None):
             of the command name and the mratio is some quality value to
             (possibly) separate multiple matches.
 
+    UniqueMud:
+        Match selection is the same as the default parser.
+        Only finding the matches uses the trie, see build_matches.
+    """
+    if not raw_string:
+        return []
+
+    # find mathing commands
+    matches = build_matches(raw_string, cmdset, include_prefixes=True, caller=caller)
+
+    if not matches:
+        # try to match a number 1-cmdname, 2-cmdname etc
+        mindex, new_raw_string = try_num_prefixes(raw_string)
+        if mindex is not None:
+            return cmdparser(new_raw_string, cmdset, caller, match_index=int(mindex))
+        if _CMD_IGNORE_PREFIXES:
+            # still no match. Try to strip prefixes
+            raw_string = (raw_string.lstrip(_CMD_IGNORE_PREFIXES)
+                          if len(raw_string) > 1 else raw_string)
+            matches = build_matches(raw_string, cmdset, include_prefixes=False, caller=caller)
+
+    # only select command matches we are actually allowed to call.
+    matches = [match for match in matches if match[2].access(caller, "cmd")]
+
+    # try to bring the number of matches down to 1
+    if len(matches) > 1:
+        # See if it helps to analyze the match with preserved case but only if
+        # it leaves at least one match.
+        trimmed = [match for match in matches if raw_string.startswith(match[0])]
+        if trimmed:
+            matches = trimmed
+
+    if len(matches) > 1:
+        # we still have multiple matches. Sort them by count quality.
+        matches = sorted(matches, key=lambda m: m[3])
+        # only pick the matches with highest count quality
+        quality = [mat[3] for mat in matches]
+        matches = matches[-quality.count(quality[-1]):]
+
+    if len(matches) > 1:
+        # still multiple matches. Fall back to ratio-based quality.
+        matches = sorted(matches, key=lambda m: m[4])
+        # only pick the highest rated ratio match
+        quality = [mat[4] for mat in matches]
+        matches = matches[-quality.count(quality[-1]):]
+
+    if len(matches) > 1 and match_index is not None and 0 < match_index <= len(matches):
+        # We couldn't separate match by quality, but we have an
+        # index argument to tell us which match to use.
+        matches = [matches[match_index - 1]]
+
+    # no matter what we have at this point, we have to return it.
+    return matches
+
+
+def benchmark(raw_strings, cmdset, caller, iterations=1000):
+    """
+    Compare parse time per input line of this parser against evennia's default parser.
+
+    Arguments:
+        raw_strings (iterable): input lines to parse. IE: ('look', 'get sword', '2-look')
+        cmdset (CmdSet): merged cmdset to parse against.
+        caller (Object): the caller the commands are parsed for.
+        iterations (int): number of times each line is parsed by each parser.
+
+    Returns:
+        results (dict): {raw_string: {'default': float, 'trie': float, 'same': bool}}
+            default and trie are average seconds per parse.
+            same is True if both parsers matched the same commands.
+
+    Notes:
+        The trie is built before timing, as it would be cached in play.
     """
-    # Your implementation here
+    get_trie(cmdset, caller)
+    results = dict()
+    for raw_string in raw_strings:
+        timings = dict()
+        parsed = dict()
+        for name, parser in (('default', default_parser.cmdparser), ('trie', cmdparser)):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                matches = parser(raw_string, cmdset, caller)
+            timings[name] = (time.perf_counter() - start) / iterations
+            parsed[name] = [(match[0], match[1], match[2].key) for match in matches]
+        results[raw_string] = {
+            'default': timings['default'],
+            'trie': timings['trie'],
+            'same': parsed['default'] == parsed['trie'],
+        }
+    return results
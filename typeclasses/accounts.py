@@ -23,6 +23,9 @@ several more options for customizing the Guest account system.
 """
 
 from evennia import DefaultAccount, DefaultGuest
+from evennia.utils.utils import lazy_property
+from utils.permission_flags import PermFlagsHandler
+from utils.cmdset_version import NotifyCmdSetHandler
 
 
 class Account(DefaultAccount):
@@ -90,9 +93,20 @@ class Account(DefaultAccount):
      at_server_reload()
      at_server_shutdown()
 
+    UniqueMud:
+        permissions, a PermFlagsHandler that invalidates cached permission flags.
+            Refer to utils.permission_flags
+        cmdset, a NotifyCmdSetHandler that invalidates cached command parser tries.
+            Refer to utils.cmdset_version
     """
 
-    pass
+    @lazy_property
+    def permissions(self):
+        return PermFlagsHandler(self)
+
+    @lazy_property
+    def cmdset(self):
+        return NotifyCmdSetHandler(self, True)
 
 
 class Guest(DefaultGuest):
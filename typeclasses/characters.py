@@ -8,16 +8,19 @@ creation commands.
 
 """
 from typeclasses.mixins import CharExAndObjMixin, AllObjectsMixin
-from evennia.contrib.gendersub import GenderCharacter, _RE_GENDER_PRONOUN
-from utils.element import Element, ListElement
+from evennia.contrib.gendersub import GenderCharacter, _RE_GENDER_PRONOUN, _GENDER_PRONOUN_MAP
+from utils.element import Element, ListElement, FlagListElement
 from utils import um_utils
-from world import status_functions
+from world import status_functions, effects, exp_ledger
 from evennia import utils
 from world.rules import stats, body, damage, actions, skills as skills_rules
 from evennia.contrib.rpsystem import ContribRPCharacter
 from typeclasses.equipment.clothing import UMClothedCharacter
 from evennia.contrib.rpsystem import RPSystemCmdSet
 from evennia import DefaultScript
+import time
+from typeclasses import scripts as um_scripts
+from typeclasses.scripts import get_regeneration_service
 
 # Used to adjust Element settings for stats, and the unit test for Character also
 # min_func ascending_breakpoint_func and descending_breakpoint_func are set in self.at_init
@@ -31,6 +34,21 @@ CHARACTER_STAT_SETTINGS = {
     'max_func': None,  # reference to a function to run when the self.value attribute reachs the self.max
     'dbtype': 'db'  # the database type to use can be 'db' or 'ndb'
 }
+# stats naturally restored over time, see Character.regenerate
+REGENERATION_STATS = ('hp', 'END', 'WILL', 'PERM')
+
+
+def _pronoun_table(gender):
+    """Returns a dictionary of gendersub pattern: pronoun, IE: {'|p': 'his', '|P': 'His'}"""
+    table = dict()
+    for pronoun_type, pronoun in _GENDER_PRONOUN_MAP[gender].items():
+        table[f"|{pronoun_type}"] = pronoun
+        table[f"|{pronoun_type.upper()}"] = pronoun.capitalize()
+    return table
+
+
+# gender: pronoun table, shared by Characters. See Character.pronouns
+PRONOUN_TABLES = {gender: _pronoun_table(gender) for gender in _GENDER_PRONOUN_MAP}
 
 
 class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCharacter, ContribRPCharacter):
@@ -167,6 +185,7 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
     Methods:
         All methods are fully documented in their docstrings.
         get_pronoun(pattern), pattern is a gendersub pattern, returns Character's pronoun
+            From the Character's cached pronoun table, Character.pronouns
         ready(), returns True if a character is ready for a 'busy' action
         stun(int() or float()), stun the Character for argument seconds
         status_stop(status_type=str, stop_message=str, stop_cmd=str), stop a stun status early
@@ -196,7 +215,8 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
             Returns false if the object is not being wielded by the Character
 
     Scripts
-        Character.NaturalHealing, heals Character automatically over time.
+        typeclasses.scripts.RegenerationService, one global script that heals
+            registered Characters automatically over time. See Character.regenerate
 
     Final Notes:
         unit testing for Character status is done in the commands.tests.TestCommands unit test
@@ -213,11 +233,16 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
 
         UniqueMud:
             Used to cache stat modifiers.
+            Queues effects saved on the Character, world.effects
+            Registers with the RegenerationService when a stat in REGENERATION_STATS falls below max.
         """
         self.cache_stat_modifiers()  # load stats cache when Character is initialized.
+        effects.restore_effects(self)  # resume damage over time effects
         self.END  # init endurance
         self.WILL  # init willpower
         self.PERM  # init permission
+        for stat_name in REGENERATION_STATS:
+            getattr(self, stat_name).below_max_func = self.at_stat_below_max
         return super().at_init()  # call at_init below this one, ie typeclasses.mixins.CharExAndObjMixin
 
     def at_object_creation(self):
@@ -226,9 +251,9 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
         self.targetable = True  # Characters can be targeted with commands
         self.container = True  # Can the object contain other objects
         self.position = 'standing'  # Default position is standing
-        # if it does not already exist, create a healing script
-        if "Natural_Healing" not in str(self.scripts):
-            self.scripts.add(NaturalHealing)
+        # heal automatically over time
+        get_regeneration_service().register(self)
+        self.db.last_regen_time = time.time()
         super_return = super().at_object_creation()  # itentionally before RPSystemCmdSet removal
         self.cmdset.remove(RPSystemCmdSet)  # overridden and added back in at commands.standard_cmds.UMRPSystemCmdSet
         return super_return
@@ -281,6 +306,40 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
                 set_inst.verify()
         return self._skills
 
+    @property
+    def increasable_skills(self):
+        """
+        Set of the skill names the Character can learn a new rank in.
+            Built once from the Character's skills, then maintained by
+            Command.gain_exp, world.rules.skills.learn and world.rules.skills.grant_skill_points
+            Read by the learn command, commands.standard_cmds.CmdLearn
+
+        Notes:
+            Skills changed directly, IE: char.skills.unarmed.punch_exp = 600, are not
+                seen until the set is rebuilt. del char.increasable_skills
+            Update a single skill with world.rules.skills.update_increasable(char, skill_name)
+        """
+        try:
+            if self._increasable_skills is not None:
+                pass
+        except AttributeError:
+            self._increasable_skills = skills_rules.find_increasable(self)
+        return self._increasable_skills
+
+    @increasable_skills.deleter
+    def increasable_skills(self):
+        try:
+            del self._increasable_skills
+        except AttributeError:
+            pass
+
+    def at_increasable_skills_change(self):
+        """
+        Called when a skill is added to or removed from Character.increasable_skills
+            Override to push the Character's learnable skills to a client skill UI.
+        """
+        pass
+
     # define objects's condition
     @property
     def condition(self):
@@ -288,7 +347,8 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
             if self._condition:
                 pass
         except AttributeError:
-            self._condition = ListElement(self, body.CHARACTER_CONDITIONS)
+            # conditions are mirrored into in memory booleans, condition.flags
+            self._condition = FlagListElement(self, body.CHARACTER_CONDITIONS)
             self._condition.verify()
         return self._condition
 
@@ -355,6 +415,7 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
     def usdesc(self, value):
         """Setter property for usdesc"""
         self.sdesc.add(value)
+        self.reindex_names()  # names changed, update location's search index
 
     # define objects's evd_max
     @property
@@ -648,9 +709,56 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
 
         Example:
             char_pos_pronoun = char.get_pronoun('|p')
+
+        Notes:
+            A single pattern is a lookup in Character.pronouns.
+            Patterns within other text are substituted with the same table.
         """
+        pronouns = self.pronouns
+        pronoun = pronouns.get(pattern)
+        if pronoun is not None:
+            return pronoun
         return _RE_GENDER_PRONOUN.sub(self._get_pronoun, pattern)
 
+    @property
+    def pronouns(self):
+        """
+        The Character's pronoun table, gendersub pattern: pronoun
+            IE: {'|s': 'he', '|S': 'He', '|o': 'him', ... '|A': 'His'}
+        Shared with all Characters of the gender.
+
+        Notes:
+            The table is cached with the gender it was built from, and rebuilt
+                when self.db.gender changes, however it was set.
+        """
+        gender = self.attributes.get("gender", default="ambiguous")
+        try:
+            if self._pronouns_gender == gender:
+                return self._pronouns
+        except AttributeError:
+            pass
+        self._pronouns_gender = gender
+        self._pronouns = PRONOUN_TABLES.get(gender, PRONOUN_TABLES["ambiguous"])
+        return self._pronouns
+
+    @pronouns.deleter
+    def pronouns(self):
+        try:
+            del self._pronouns
+            del self._pronouns_gender
+        except AttributeError:
+            pass
+
+    def _get_pronoun(self, regex_match):
+        """
+        Get pronoun from the pronoun marker in the text. Used by gendersub's msg
+            and get_pronoun to substitute patterns.
+
+        UniqueMud:
+            Reads the cached pronoun table, Character.pronouns
+        """
+        return self.pronouns[regex_match.group()]
+
     def stun(self, stun_time=3):
         """
         Stun this character for a time.
@@ -897,7 +1005,7 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
 
         """
         # if already in the passed state, do nothing
-        if state == self.condition.unconscious:
+        if bool(state) == self.condition.flags['unconscious']:
             return
 
         self.condition.unconscious = state  # Set the unconscious state
@@ -946,12 +1054,29 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
             will abort without sending the message.
 
         """
+        return self.receives_msg(**kwargs)
+
+    def receives_msg(self, **kwargs):
+        """
+        Returns True if this Character would receive a message sent with kwargs.
+            Used by at_msg_receive, and by broadcasts to skip rendering messages
+            for Characters that would drop them.
+            See AllObjectsMixin.msg_contents and utils.emote.um_emote
+
+        Kwargs:
+            force_on_unconscious=False, show message even if Character is unconscious
+            force=False, show message to Character under any circumstance.
+
+        Notes:
+            Reads the in memory condition flags, not the database.
+        """
         # if force message is sent, always send the message.
         if kwargs.get('force', False):
             return True
 
+        flags = self.condition.flags
         # silent messages when Character is unconscious
-        if self.condition.unconscious:
+        if flags['unconscious']:
             # force the message if character is unconscious, but no other silencing conditions
             if kwargs.get('force_on_unconscious', False):
                 return True
@@ -959,7 +1084,7 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
 
         # silent messages when Character is dead.
         # Only the force kwarg will show a message when the Character is dead
-        if self.condition.dead:
+        if flags['dead']:
             return False
 
         # no silent conditions found, show message
@@ -979,7 +1104,7 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
         """
         self.restore_stat(self.hp, modifier, ammount)
 
-    def restore_stat(self, stat, modifier=0, ammount=None):
+    def restore_stat(self, stat, modifier=0, ammount=None, rolls=1):
         """
         Restore a stat on a Character
 
@@ -988,10 +1113,11 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
             modifier=0, number to add to the max restoration to restore by.
             ammount=None, a set ammount to restore by.
                 If passed restore_stat will ignore the standard restore check
+            rolls=1, number of restoration rolls to restore by.
+                More than 1 when catching up on missed restoration.
 
         Notes:
-            This is registered on a script, NaturalHealing.
-            This script is created in at_object_creation
+            Called by Character.regenerate, for natural healing.
 
         Returns:
             success (boolean): True if the restore occurred successfully.
@@ -1022,17 +1148,118 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
 
         # restore the stat
         if stat.name in ('hp', 'END', 'endurance'):  # the stat is hp or endurance
-            stat.set(stat + damage.restoration_roll(restoration_modifier))
+            if rolls > 1:
+                stat.set(stat + damage.restoration_total(rolls, restoration_modifier))
+            else:
+                stat.set(stat + damage.restoration_roll(restoration_modifier))
             # If this restoration was hp, and the character is unconcious, wake them.
             if stat.name == 'hp':
                 if self.condition.unconscious:
                     if self.hp > self.hp.breakpoint:
                         self.wake_check()
         else:  # stat being restored is not health or endurance
-            stat.set(stat + stats.restoration_roll(restoration_modifier))
+            if rolls > 1:
+                stat.set(stat + stats.restoration_total(rolls, restoration_modifier))
+            else:
+                stat.set(stat + stats.restoration_roll(restoration_modifier))
 
         return True
 
+    def regenerate(self):
+        """
+        Naturally restore the stats in REGENERATION_STATS.
+            Stats at their max are not restored, nothing is written for them.
+
+        Called each interval by typeclasses.scripts.RegenerationService
+            Stamps last_regen_time when a stat was restored, so switching to
+            'lazy' mode does not restore intervals already restored here.
+            Dead Characters and Characters at full are not written to.
+
+        Returns:
+            restored (bool): True if any stat was restored.
+        """
+        # dead Characters can not restore
+        if self.condition.dead:
+            return False
+        restored = False
+        for stat_name in REGENERATION_STATS:
+            stat = getattr(self, stat_name)
+            if stat.value < stat.max:
+                self.restore_stat(stat)
+                restored = True
+        if restored:
+            self.db.last_regen_time = time.time()
+        return restored
+
+    def at_stat_below_max(self):
+        """
+        Called when a stat in REGENERATION_STATS falls below its max after being at max.
+            Registers this Character with the RegenerationService.
+            The service unregisters Characters that are at full.
+        """
+        get_regeneration_service().register(self)
+        self.db.last_regen_time = time.time()  # restoration starts now
+
+    def catch_up_regeneration(self, now=None):
+        """
+        Restore what this Character would have regenerated since last_regen_time.
+            Only when typeclasses.scripts.REGENERATION_MODE is 'lazy'.
+
+        Arguments:
+            now (float): time to catch up to, defaults to time.time()
+
+        Returns:
+            intervals (int): number of HEALING_INTERVALs caught up on.
+
+        Notes:
+            Called when the Character is puppeted, targeted by a command or views
+                their status or condition. Also each interval for puppeted
+                Characters by the RegenerationService.
+            All missed intervals are restored at once, per stat, with
+                damage.restoration_total and stats.restoration_total.
+            The part of an interval not yet passed is kept for the next catch up.
+        """
+        if um_scripts.REGENERATION_MODE != 'lazy':
+            return 0
+        now = time.time() if now is None else now
+        last_regen_time = self.db.last_regen_time
+        if last_regen_time is None:  # first access after switching to lazy mode
+            self.db.last_regen_time = now
+            return 0
+        intervals = int((now - last_regen_time) // damage.HEALING_INTERVAL)
+        if intervals < 1:
+            return 0
+        self.db.last_regen_time = last_regen_time + intervals * damage.HEALING_INTERVAL
+        # dead Characters can not restore
+        if self.condition.dead:
+            return intervals
+        for stat_name in REGENERATION_STATS:
+            stat = getattr(self, stat_name)
+            if stat.value < stat.max:
+                self.restore_stat(stat, rolls=intervals)
+        return intervals
+
+    def at_post_puppet(self, **kwargs):
+        """
+        Called just after puppeting has been completed and all
+        Account<->Object links have been established.
+
+        UniqueMud:
+            Catches up on regeneration missed while offline.
+        """
+        self.catch_up_regeneration()
+        return super().at_post_puppet(**kwargs)
+
+    def at_post_unpuppet(self, account, session=None, **kwargs):
+        """
+        Called just after the Account successfully disconnected from this object.
+
+        UniqueMud:
+            Writes experience held in the experience ledger, world.exp_ledger
+        """
+        exp_ledger.flush(self)
+        return super().at_post_unpuppet(account, session=session, **kwargs)
+
     def wake_check(self):
         """
         Will hold future code to test if a character wakes from unconciousness.
@@ -1060,6 +1287,81 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
     # define an empty hands dictionary
     HANDS = dict()
 
+    @property
+    def held_items(self):
+        """
+        In memory map of the objects in this Character's hands, dbref: object
+            Hand slots, body.hand.occupied and body.hand.wielding, hold dbref strings.
+            The map resolves them to objects without a search.
+
+        Usage:
+            item = char.held_item(hand.occupied)  # use held_item, it validates entries.
+
+        Notes:
+            Entries are added the first time a hand's dbref is resolved by held_item.
+                From the Character's contents, which are cached in memory.
+            Entries are removed by release_item, called by Object.at_after_move when
+                an object leaves the Character and Object.at_object_delete.
+            held_item also drops entries whose object was deleted or moved.
+        """
+        try:
+            if self._held_items:
+                pass
+        except AttributeError:
+            self._held_items = dict()
+        return self._held_items
+
+    @held_items.deleter
+    def held_items(self):
+        try:
+            del self._held_items
+        except AttributeError:
+            pass
+
+    def held_item(self, dbref):
+        """
+        Returns the object a hand slot refers to, or None if it is no longer on the Character.
+
+        Arguments:
+            dbref (str): dbref string of a hand slot. IE: hand.occupied or hand.wielding
+
+        Notes:
+            Never searches, objects not yet in held_items are found in self.contents
+        """
+        if not dbref:
+            return None
+        held_items = self.held_items
+        item = held_items.get(dbref)
+        if item is not None and item.pk and item.location == self:
+            return item
+        item = None
+        for obj in self.contents:
+            if obj.dbref == dbref:
+                item = obj
+                break
+        if item:
+            held_items[dbref] = item
+        else:
+            held_items.pop(dbref, None)
+        return item
+
+    def release_item(self, obj):
+        """
+        Empty the hands holding or wielding an object, and drop it from held_items.
+            Called when the object leaves this Character, or is deleted.
+
+        Arguments:
+            obj (Object): object no longer held.
+        """
+        self.held_items.pop(obj.dbref, None)
+        for hand in self.HANDS:
+            hand_inst = getattr(self.body, hand, False)
+            if hand_inst:
+                if hand_inst.occupied == obj.dbref:  # if the item was in the hand
+                    hand_inst.occupied = 0  # record that the item is no longer held
+                if hand_inst.wielding == obj.dbref:  # if the item was being wielded
+                    hand_inst.wielding = 0  # record that the item is no longer wielded
+
     def hands(self):
         """
         returns a list of references of Characters hands
@@ -1078,24 +1380,64 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
         note:
             Some character races may have many hands or hands with odd names.
             Avoid using right_hand left_hand logic.
+            Hands holding a deleted item found in held_items are emptied, this never searches.
+                Other references are fixed by Object.at_object_delete and the ReferenceSweeper script.
 
             Tested in commands.tests
         """
         hands_state = list()
+        held_items = self.held_items
         for hand in self.HANDS:
             hand_inst = getattr(self.body, hand, False)
             if hand_inst:
                 hands_state.append(hand_inst)
-                # if the item held has been delete or otherwise does not exist, unoccupy the hand
-                if hand_inst.occupied:
-                    item_held = self.search(hand_inst.occupied, quiet=True)
-                    if not item_held:  # item does not exist in database
-                        # the item is also being wielded
-                        if hand_inst.occupied == hand_inst.wielding:
-                            hand_inst.wielding = 0  # unwield the missing item
-                        hand_inst.occupied = 0  # unoccupy the hand
+                occupied = hand_inst.occupied
+                item = held_items.get(occupied) if occupied else None
+                if item is not None and not item.pk:  # the held item was deleted
+                    held_items.pop(occupied, None)
+                    if occupied == hand_inst.wielding:
+                        hand_inst.wielding = 0  # unwield the missing item
+                    hand_inst.occupied = 0  # unoccupy the hand
         return hands_state
 
+    def sweep_references(self):
+        """
+        Fix hand and clothing references left dangling by deleted or moved objects.
+            Called in batches by the ReferenceSweeper script, typeclasses.scripts
+
+        Returns:
+            fixed (dict): number of references fixed, by type.
+                {'occupied': int, 'wielding': int, 'covered_by': int}
+
+        Notes:
+            Object.at_after_move and Object.at_object_delete keep references valid,
+                the sweeper fixes what they miss. IE: an object's location set directly.
+        """
+        fixed = {'occupied': 0, 'wielding': 0, 'covered_by': 0}
+        for hand in self.HANDS:
+            hand_inst = getattr(self.body, hand, False)
+            if not hand_inst:
+                continue
+            occupied = hand_inst.occupied
+            if occupied and not self.held_item(occupied):
+                hand_inst.occupied = occupied = 0  # unoccupy the hand
+                fixed['occupied'] += 1
+            # only the item in a hand can be wielded by it
+            if hand_inst.wielding and hand_inst.wielding != occupied:
+                hand_inst.wielding = 0
+                fixed['wielding'] += 1
+        equipment = self.equipment
+        for item in self.contents_index.worn:
+            covering = item.db.covered_by
+            if covering:
+                if covering.pk and covering.location == self and covering.db.worn:
+                    continue
+            elif item.id not in equipment.covered_by:
+                continue
+            equipment.uncover(item)
+            fixed['covered_by'] += 1
+        return fixed
+
     def open_hands(self):
         """
         Returns:
@@ -1154,9 +1496,8 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
         wielded_items = list()
         for hand in hands_state:
             if hand.wielding:
-                wielded_item = self.search(hand.wielding, quiet=True)
+                wielded_item = self.held_item(hand.wielding)
                 if wielded_item:
-                    wielded_item = wielded_item[0]
                     wielded_items.append(wielded_item)
         return wielded_items
 
@@ -1173,12 +1514,9 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
         """
         hands_state = self.hands()
         for hand in hands_state:
-            if hand.wielding:
-                wielded_item = self.search(hand.wielding, quiet=True)
-                if wielded_item:
-                    wielded_item = wielded_item[0]
-                    if wielded_item == obj:
-                        return hand
+            if hand.wielding and hand.wielding == obj.dbref:
+                if self.held_item(hand.wielding) == obj:
+                    return hand
         return False
 
     def get_display_name(self, looker, **kwargs):
@@ -1203,7 +1541,7 @@ class Character(AllObjectsMixin, CharExAndObjMixin, UMClothedCharacter, GenderCh
             characters stand out from other objects.
 
         """
-        idstr = "(#%s)" % self.id if self.access(looker, access_type="control") else ""
+        idstr = "(#%s)" % self.id if self.cached_access(looker, access_type="control") else ""
         if looker == self:
             sdesc = self.key
         else:
@@ -1238,6 +1576,10 @@ class NaturalHealing(DefaultScript):
     """
     Script to control when Character's natural healing
 
+    Deprecated, replaced by typeclasses.scripts.RegenerationService
+        Kept so existing scripts load until typeclasses.scripts.migrate_natural_healing
+        moves their Characters to the service, at server start.
+
     rules
         make restoration pause if character moves while bearing a load
             Make this pause longer for greater loads.
@@ -1255,3 +1597,74 @@ class NaturalHealing(DefaultScript):
         char.restore_stat(char.END)
         char.restore_stat(char.WILL)
         char.restore_stat(char.PERM)
+
+
+def _search_hand_item(char, dbref):
+    """Resolve a hand slot with a search, as hands did before held_items."""
+    items = char.search(dbref, quiet=True)
+    return items[0] if items else None
+
+
+def benchmark_hands(char, iterations=1000):
+    """
+    Compare the time of hand queries using held_items against a search per hand.
+
+    Arguments:
+        char (Character): Character whose hands are queried, hold and wield items first.
+        iterations (int): number of times each query is run by each method.
+
+    Returns:
+        results (dict): {query: {'search': float, 'map': float, 'same': bool}}
+            query is 'open_hands' or 'wielding'
+            search and map are average seconds per query.
+            same is True if both methods returned the same result.
+
+    Notes:
+        The search method resolves each occupied and wielding slot with char.search,
+            as Character.hands, wielding and is_wielding did before held_items.
+        Refer to commands.developer_cmds.CmdBenchHands
+    """
+    def search_open_hands():
+        open_hands = list()
+        for hand in char.HANDS:
+            hand_inst = getattr(char.body, hand, False)
+            if hand_inst:
+                if hand_inst.occupied:
+                    _search_hand_item(char, hand_inst.occupied)
+                else:
+                    open_hands.append(hand_inst)
+        return open_hands
+
+    def search_wielding():
+        wielded_items = list()
+        for hand in char.HANDS:
+            hand_inst = getattr(char.body, hand, False)
+            if hand_inst:
+                if hand_inst.occupied:
+                    _search_hand_item(char, hand_inst.occupied)
+                if hand_inst.wielding:
+                    wielded_item = _search_hand_item(char, hand_inst.wielding)
+                    if wielded_item:
+                        wielded_items.append(wielded_item)
+        return wielded_items
+
+    queries = {
+        'open_hands': (search_open_hands, char.open_hands),
+        'wielding': (search_wielding, char.wielding),
+    }
+    results = dict()
+    for query, methods in queries.items():
+        timings = dict()
+        returned = dict()
+        for name, method in zip(('search', 'map'), methods):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = method()
+            timings[name] = (time.perf_counter() - start) / iterations
+            returned[name] = [getattr(item, 'name', item) for item in result]
+        results[query] = {
+            'search': timings['search'],
+            'map': timings['map'],
+            'same': returned['search'] == returned['map'],
+        }
+    return results
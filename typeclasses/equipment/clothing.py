@@ -142,6 +142,8 @@ CLOTHING_TYPE_AUTOCOVER = {
 CLOTHING_TYPE_CANT_COVER_WITH = ["jewelry"]
 # used to refer to the clothing class, to make this easier to create instances of
 CLOTHING_OBJECT_CLASS = "typeclasses.equipment.clothing.UMClothing"
+# clothing_type: position in CLOTHING_TYPE_ORDER, used to sort worn clothing
+CLOTHING_TYPE_RANK = {clothing_type: rank for rank, clothing_type in enumerate(CLOTHING_TYPE_ORDER)}
 
 # HELPER FUNCTIONS START HERE
 
@@ -157,21 +159,21 @@ def order_clothes_list(clothes_list):
         ordered_clothes_list (list): The same list as passed, but re-ordered
                                      according to the hierarchy of clothing types
                                      specified in CLOTHING_TYPE_ORDER.
+
+    UniqueMud:
+        A stable sort on the clothing type's rank. Untyped clothing or clothing
+            with a type not in CLOTHING_TYPE_ORDER goes last, in the order passed.
     """
-    ordered_clothes_list = clothes_list
-    # For each type of clothing that exists...
-    for current_type in reversed(CLOTHING_TYPE_ORDER):
-        # Check each item in the given clothes list.
-        for clothes in clothes_list:
-            # If the item has a clothing type...
-            if clothes.db.clothing_type:
-                item_type = clothes.db.clothing_type
-                # And the clothing type matches the current type...
-                if item_type == current_type:
-                    # Move it to the front of the list!
-                    ordered_clothes_list.remove(clothes)
-                    ordered_clothes_list.insert(0, clothes)
-    return ordered_clothes_list
+    clothes_list.sort(key=lambda clothes: clothing_type_rank(clothes.db.clothing_type))
+    return clothes_list
+
+
+def clothing_type_rank(clothing_type):
+    """
+    Returns the display position of a clothing type.
+    Types not in CLOTHING_TYPE_ORDER are ranked after all types in it.
+    """
+    return CLOTHING_TYPE_RANK.get(clothing_type, len(CLOTHING_TYPE_ORDER))
 
 
 def get_worn_clothes(character, exclude_covered=False):
@@ -190,9 +192,16 @@ def get_worn_clothes(character, exclude_covered=False):
                                      given character, ordered according to
                                      the CLOTHING_TYPE_ORDER option specified
                                      in this module.
+
+    UniqueMud:
+        Characters read the list from their equipment index, EquipmentIndex.
+        Other objects have their contents searched.
     """
+    equipment = getattr(character, 'equipment', None)
+    if equipment is not None:
+        return equipment.worn(exclude_covered=exclude_covered)
     clothes_list = []
-    for thing in character.contents:
+    for thing in character.contents_index.worn:
         # If uncovered or not excluding covered items
         if not thing.db.covered_by or exclude_covered is False:
             # If 'worn' is True, add to the list
@@ -249,6 +258,151 @@ def single_type_count(clothes_list, type):
     return type_count
 
 
+class EquipmentIndex:
+    """
+    In memory index of the clothing and armor a Character is wearing.
+    Available on Characters as character.equipment
+
+    Attributes:
+        items (dict): id: item of every worn item, in the order they were worn.
+        slots (dict): clothing_type: list of worn items of that type.
+        covered_by (dict): id of a covered item: the item covering it.
+            Mirrors item.db.covered_by
+        version (int): increases each time the index changes.
+            Allows callers to cache what they build from the index.
+
+    Arguments:
+        character (Character): the Character wearing the items.
+
+    Usage:
+        character.equipment.worn()  # worn items in display order
+        character.equipment.worn(exclude_covered=True)  # only visible items
+        character.equipment.slot('head')  # items worn on the head
+        character.equipment.covering(item)  # items item is covering
+
+    Notes:
+        The index is maintained by:
+            UMClothing.wear, UMClothing.remove, UMClothing.at_get and
+            typeclasses.mixins.IndexedContentsHandler, when a worn item leaves the Character.
+        Change what covers an item with EquipmentIndex.cover and uncover.
+            They set item.db.covered_by and the index together.
+        Reads trust the index, worn slots are read directly.
+
+    Unit Tests:
+        typeclasses.tests.TestEquipmentIndex
+    """
+
+    def __init__(self, character):
+        self.character = character
+        self.version = 0
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the index from the Character's worn contents."""
+        self.items = dict()
+        self.slots = dict()
+        self.covered_by = dict()
+        self._types = dict()  # id: clothing_type
+        self._ordered = None  # worn items in display order, built when read
+        for item in self.character.contents_index.worn:
+            self.add(item)
+        self.version += 1
+
+    def add(self, item):
+        """
+        Index an item as worn, or re-index it if already indexed.
+        Items that are not worn are removed from the index instead.
+
+        Arguments:
+            item (Object): item the Character is wearing.
+        """
+        self.discard(item)
+        if not item.db.worn:
+            return
+        clothing_type = item.db.clothing_type
+        self.items[item.id] = item
+        self._types[item.id] = clothing_type
+        self.slots.setdefault(clothing_type, []).append(item)
+        if item.db.covered_by:
+            self.covered_by[item.id] = item.db.covered_by
+        self._ordered = None
+        self.version += 1
+
+    # re-index an item, IE: after the wearstyle or name changed
+    update = add
+
+    def discard(self, item):
+        """
+        Remove an item from the index, if it is indexed.
+
+        Arguments:
+            item (Object): item no longer worn.
+        """
+        if self.items.pop(item.id, None) is None:
+            return
+        clothing_type = self._types.pop(item.id)
+        slot = self.slots[clothing_type]
+        slot.remove(item)
+        if not slot:
+            del self.slots[clothing_type]
+        self.covered_by.pop(item.id, None)
+        self._ordered = None
+        self.version += 1
+
+    def cover(self, item, covering):
+        """
+        Record that an item is covered by another.
+
+        Arguments:
+            item (Object): the worn item being covered.
+            covering (Object): the worn item covering it.
+        """
+        item.db.covered_by = covering
+        if item.id in self.items:
+            self.covered_by[item.id] = covering
+            self.version += 1
+
+    def uncover(self, item):
+        """
+        Record that an item is no longer covered.
+
+        Arguments:
+            item (Object): the worn item no longer covered.
+        """
+        item.db.covered_by = False
+        if self.covered_by.pop(item.id, None) is not None:
+            self.version += 1
+
+    def covering(self, item):
+        """Returns a list of worn items covered by item."""
+        return [self.items[item_id] for item_id, covering in self.covered_by.items()
+                if covering == item]
+
+    def slot(self, clothing_type):
+        """
+        Returns a list of worn items of a clothing type.
+
+        Arguments:
+            clothing_type (str): IE: 'hat' or an armor's body part 'head'
+        """
+        return list(self.slots.get(clothing_type, ()))
+
+    def worn(self, exclude_covered=False):
+        """
+        Returns a list of worn items in display order.
+            Display order is CLOTHING_TYPE_ORDER, then the order items were worn.
+
+        Arguments:
+            exclude_covered (bool): If True, items covered by other items are not returned.
+        """
+        if self._ordered is None:
+            self._ordered = sorted(self.items.values(),
+                                   key=lambda item: clothing_type_rank(self._types[item.id]))
+        if exclude_covered:
+            return [item for item in self._ordered if item.id not in self.covered_by]
+        return list(self._ordered)
+
+
 class UMClothing(Object):
     """
     Class of clothing objects.
@@ -292,16 +446,18 @@ class UMClothing(Object):
         """
         # Set clothing as worn
         self.db.worn = wearstyle
+        wearer.contents_index.update(self)  # index the clothing as worn
+        wearer.equipment.add(self)
         # Auto-cover appropirate clothing types, as specified above
         to_cover = []
         if self.db.clothing_type and self.db.clothing_type in self.type_autocover:
-            for garment in get_worn_clothes(wearer):
-                if (
-                    garment.db.clothing_type
-                    and garment.db.clothing_type in self.type_autocover[self.db.clothing_type]
-                ):
+            covered_types = self.type_autocover[self.db.clothing_type]
+            for garment in wearer.equipment.worn():
+                if garment.db.clothing_type and garment.db.clothing_type in covered_types:
                     to_cover.append(garment)
-                    garment.db.covered_by = self
+                    wearer.equipment.cover(garment, self)
+        # cache dr change for the body part, incase clothing is armor
+        wearer.cache_body_dr(parts=(self.db.clothing_type,))
         # Return if quiet
         if quiet:
             return True
@@ -316,10 +472,6 @@ class UMClothing(Object):
             wearer_msg += f", covering {list_to_string(to_cover)}"
         wearer.emote_location(room_msg + ".", self)
         wearer.emote(wearer_msg + ".", self)
-
-        # cache dr change for body parts, incase clothing is armor
-        wearer.cache_body_dr()
-
         return True  # wear successful
 
     def remove(self, wearer, quiet=False):
@@ -337,16 +489,16 @@ class UMClothing(Object):
         """
         #remove the clothing
         self.db.worn = False
+        wearer.contents_index.update(self)  # index the clothing as no longer worn
         # message wearer and room
         room_msg = f"/Me removes /target"
         wearer_msg = f"You remove /target"
+        wearer.equipment.discard(self)
         uncovered_list = []
-        # Check to see if any other clothes are covered by this object.
-        for thing in wearer.contents:
-            # If anything is covered by
-            if thing.db.covered_by == self:
-                thing.db.covered_by = False
-                uncovered_list.append(thing.name)
+        # Uncover any other clothes covered by this object.
+        for thing in wearer.equipment.covering(self):
+            wearer.equipment.uncover(thing)
+            uncovered_list.append(thing.name)
         if len(uncovered_list) > 0:
             uncov_msg = list_to_string(uncovered_list)
             room_msg += f", revealing {uncov_msg}"
@@ -355,8 +507,8 @@ class UMClothing(Object):
         if not quiet:
             wearer.emote_location(room_msg + ".", self)
             wearer.emote(wearer_msg + ".", self)
-        # cache dr change for body parts, incase clothing is armor
-        wearer.cache_body_dr()
+        # cache dr change for the body part, incase clothing is armor
+        wearer.cache_body_dr(parts=(self.db.clothing_type,))
         # command run successful
         return True
 
@@ -367,6 +519,10 @@ class UMClothing(Object):
         location changed without getting removed.
         """
         self.db.worn = False
+        getter.contents_index.update(self)  # index the clothing as no longer worn
+        equipment = getattr(getter, 'equipment', None)
+        if equipment is not None:
+            equipment.discard(self)
 
 class HumanoidArmor(UMClothing):
     """
@@ -406,6 +562,29 @@ class UMClothedCharacter(DefaultCharacter):
     character typeclass.
     """
 
+    @property
+    def equipment(self):
+        """
+        In memory index of the clothing and armor this Character is wearing.
+        Refer to typeclasses.equipment.clothing.EquipmentIndex for usage.
+
+        Usage:
+            for item in character.equipment.worn():
+        """
+        try:
+            if self._equipment:
+                pass
+        except AttributeError:
+            self._equipment = EquipmentIndex(self)
+        return self._equipment
+
+    @equipment.deleter
+    def equipment(self):
+        try:
+            del self._equipment
+        except AttributeError:
+            pass
+
     def return_appearance(self, looker):
         """
         This formats a description. It is the hook a 'look' command
@@ -421,15 +600,42 @@ class UMClothedCharacter(DefaultCharacter):
             string, the string is appended to the end of the name, to allow
             characters to specify how clothing is worn.
 
+        UniqueMud:
+            The worn clothing string is the same for every looker.
+                It is cached in self.ndb.appearance_worn with the version of
+                the equipment index it was built from, see worn_appearance.
+            Only the Character's name, as the looker knows it, is built per look.
+
         Unit Tests:
             commands.tests.TestCommands.test_wear_remove
+            typeclasses.tests.TestClothedAppearanceCache
         """
         if not looker:
             return ""
         # get description, build string
-        string = ""
+        if looker == self:
+            string = "You are "
+        else:
+            string = f"{self.get_display_name(looker)} is "
+        # Append worn clothes.
+        return string + self.worn_appearance()
+
+    def worn_appearance(self):
+        """
+        Returns the worn clothing part of this Character's appearance.
+            IE: "wearing test hat and test shirt."
+
+        Notes:
+            Cached until this Character's equipment index changes version.
+                Wearing, removing, covering, uncovering or renaming a worn item
+                changes the version.
+        """
+        equipment = self.equipment
+        cached = self.ndb.appearance_worn
+        if cached and cached[0] == equipment.version:
+            return cached[1]
         worn_string_list = []
-        clothes_list = get_worn_clothes(self, exclude_covered=True)
+        clothes_list = equipment.worn(exclude_covered=True)
         # Append worn, uncovered clothing to the description
         for garment in clothes_list:
             # If 'worn' is True, just append the name
@@ -438,15 +644,11 @@ class UMClothedCharacter(DefaultCharacter):
             # Otherwise, append the name and the string value of 'worn'
             elif garment.db.worn:
                 worn_string_list.append("%s %s" % (garment.name, garment.db.worn))
-        if looker == self:
-            string += "You are "
-        else:
-            string += f"{self.get_display_name(looker)} is "
-        # Append worn clothes.
         if worn_string_list:
-            string += f"wearing {list_to_string(worn_string_list)}."
+            string = f"wearing {list_to_string(worn_string_list)}."
         else:
-            string += "not wearing anything."
+            string = "not wearing anything."
+        self.ndb.appearance_worn = (equipment.version, string)
         return string
 
 
@@ -501,7 +703,6 @@ class CmdWear(ClothingCommand):
         """
         caller = self.caller
         clothing = self.target
-        worn_clothes = get_worn_clothes(caller)
 
         # removed this, this is enforced per item type.
         # Enforce overall clothing limit.
@@ -510,12 +711,11 @@ class CmdWear(ClothingCommand):
         #    return False
         # Apply individual clothing type limits.
         if clothing.db.clothing_type and not clothing.db.worn:
-            type_count = single_type_count(worn_clothes, clothing.db.clothing_type)
-            if clothing.db.clothing_type in list(clothing.type_limit.keys()):
-                if type_count >= clothing.type_limit[clothing.db.clothing_type]:
-                    for worn_article in worn_clothes:
-                        if worn_article.db.clothing_type == clothing.db.clothing_type:
-                            worn_art_name = worn_article.get_display_name(caller)
+            worn_of_type = caller.equipment.slot(clothing.db.clothing_type)
+            if clothing.db.clothing_type in clothing.type_limit:
+                if len(worn_of_type) >= clothing.type_limit[clothing.db.clothing_type]:
+                    worn_article = worn_of_type[-1]
+                    worn_art_name = worn_article.get_display_name(caller)
                     remove_cmd = f"remove {worn_article.get_display_name(caller)}"
                     remove_sugg = highlighter(remove_cmd, click_cmd=remove_cmd)
                     err_msg = f"You are wearing {worn_art_name} on your " \
@@ -565,12 +765,7 @@ class CmdWear(ClothingCommand):
         wear_successful = clothing.wear(caller, wearstyle)
         # empty the hand that was holding the item worn
         if wear_successful:
-            hand = caller.is_holding(clothing)
-            if hand:
-                # the worn item was also being wielded
-                if hand.occupied == hand.wielding:
-                    hand.wielding = 0  # unwield the item
-                hand.occupied = 0  # unoccupy the hand
+            caller.release_item(clothing)
 
 
 class CmdRemove(ClothingCommand):
@@ -642,6 +837,9 @@ class CmdRemove(ClothingCommand):
             if not open_hands:
                 caller.msg("Your hands are full.")
                 clothing.db.worn = True
+                caller.contents_index.update(clothing)
+                caller.equipment.add(clothing)
+                caller.cache_body_dr(parts=(clothing.db.clothing_type,))
                 return
             else:
                 open_hand = open_hands[0]  # hand of the first open hand
@@ -703,12 +901,9 @@ class CmdArmor(Command):
                     armored_body_parts.update({part:  None})
                     continue
         # get worn armor dr values
-        for item in caller.contents:
-            if item.attributes.has('worn'):
-                # the item is worn and is armor
-                if item.db.worn and item.db.clothing_type in armored_body_parts:
-                    part_name = item.db.clothing_type
-                    armored_body_parts.update({part_name: item})
+        for part_name in armored_body_parts:
+            for item in caller.equipment.slot(part_name):
+                armored_body_parts[part_name] = item
         # get natural dr values
         for dr in caller.dr:
             if dr:
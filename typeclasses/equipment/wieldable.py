@@ -261,9 +261,8 @@ class CmdWield(Command):
             error_report(err_msg, caller)
         for hand in hands_state:
             if hand.wielding:  # if hand is wielding something
-                wield_obj_inst = caller.search(hand.wielding, quiet=True)
+                wield_obj_inst = caller.held_item(hand.wielding)
                 if wield_obj_inst:
-                    wield_obj_inst = wield_obj_inst[0]
                     if type(target) == type(wield_obj_inst):
                         stop_msg = f"You are already wielding {wield_obj_inst.usdesc}. " \
                                     "You can not wield two objects of the same type."
@@ -6,13 +6,21 @@ set and has a single command defined on itself with the same name as its key,
 for allowing Characters to traverse the exit to its destination.
 
 """
+import time
+
 from evennia import DefaultExit
 from evennia.commands import command
 from typeclasses.mixins import CharExAndObjMixin, AllObjectsMixin, ExObjAndRoomMixin
+from utils import cmdset_version
 
 # A tuple of standard exit names
 STANDARD_EXITS = ('north', 'northeast', 'east', 'southeast', 'south', 'southwest', 'west', 'northwest')
 
+# default number of occupants listed when looking through an exit.
+EXIT_PEEK_LIMIT = 5
+# seconds a snapshot of an exit's destination is served before being refreshed.
+EXIT_PEEK_TTL = 30
+
 
 class UMExitCommand(command.Command):
     """
@@ -110,10 +118,94 @@ class Exit(ExObjAndRoomMixin, AllObjectsMixin, CharExAndObjMixin, DefaultExit):
                 refer to CharExAndObjMixin doc string for full details.
                 Nearly all variables that are used in combat are inheiried from CharExAndObjMixin.
                 There are several methods inherited also.
+            peek_limit = EXIT_PEEK_LIMIT  # max number of occupants listed when looking through the exit.
+
+        Looking through an exit:
+            Exit.return_appearance serves a snapshot of the destination, see Exit.peek_snapshot.
     """
 
     exit_command = UMExitCommand
 
+    @property
+    def peek_limit(self):
+        """
+        Maximum number of characters and things listed, when looking through this exit.
+        Defaults to typeclasses.exits.EXIT_PEEK_LIMIT
+
+        Forwards to the database with, self.db.peek_limit.
+        """
+        value = self.db.peek_limit
+        if value is None:
+            return EXIT_PEEK_LIMIT
+        return value
+
+    @peek_limit.setter
+    def peek_limit(self, value):
+        self.db.peek_limit = value
+
+    @peek_limit.deleter
+    def peek_limit(self):
+        self.attributes.remove('peek_limit')
+
+    def peek_snapshot(self):
+        """
+        Returns a viewer independent snapshot of this exit's destination.
+
+        Returns:
+            snapshot (dict): {'stamp': tuple, 'expires': float, 'desc': str,
+                              'users': list, 'things': list, 'exits': list}
+
+        Notes:
+            The snapshot is stored in self.ndb.peek_snapshot
+            It is refreshed when the destination's contents change,
+                Room.appearance_version and the number of objects in the destination,
+                or after EXIT_PEEK_TTL seconds.
+                Deleting an object does not call at_object_leave on it's location.
+                The TTL picks up season and time of day description changes.
+            Each looker's view of it is filtered and bounded, see Exit.peek_view
+        """
+        destination = self.destination
+        stamp = (destination.appearance_version, len(destination.contents))
+        snapshot = self.ndb.peek_snapshot
+        if snapshot and snapshot['stamp'] == stamp and snapshot['expires'] > time.time():
+            return snapshot
+        base = destination.appearance_base()
+        snapshot = {
+            'stamp': stamp,
+            'expires': time.time() + EXIT_PEEK_TTL,
+            'desc': base['desc'],
+            'users': base['users'],
+            'things': base['things'],
+            'exits': base['exits'],
+        }
+        self.ndb.peek_snapshot = snapshot
+        return snapshot
+
+    def peek_view(self, looker, snapshot):
+        """
+        Returns the characters and things a looker sees through this exit.
+            Objects the looker can not view are removed before the list is bounded.
+            At most Exit.peek_limit characters and things are listed.
+
+        Arguments:
+            looker (Object): Object doing the looking.
+            snapshot (dict): the destination's snapshot, as returned by Exit.peek_snapshot
+
+        Returns:
+            users (list): Characters listed.
+            things (list): things listed.
+            hidden (int): number of characters and things the looker can view, that are not listed.
+        """
+        limit = self.peek_limit
+        visible_users = [con for con in snapshot['users']
+                         if con != looker and con.cached_access(looker, "view")]
+        visible_things = [con for con in snapshot['things']
+                          if con != looker and con.cached_access(looker, "view")]
+        users = visible_users[:limit]
+        things = visible_things[:limit - len(users)]
+        hidden = len(visible_users) + len(visible_things) - len(users) - len(things)
+        return users, things, hidden
+
     def return_appearance(self, looker, **kwargs):
         """
         This formats a description. It is the hook a 'look' command
@@ -124,6 +216,10 @@ class Exit(ExObjAndRoomMixin, AllObjectsMixin, CharExAndObjMixin, DefaultExit):
             **kwargs (dict): Arbitrary, optional arguments for users
                 overriding the call (unused by default).
 
+        UniqueMud:
+            The destination is displayed from a snapshot, Exit.peek_snapshot.
+            At most Exit.peek_limit characters and things the looker can view are listed, Exit.peek_view
+
         """
         exit_desc = super().return_appearance(looker, **kwargs)
         exit_desc = exit_desc.replace('\n', '')
@@ -131,7 +227,49 @@ class Exit(ExObjAndRoomMixin, AllObjectsMixin, CharExAndObjMixin, DefaultExit):
             exit_desc = exit_desc.replace('|c', '')  # remove clearing tag to capitalize
             exit_desc = f"{exit_desc.capitalize()} does not appear to lead anywhere."
             exit_desc = f'|c{exit_desc}'  # put the clearing tag back
-        else:  # the exit has a destination
+        elif not hasattr(self.destination, 'appearance_base'):  # destination has no appearance cache
             exit_desc = f"Through {exit_desc} you see:|/"
             exit_desc += self.destination.return_appearance(looker, **kwargs)
+        else:  # the exit has a destination
+            destination = self.destination
+            snapshot = self.peek_snapshot()
+            users, things, hidden = self.peek_view(looker, snapshot)
+            exit_desc = f"Through {exit_desc} you see:|/"
+            exit_desc += snapshot['desc']
+            things_str = destination.things_string(looker, things)
+            if things_str:
+                exit_desc += f"\n{things_str}"
+            users = [con.get_display_name(looker, pose=True) for con in users]
+            if users:
+                exit_desc += f"\n{' '.join(users)}"
+            if hidden:
+                if hidden == 1:
+                    exit_desc += "\nThere is 1 more thing you can not make out."
+                else:
+                    exit_desc += f"\nThere are {hidden} more things you can not make out."
+            exits_str = destination.exits_string(looker, snapshot['exits'])
+            if exits_str:
+                exit_desc += f"\n{exits_str}"
         return exit_desc
+
+    def at_after_move(self, source_location, **kwargs):
+        """
+        Called after move has completed.
+
+        UniqueMud:
+            The exit's cmdset moved with it, invalidates cached command parser tries.
+                Refer to utils.cmdset_version
+        """
+        cmdset_version.invalidate()
+        return super().at_after_move(source_location, **kwargs)
+
+    def at_object_delete(self):
+        """
+        Called just before the exit is deleted.
+
+        UniqueMud:
+            The exit's cmdset is going away, invalidates cached command parser tries.
+                Refer to utils.cmdset_version
+        """
+        cmdset_version.invalidate()
+        return super().at_object_delete()
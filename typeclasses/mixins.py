@@ -1,8 +1,17 @@
-from evennia.utils.utils import make_iter
+import re
+from bisect import bisect_left
+
+from evennia.utils.utils import make_iter, lazy_property
+from evennia.utils.ansi import strip_ansi
+from evennia.locks.lockhandler import LockHandler
+from evennia.objects.models import ContentsHandler
+from evennia.typeclasses.tags import AliasHandler
 
 from world.rules.damage import TYPES as DAMAGE_TYPES
 from utils.element import Element, ListElement
 from utils.emote import um_emote
+from utils import permission_flags
+from utils.cmdset_version import NotifyCmdSetHandler
 from world.rules.body import PART_STATUS
 from world.rules import body
 
@@ -52,7 +61,7 @@ class CharExAndObjMixin:
 
     Methods:
         get_body_part(part_name), Return a randon or specified instance of a part on the object's body.
-        cache_body_dr(), caches dr for all this Object's body parts
+        cache_body_dr(parts=None), caches dr for this Object's body parts
         ascending_breakpoint(), is automatically called when an object's hp rises above it's
             breakpoint (likely 0), when it was previous below it's breakpoint.
             Is intended to be overridden
@@ -106,6 +115,8 @@ class CharExAndObjMixin:
 
     # define untyped Object bodies
     BODY_PARTS = ()
+    # how the dr of armor worn on the same body part combines, 'sum' or 'max'
+    DR_STACKING = 'sum'
 
     @property
     def body(self):
@@ -128,7 +139,7 @@ class CharExAndObjMixin:
                 part_inst.verify()
         return self._body
 
-    def cache_body_dr(self):
+    def cache_body_dr(self, parts=None):
         """
         caches dr for a body part.
         Currently dr for a body part is received only from worn armor.
@@ -137,37 +148,69 @@ class CharExAndObjMixin:
         body.head.dr.DAMAGE_TYPE=int, dr value of a type from the DAMAGE_TYPES list
             for example body.head.dr.PRC for peirce
 
+        Arguments:
+            parts (iterable): names of the body parts to cache. IE: ('head',)
+                If None every body part is cached.
+                Names that are not body parts are ignored, IE: a hat's clothing_type.
+
         This is automatically called in:
-        typeclasses.equipment.clothing.UMClothing.wear
-        typeclasses.equipment.clothing.UMClothing.Clothing.remove
+        typeclasses.equipment.clothing.UMClothing.wear, for the part worn on
+        typeclasses.equipment.clothing.UMClothing.Clothing.remove, for the part removed from
         typeclasses.objects.at_init
         typeclasses.characters.at_init
         typeclasses.exits.at_init
 
+        UniqueMud:
+            Armor stacks when more than one item is worn on a body part.
+                Each damage type's dr is combined per DR_STACKING.
+                'sum' adds the layers together, 'max' uses the best layer.
+            Characters read what is worn on a part from their equipment index,
+                typeclasses.equipment.clothing.EquipmentIndex
+
         Unit Test:
             commands.test.TestCommands.test_wear_remove
+            typeclasses.tests.TestBodyDRCache
+        """
+        body = self.body
+        if parts is None:
+            parts = body.parts
+        # worn items by the part they are worn on
+        equipment = getattr(self, 'equipment', None)
+        if equipment is not None:
+            worn_on = equipment.slots
+        else:
+            worn_on = {}
+            for item in self.contents_index.worn:
+                if item.db.worn:
+                    worn_on.setdefault(item.db.clothing_type, []).append(item)
+        for part in parts:
+            if part in body.parts:
+                self.cache_part_dr(getattr(body, part), worn_on.get(part, ()))
+
+    def cache_part_dr(self, part_inst, items):
+        """
+        Cache the combined dr of items worn on a body part.
+
+        Arguments:
+            part_inst (ListElement): the body part, IE: self.body.head
+            items (iterable): armor worn on the body part.
         """
+        part_dr = part_inst.dr
         # clear the previous cache
-        for part in self.body.parts:
-            part_inst = getattr(self.body, part, False)
-            if part_inst:
-                for dmg_type in DAMAGE_TYPES:
-                    if hasattr(part_inst.dr, dmg_type):
-                        delattr(part_inst.dr, dmg_type)
-            setattr(part_inst.dr, 'el_list', [])
-        # cache worn dr
-        for item in self.contents:
-            if item.db.worn:
-                # if this item covers a body part
-                if item.db.clothing_type in self.body.parts:
-                    # get the body part this item covers
-                    body_part = getattr(self.body, item.db.clothing_type)
-                    # give the body part a list of dr types the armor supports, to mimic an Objects.dr
-                    setattr(body_part.dr, 'el_list', item.dr.el_list)
-                    # for damage types in the dr element list
-                    for dmg_type in item.dr.el_list:
-                        dmg_type_dr_rating = getattr(item.dr, dmg_type, 0)
-                        setattr(body_part.dr, dmg_type, dmg_type_dr_rating)
+        for dmg_type in DAMAGE_TYPES:
+            if hasattr(part_dr, dmg_type):
+                delattr(part_dr, dmg_type)
+        combine = max if self.DR_STACKING == 'max' else sum
+        # one list of dr values per damage type, one value per layer
+        layers = {}
+        for item in items:
+            item_dr = item.dr
+            for dmg_type in item_dr.el_list:
+                layers.setdefault(dmg_type, []).append(getattr(item_dr, dmg_type, 0))
+        for dmg_type, values in layers.items():
+            setattr(part_dr, dmg_type, combine(values))
+        # give the body part a list of dr types the armor supports, to mimic an Objects.dr
+        setattr(part_dr, 'el_list', list(layers))
 
     def get_body_part(self, part_name=False, log=False):
         """Return a randon or specified instance of a part on the object's body.
@@ -250,6 +293,432 @@ class CharExAndObjMixin:
         return super().at_object_creation()
 
 
+# partitions of a ContentsIndex, in the order an object is checked against them
+CONTENTS_INDEX_TYPES = ('exits', 'characters', 'worn', 'things')
+
+
+class ContentsIndex:
+    """
+    In memory index of an object's contents, partitioned by type.
+    Allows callers to iterate only the type of object they need.
+    Available on all objects as obj.contents_index
+
+    Partitions:
+        exits, objects with a destination
+        characters, objects that inherit from typeclasses.characters.Character
+        worn, objects with db.worn set. IE: clothing and armor worn by a Character
+        things, all other objects
+
+    Arguments:
+        container (Object): the object whose contents are indexed
+
+    Usage:
+        for char in room.contents_index.characters:
+        worn_items = character.contents_index.worn
+
+    Notes:
+        The index is maintained incrementally by IndexedContentsHandler.
+            Evennia updates a container's contents cache each time an object's
+            location is set, by move_to, directly, on creation and on deletion.
+            AllObjectsMixin.at_object_delete also removes a deleted object.
+        Reads trust the index, they do not check the container's contents.
+        An object that changes type without moving, must be re-indexed with
+            ContentsIndex.update. For example when clothing is worn or removed.
+
+    Unit Tests:
+        typeclasses.tests.TestContentsIndex
+    """
+
+    def __init__(self, container):
+        self.container = container
+        self.rebuild()
+
+    @staticmethod
+    def classify(obj):
+        """
+        Returns the name of the partition an object belongs to.
+
+        Arguments:
+            obj (Object): object to classify
+
+        Returns:
+            index_type (str): an entry in mixins.CONTENTS_INDEX_TYPES
+        """
+        if obj.destination:
+            return 'exits'
+        if getattr(obj, 'is_character', False):
+            return 'characters'
+        if obj.db.worn:
+            return 'worn'
+        return 'things'
+
+    def rebuild(self):
+        """Rebuild the index from the container's contents."""
+        # dictionaries of id: obj, insertion order matches content order
+        self.partitions = {index_type: dict() for index_type in CONTENTS_INDEX_TYPES}
+        self.obj_types = dict()  # id: index_type, of all indexed objects
+        for obj in self.container.contents:
+            self.add(obj)
+
+    def add(self, obj):
+        """
+        Add an object to the index, or re-index it if already indexed.
+
+        Arguments:
+            obj (Object): object now in the container.
+        """
+        self.discard(obj)
+        index_type = self.classify(obj)
+        self.partitions[index_type][obj.id] = obj
+        self.obj_types[obj.id] = index_type
+
+    # re-index an object that has changed type without moving.
+    update = add
+
+    def discard(self, obj):
+        """
+        Remove an object from the index, if it is indexed.
+
+        Arguments:
+            obj (Object): object no longer in the container.
+        """
+        index_type = self.obj_types.pop(obj.id, None)
+        if index_type:
+            del self.partitions[index_type][obj.id]
+
+    def get(self, *index_types):
+        """
+        Returns a list of objects in the requested partitions.
+
+        Arguments:
+            *index_types (str): entries in mixins.CONTENTS_INDEX_TYPES
+
+        Returns:
+            objects (list): objects in the requested partitions.
+        """
+        objects = []
+        for index_type in index_types:
+            objects.extend(self.partitions[index_type].values())
+        return objects
+
+    @property
+    def exits(self):
+        return self.get('exits')
+
+    @property
+    def characters(self):
+        return self.get('characters')
+
+    @property
+    def worn(self):
+        return self.get('worn')
+
+    @property
+    def things(self):
+        return self.get('things')
+
+
+# words in names, sdescs and recogs
+_RE_SEARCH_TOKEN = re.compile(r"\w+")
+
+
+class SearchIndex:
+    """
+    In memory index of the words in an object's contents names.
+    Maps lower case words in keys, aliases and sdescs to the objects they belong to.
+    Available on all objects as obj.search_index
+
+    Arguments:
+        container (Object): the object whose contents are indexed
+
+    Usage:
+        matches = room.search_index.search("tall man", looker=caller)
+
+    Notes:
+        A search word matches an object if it is the start of any word in the
+            object's key, aliases, sdesc or the looker's recog of the object.
+            Every word searched for must match.
+        Recogs are a per looker overlay. They are read from the looker's recog
+            handler at search time, so they do not need to be indexed.
+        The index is maintained incrementally by IndexedContentsHandler, as ContentsIndex is.
+            An object whose sdesc or key changes without moving must be
+            re-indexed with SearchIndex.update, usdesc setters do this.
+        This is intended to narrow the candidates of caller.search.
+            Every object caller.search can match by name is a candidate,
+            the index may return more candidates, never fewer.
+            See commands.command.Command.target_search
+
+    Unit Tests:
+        typeclasses.tests.TestSearchIndex
+    """
+
+    def __init__(self, container):
+        self.container = container
+        self.rebuild()
+
+    @staticmethod
+    def tokenize(text):
+        """
+        Returns a set of the lower case words in a string.
+
+        Arguments:
+            text (str): string to split into words, ansi markup is removed.
+        """
+        if not text:
+            return set()
+        return set(_RE_SEARCH_TOKEN.findall(strip_ansi(text).lower()))
+
+    @classmethod
+    def obj_tokens(cls, obj):
+        """
+        Returns a set of words an object can be searched for with.
+            From the object's key, aliases and sdesc.
+
+        Arguments:
+            obj (Object): object to find the words for
+        """
+        tokens = cls.tokenize(obj.key)
+        for alias in obj.aliases.all():
+            tokens.update(cls.tokenize(alias))
+        sdesc = getattr(obj, 'sdesc', None)
+        if sdesc:
+            tokens.update(cls.tokenize(sdesc.get()))
+        return tokens
+
+    def rebuild(self):
+        """Rebuild the index from the container's contents."""
+        self.objects = dict()  # id: obj
+        self.tokens = dict()  # id: set of words
+        self.words = dict()  # word: set of ids
+        self.positions = dict()  # id: order the object was added in, contents order
+        self._next_position = 0
+        self._sorted_words = None
+        for obj in self.container.contents:
+            self.add(obj)
+
+    def add(self, obj):
+        """
+        Add an object to the index, or re-index it if already indexed.
+
+        Arguments:
+            obj (Object): object now in the container.
+        """
+        position = self.positions.get(obj.id)
+        self.discard(obj)
+        if position is None:  # new object, it is last in contents
+            position = self._next_position
+            self._next_position += 1
+        self.positions[obj.id] = position
+        tokens = self.obj_tokens(obj)
+        self.objects[obj.id] = obj
+        self.tokens[obj.id] = tokens
+        for token in tokens:
+            if token not in self.words:
+                self.words[token] = set()
+                self._sorted_words = None  # new word, re-sort on next search
+            self.words[token].add(obj.id)
+
+    # re-index an object that has changed names without moving.
+    update = add
+
+    def discard(self, obj):
+        """
+        Remove an object from the index, if it is indexed.
+
+        Arguments:
+            obj (Object): object no longer in the container.
+        """
+        self.objects.pop(obj.id, None)
+        self.positions.pop(obj.id, None)
+        for token in self.tokens.pop(obj.id, ()):
+            obj_ids = self.words[token]
+            obj_ids.discard(obj.id)
+            if not obj_ids:
+                del self.words[token]
+                self._sorted_words = None
+
+    def prefix_ids(self, word):
+        """
+        Returns a set of ids of objects with a word starting with word.
+            Uses a binary search of the sorted indexed words.
+
+        Arguments:
+            word (str): lower case word to search for
+        """
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self.words)
+        sorted_words = self._sorted_words
+        obj_ids = set()
+        position = bisect_left(sorted_words, word)
+        while position < len(sorted_words) and sorted_words[position].startswith(word):
+            obj_ids.update(self.words[sorted_words[position]])
+            position += 1
+        return obj_ids
+
+    def search(self, text, looker=None):
+        """
+        Returns a list of indexed objects matching every word in text.
+
+        Arguments:
+            text (str): name to search for. IE: "tall man"
+            looker (Object): object searching, it's recogs are included in the search.
+
+        Returns:
+            matches (list): matching objects in contents order, empty if there is no match.
+        """
+        words = self.tokenize(text)
+        if not words:
+            return []
+        # per looker recog overlay, only recogs of indexed objects
+        recog_tokens = dict()
+        try:
+            recogs = looker.recog.obj2recog
+        except AttributeError:
+            recogs = {}
+        for obj, recog in recogs.items():
+            if obj.id in self.objects:
+                recog_tokens[obj.id] = self.tokenize(recog)
+        matched_ids = None
+        for word in words:
+            word_ids = self.prefix_ids(word)
+            for obj_id, tokens in recog_tokens.items():
+                if any(token.startswith(word) for token in tokens):
+                    word_ids.add(obj_id)
+            matched_ids = word_ids if matched_ids is None else matched_ids & word_ids
+            if not matched_ids:
+                return []
+        return [self.objects[obj_id] for obj_id in sorted(matched_ids, key=self.positions.get)]
+
+
+# in memory indexes of a container's contents, attribute names of indexes that have been created
+CONTENTS_INDEXES = ('_contents_index', '_search_index', '_equipment')
+
+
+class IndexedContentsHandler(ContentsHandler):
+    """
+    Contents cache that keeps its container's contents indexes current.
+        Used by AllObjectsMixin.contents_cache
+
+    Evennia adds an object to its location's contents cache, and removes it from
+        the location it left, each time the object's location is set.
+        By move_to, a direct obj.location = value, creation and deletion.
+    Indexes are only updated if they have been created.
+        They are created from contents the first time they are used.
+        Refer to CONTENTS_INDEXES
+    """
+
+    def add(self, obj):
+        result = super().add(obj)
+        for index_name in CONTENTS_INDEXES:
+            index = getattr(self.obj, index_name, None)
+            if index:
+                index.add(obj)
+        return result
+
+    def remove(self, obj):
+        result = super().remove(obj)
+        for index_name in CONTENTS_INDEXES:
+            index = getattr(self.obj, index_name, None)
+            if index:
+                index.discard(obj)
+        return result
+
+
+# capability tags: typeclass paths, a class with any path in its mro has the tag.
+#   Each tag is a class attribute of every AllObjectsMixin subclass.
+#   Objects that do not inherit AllObjectsMixin have no tags, read them with a default.
+#   IE: if getattr(target, 'is_character', False):
+TYPE_TAGS = {
+    'is_character': ('typeclasses.characters.Character',),
+    'is_room': ('typeclasses.rooms.Room',),
+    'is_exit': ('typeclasses.exits.Exit',),
+    # instances are always containers, others may set obj.container
+    'is_container': ('typeclasses.rooms.Room', 'typeclasses.characters.Character'),
+    'is_wieldable': ('typeclasses.equipment.wieldable.Wieldable',),
+    'is_clothing': ('typeclasses.equipment.clothing.UMClothing',),
+}
+# typeclass path: frozenset of the type tags of the class
+TYPE_TAG_REGISTRY = dict()
+
+
+def class_path(cls):
+    """Returns the python path of a class, as utils.inherits_from compares them."""
+    return f"{cls.__module__}.{cls.__name__}"
+
+
+def resolve_type_tags(cls):
+    """
+    Returns a frozenset of the TYPE_TAGS a class has.
+        Resolved from the paths of every class in the class's mro.
+    """
+    mro_paths = {class_path(klass) for klass in cls.__mro__}
+    return frozenset(tag for tag, tag_paths in TYPE_TAGS.items()
+                     if mro_paths.intersection(tag_paths))
+
+
+class NotifyLockHandler(LockHandler):
+    """
+    Lock handler that calls its object's at_locks_change hook when locks are edited.
+        Used by AllObjectsMixin.locks
+    """
+
+    def _changed(self):
+        at_locks_change = getattr(self.obj, 'at_locks_change', None)
+        if at_locks_change:
+            at_locks_change()
+
+    def add(self, *args, **kwargs):
+        result = super().add(*args, **kwargs)
+        self._changed()
+        return result
+
+    def remove(self, *args, **kwargs):
+        result = super().remove(*args, **kwargs)
+        self._changed()
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._changed()
+        return result
+
+    def clear(self, *args, **kwargs):
+        result = super().clear(*args, **kwargs)
+        self._changed()
+        return result
+
+
+# most access results kept per object, AllObjectsMixin.cached_access
+ACCESS_CACHE_SIZE = 32
+
+
+class NotifyAliasHandler(AliasHandler):
+    """
+    Alias handler that re-indexes its object's names when aliases are edited.
+        Used by AllObjectsMixin.aliases, see AllObjectsMixin.reindex_names
+    """
+
+    def _changed(self):
+        reindex_names = getattr(self.obj, 'reindex_names', None)
+        if reindex_names:
+            reindex_names()
+
+    def add(self, *args, **kwargs):
+        result = super().add(*args, **kwargs)
+        self._changed()
+        return result
+
+    def remove(self, *args, **kwargs):
+        result = super().remove(*args, **kwargs)
+        self._changed()
+        return result
+
+    def clear(self, *args, **kwargs):
+        result = super().clear(*args, **kwargs)
+        self._changed()
+        return result
+
+
 class AllObjectsMixin:
     """
     Creates basic attributes and methods that are shared on all objects.
@@ -260,8 +729,237 @@ class AllObjectsMixin:
 
         targetable = False  # is the object targetable.
         container = False  # Can the object contain other objects
+        contents_index = ContentsIndex  # in memory index of contents, partitioned by type.
+        search_index = SearchIndex  # in memory index of words in contents names.
+        permissions = PermFlagsHandler  # invalidates cached permission flags on change.
+        locks = NotifyLockHandler  # calls at_locks_change when locks are edited.
+        cmdset = NotifyCmdSetHandler  # invalidates cached command parser tries on change.
+        contents_cache = IndexedContentsHandler  # keeps contents_index, search_index and equipment current.
+        aliases = NotifyAliasHandler  # re-indexes names when aliases are edited.
+
+    Type tags:
+        Class attributes, resolved once when a typeclass is defined.
+        Use them instead of utils.inherits_from string checks.
+        Contrib, default and bare @create typeclasses do not have them, read them with a default.
+            if getattr(target, 'is_character', False):
+        is_character, is_room, is_exit, is_container, is_wieldable, is_clothing
+        Refer to mixins.TYPE_TAGS, tested by typeclasses.tests.TestTypeTags
     """
 
+    is_character = False
+    is_room = False
+    is_exit = False
+    is_container = False
+    is_wieldable = False
+    is_clothing = False
+
+    def __init_subclass__(cls, **kwargs):
+        """Resolve and register the type tags of each new typeclass."""
+        super().__init_subclass__(**kwargs)
+        tags = resolve_type_tags(cls)
+        for tag in TYPE_TAGS:
+            setattr(cls, tag, tag in tags)
+        TYPE_TAG_REGISTRY[class_path(cls)] = tags
+
+    @lazy_property
+    def permissions(self):
+        """
+        Permission handler that invalidates cached permission flags when permissions change.
+            Refer to utils.permission_flags
+        """
+        return permission_flags.PermFlagsHandler(self)
+
+    @lazy_property
+    def locks(self):
+        """
+        Lock handler that calls self.at_locks_change when locks are edited.
+            Refer to typeclasses.mixins.NotifyLockHandler
+        """
+        return NotifyLockHandler(self)
+
+    @lazy_property
+    def aliases(self):
+        """
+        Alias handler that re-indexes this object's names when aliases are edited.
+            Refer to typeclasses.mixins.NotifyAliasHandler
+        """
+        return NotifyAliasHandler(self)
+
+    def at_db_key_postsave(self, new):
+        """
+        Called by evennia's idmapper after the key is saved. IE: obj.key = "new name" or @name
+            Re-indexes this object's names, see AllObjectsMixin.reindex_names
+
+        Arguments:
+            new (bool): True if the object was just created.
+        """
+        if not new:
+            self.reindex_names()
+
+    @lazy_property
+    def contents_cache(self):
+        """
+        Contents cache that keeps this object's contents indexes current.
+            Refer to typeclasses.mixins.IndexedContentsHandler
+        """
+        return IndexedContentsHandler(self)
+
+    @lazy_property
+    def cmdset(self):
+        """
+        Cmdset handler that invalidates caches built from merged cmdsets when cmdsets change.
+            Refer to utils.cmdset_version
+        """
+        return NotifyCmdSetHandler(self, True)
+
+    def at_locks_change(self):
+        """
+        Called when this object's locks are edited.
+            Invalidates the appearance cache of this object's location.
+        """
+        location = self.location
+        if location and hasattr(location, 'clear_appearance_cache'):
+            location.clear_appearance_cache()
+
+    def cached_access(self, accessing_obj, access_type='read', default=False):
+        """
+        Cached version of self.access, for hot paths like name and appearance renders.
+            Results are cached per accessing object and access type.
+
+        Arguments:
+            accessing_obj (Object): object trying to access this one.
+            access_type (str): type of access sought. IE: 'control', 'view'
+            default (bool): what to return if no lock of access_type was found.
+
+        Returns:
+            result (bool): if the access is granted.
+
+        Notes:
+            Only locks whose lock functions depend on permissions alone are cached.
+                Locks checking tags, attributes, location or holding call self.access each time.
+                Refer to utils.permission_flags.PERMISSION_LOCKFUNCS
+            A cached result is used while permissions, this object's locks and the
+                accessing object's account are unchanged. Quelling invalidates all results.
+            At most ACCESS_CACHE_SIZE results are kept per object, the oldest is dropped first.
+            Access hooks, as at_access, are only called when the result is not cached.
+        """
+        if not permission_flags.permission_only(self.locks.get(access_type)):
+            return self.access(accessing_obj, access_type=access_type, default=default)
+        account = getattr(accessing_obj, 'account', None)
+        version = (permission_flags.PERMISSION_VERSION, self.db_lock_storage,
+                   account.id if account else None)
+        key = (accessing_obj.id, access_type)
+        try:
+            cached = self._access_cache.get(key)
+        except AttributeError:
+            self._access_cache = dict()
+            cached = None
+        if cached and cached[0] == version:
+            return cached[1]
+        result = self.access(accessing_obj, access_type=access_type, default=default)
+        access_cache = self._access_cache
+        access_cache.pop(key, None)
+        if len(access_cache) >= ACCESS_CACHE_SIZE:
+            del access_cache[next(iter(access_cache))]  # drop the oldest result
+        access_cache[key] = (version, result)
+        return result
+
+    @property
+    def contents_index(self):
+        """
+        In memory index of this object's contents, partitioned by type.
+        Refer to typeclasses.mixins.ContentsIndex for usage.
+
+        Usage:
+            for char in room.contents_index.characters:
+        """
+        try:
+            if self._contents_index:
+                pass
+        except AttributeError:
+            self._contents_index = ContentsIndex(self)
+        return self._contents_index
+
+    @contents_index.deleter
+    def contents_index(self):
+        try:
+            del self._contents_index
+        except AttributeError:
+            pass
+
+    @property
+    def search_index(self):
+        """
+        In memory index of the words in this object's contents names.
+        Refer to typeclasses.mixins.SearchIndex for usage.
+
+        Usage:
+            matches = room.search_index.search("tall man", looker=caller)
+        """
+        try:
+            if self._search_index:
+                pass
+        except AttributeError:
+            self._search_index = SearchIndex(self)
+        return self._search_index
+
+    @search_index.deleter
+    def search_index(self):
+        try:
+            del self._search_index
+        except AttributeError:
+            pass
+
+    def reindex_names(self):
+        """
+        Re-index this object in it's location's search index.
+        Called after this object's key, aliases or sdesc change.
+            Key changes through at_db_key_postsave, aliases through NotifyAliasHandler.
+        The appearance cache of the object's location is invalidated.
+        If the object is worn, it is re-indexed in the wearer's equipment index.
+            Changing the equipment version, so the wearer's appearance is rebuilt.
+        """
+        location_index = getattr(self.location, '_search_index', None)
+        if location_index:
+            location_index.update(self)
+        # rooms cache the names of their contents, see Room.clear_appearance_cache
+        if self.location and hasattr(self.location, 'clear_appearance_cache'):
+            self.location.clear_appearance_cache()
+        equipment = getattr(self.location, '_equipment', None)
+        if equipment and self.db.worn:
+            equipment.update(self)
+
+    def msg_contents(self, text=None, exclude=None, from_obj=None, mapping=None, **kwargs):
+        """
+        Emits a message to all objects inside this object.
+
+        UniqueMud:
+            Characters that would drop the message, as unconscious or dead Characters,
+                are excluded before the message is rendered for each receiver.
+                See Character.receives_msg
+        """
+        dropped = [char for char in self.contents_index.characters
+                   if not char.receives_msg(**kwargs)]
+        if dropped:
+            exclude = list(make_iter(exclude)) + dropped if exclude else dropped
+        return super().msg_contents(text, exclude=exclude, from_obj=from_obj, mapping=mapping,
+                                    **kwargs)
+
+    def at_object_delete(self):
+        """
+        Called just before the object is deleted.
+
+        UniqueMud:
+            Removes this object from its location's contents indexes.
+                Refer to typeclasses.mixins.IndexedContentsHandler
+        """
+        location = self.location
+        for index_name in CONTENTS_INDEXES:
+            index = getattr(location, index_name, None)
+            if index:
+                index.discard(self)
+        return super().at_object_delete()
+
     @property
     def targetable(self):
         """
@@ -373,7 +1071,7 @@ class AllObjectsMixin:
             commands.tests.TestCommands.test_um_emote, indirectly
             This will be directly tested in most commands scripts and other.
         """
-        receivers = self.contents
+        receivers = self.contents_index.get(*CONTENTS_INDEX_TYPES)
         if exclude:
             exclude = make_iter(exclude)
             receivers = [obj for obj in receivers if obj not in exclude]
@@ -444,7 +1142,7 @@ class AllObjectsMixin:
             skip_caller (bool): Send to everyone except caller.
 
         """
-        receivers = self.location.contents
+        receivers = self.location.contents_index.get('characters', 'worn', 'things')
         sender = self if not sender else sender
         # remove caller from emote receivers.
         if skip_caller:
@@ -495,3 +1193,4 @@ class ExObjAndRoomMixin:
     def usdesc(self, value):
         """Setter property for usdesc"""
         self.key = value
+        self.reindex_names()  # names changed, update location's search index
@@ -14,7 +14,7 @@ inheritance.
 from collections import defaultdict
 
 from evennia.contrib.rpsystem import ContribRPObject
-from evennia.utils import inherits_from, list_to_string
+from evennia.utils import list_to_string
 from typeclasses.mixins import CharExAndObjMixin, AllObjectsMixin, ExObjAndRoomMixin
 
 from utils.um_utils import error_report
@@ -209,17 +209,26 @@ class Object(ExObjAndRoomMixin, AllObjectsMixin, CharExAndObjMixin, ContribRPObj
         # if item was removed from a Character, remove it from hand if it was in one.
         if source_location:
             # only check hand state on Characters
-            if inherits_from(source_location, "typeclasses.characters.Character"):
-                hand_state = source_location.hands()
-                for hand in hand_state:
-                    if hand.occupied == self.dbref:  # if the moved item was in a Character's hand
-                        hand.occupied = 0  # record that the item is no longer held
-                    if hand.wielding == self.dbref:  # if the moved item was being wielded by a Character
-                        hand.wielding = 0  # record that the item is not longer wielded
+            if getattr(source_location, 'is_character', False):
+                source_location.release_item(self)
 
         # here to support possible future upgrades to parent classes.
         return at_after_move_return
 
+    def at_object_delete(self):
+        """
+        Called just before the database object is permanently
+        delete()d from the database. If this method returns False,
+        deletion is aborted.
+
+        UniqueMud:
+            Empties the hands of a Character holding or wielding this object.
+                Keeping Character.held_items valid without a search.
+        """
+        if self.location and getattr(self.location, 'is_character', False):
+            self.location.release_item(self)
+        return super().at_object_delete()
+
     def at_before_move(self, destination, **kwargs):
         """
         Called just before starting to move this object to
@@ -245,7 +254,7 @@ class Object(ExObjAndRoomMixin, AllObjectsMixin, CharExAndObjMixin, ContribRPObj
         if not move_allowed:  # inherited object found reason to not move.
             return False
         # only allow movement if this object is moving into a container
-        if destination.container:
+        if getattr(destination, 'is_container', False) or destination.container:
             return True
         else:
             return False
@@ -269,18 +278,16 @@ class Object(ExObjAndRoomMixin, AllObjectsMixin, CharExAndObjMixin, ContribRPObj
         else:
             string += f"{self.get_display_name(looker)} is devoid of description."
         if self.container and self.access(looker, "view"):  # this object is a container.
-            # get and identify all objects
-            visible = (con for con in self.contents if con != looker and con.access(looker, "view"))
-            exits, users, things = [], [], defaultdict(list)
-            for con in visible:
-                key = con.get_display_name(looker, pose=True)
-                if con.destination:
-                    exits.append(key)
-                elif inherits_from(con, "typeclasses.characters.Character"):
-                    users.append(key)
-                else:
+            # get and identify all objects, exits are not displayed
+            contents_index = self.contents_index
+            users, things = [], defaultdict(list)
+            for con in contents_index.characters:
+                if con != looker and con.access(looker, "view"):
+                    users.append(con.get_display_name(looker, pose=True))
+            for con in contents_index.get('things', 'worn'):
+                if con != looker and con.access(looker, "view"):
                     # things can be pluralized
-                    things[key].append(con)
+                    things[con.get_display_name(looker, pose=True)].append(con)
             string += "\nIt contains "
             if things or users:
                 if things:
@@ -10,7 +10,11 @@ from collections import defaultdict
 from evennia.contrib.rpsystem import ContribRPRoom
 from evennia.contrib.extended_room import ExtendedRoom
 from typeclasses.mixins import ExObjAndRoomMixin, AllObjectsMixin
-from evennia.utils.utils import list_to_string, inherits_from
+from evennia.utils.utils import list_to_string
+from utils import permission_flags
+
+# keys of Room.appearance_stats
+APPEARANCE_STAT_KEYS = ('base_hits', 'base_misses', 'view_hits', 'view_misses')
 
 
 class Room(AllObjectsMixin, ExObjAndRoomMixin, ContribRPRoom, ExtendedRoom):
@@ -43,6 +47,23 @@ class Room(AllObjectsMixin, ExObjAndRoomMixin, ContribRPRoom, ExtendedRoom):
                 targetable = False  # can this object be targeted with an action
                 container = True  # Can the object contain other objects
 
+        Appearance cache:
+            return_appearance is split in two levels.
+            The room level portion (description, season and time bucket,
+                exits, characters and things in the room) is viewer independent.
+                It is stored in self.ndb.appearance_base and is rebuilt when
+                Room.appearance_version, the season or the time slot changes.
+            The viewer level portion (exits and things as a looker sees them, including
+                recogs and control dbrefs) is stored per looker in
+                self.ndb.appearance_views. It is rebuilt when the room level portion
+                is rebuilt or the looker's recogs of objects in the room change.
+            Characters in the room are always rendered for the looker, their poses
+                can change without an object moving.
+            Moving objects into or out of the room, renaming or editing the locks of
+                an object in the room and editing the room's description invalidate
+                the cache, see Room.clear_appearance_cache.
+            Hit and miss counters are available with Room.appearance_stats.
+
     """
 
     def at_object_creation(self):
@@ -50,6 +71,213 @@ class Room(AllObjectsMixin, ExObjAndRoomMixin, ContribRPRoom, ExtendedRoom):
         self.container = True  # Can the object contain other objects
         super().at_object_creation()
 
+    @property
+    def appearance_version(self):
+        """
+        Intiger incremented each time the room's appearance cache is invalidated.
+        Stored on the non persistent attribute handler, self.ndb.appearance_version.
+        """
+        return self.ndb.appearance_version or 0
+
+    @property
+    def appearance_stats(self):
+        """
+        Hit and miss counters for the room's appearance cache.
+
+        Returns:
+            stats (dict): {'base_hits': int, 'base_misses': int,
+                           'view_hits': int, 'view_misses': int}
+                base_ counts are for the viewer independent portion.
+                view_ counts are for the per looker portion.
+        """
+        stats = self.ndb.appearance_stats
+        if not stats:
+            stats = dict.fromkeys(APPEARANCE_STAT_KEYS, 0)
+            self.ndb.appearance_stats = stats
+        return stats
+
+    def clear_appearance_cache(self):
+        """
+        Invalidate the room's cached appearance.
+        Called when objects move into or out of the room and when the room's
+            description is edited.
+        Called when an object in the room is renamed or its locks are edited.
+            See AllObjectsMixin.reindex_names and AllObjectsMixin.at_locks_change
+        """
+        self.ndb.appearance_version = self.appearance_version + 1
+        self.ndb.appearance_base = None
+        self.ndb.appearance_views = None
+
+    def at_object_receive(self, moved_obj, source_location, **kwargs):
+        """
+        Called after an object has been moved into this object.
+
+        UniqueMud:
+            Invalidates the room's appearance cache.
+        """
+        self.clear_appearance_cache()
+        return super().at_object_receive(moved_obj, source_location, **kwargs)
+
+    def at_object_leave(self, moved_obj, target_location, **kwargs):
+        """
+        Called just before an object leaves from inside this object
+
+        UniqueMud:
+            Invalidates the room's appearance cache.
+        """
+        self.clear_appearance_cache()
+        return super().at_object_leave(moved_obj, target_location, **kwargs)
+
+    def appearance_base(self):
+        """
+        Returns the viewer independent portion of the room's appearance.
+        Rebuilds it when the room's appearance version, season or time slot changes.
+
+        Returns:
+            base (dict): {'stamp': tuple, 'desc': str, 'ids': frozenset,
+                          'exits': list, 'users': list, 'things': list}
+                exits, users and things are lists of Objects, in the room's content order.
+
+        Notes:
+            The number of objects in the room is a part of the stamp.
+                Deleting an object does not call at_object_leave on it's location.
+            The room's desc attribute is a part of the stamp.
+                So descriptions changed outside of the desc commands are noticed.
+        """
+        stats = self.appearance_stats
+        season, timeslot = self.get_time_and_season()
+        contents = self.contents
+        stamp = (self.appearance_version, season, timeslot, len(contents), self.db.desc)
+        base = self.ndb.appearance_base
+        if base and base['stamp'] == stamp:
+            stats['base_hits'] += 1
+            return base
+        stats['base_misses'] += 1
+        # update for seasons and time, IE: ExtendedRoom
+        # ensures that our description is current based on time/season
+        self.update_current_description()
+        # the description may have been updated for the season or time
+        stamp = stamp[:-1] + (self.db.desc,)
+        # identify all objects
+        contents_index = self.contents_index
+        exits = contents_index.exits
+        users = contents_index.characters
+        things = contents_index.get('things', 'worn')
+        desc = self.db.desc
+        if desc:
+            desc = f"{desc.capitalize()}"
+        else:
+            desc = "You are in a space devoid of description."
+        # ids of objects a looker may have a recog for
+        ids = frozenset(con.id for con in exits + things)
+        base = {'stamp': stamp, 'desc': desc, 'ids': ids,
+                'exits': exits, 'users': users, 'things': things}
+        self.ndb.appearance_base = base
+        self.ndb.appearance_views = None  # views are built upon the base, clear them
+        return base
+
+    def appearance_view(self, looker, base):
+        """
+        Returns the looker's portion of the room's appearance.
+        This is the exits and things in the room, as the looker sees them.
+
+        Arguments:
+            looker (Object): Object doing the looking.
+            base (dict): the viewer independent portion of the room's appearance.
+                As returned by Room.appearance_base
+
+        Returns:
+            things_str (str): the on the ground string, empty if there are no things
+            exits_str (str): the exits string, empty if there are no exits
+
+        Notes:
+            Views are stored per looker id in self.ndb.appearance_views.
+            Along with the base stamp, a view is stamped with the looker's
+                recogs of objects in the room. Changing a recog rebuilds the view.
+            Views are also stamped with the permission version and the looker's
+                quell state, so the control dbref overlay follows permission changes.
+                Refer to utils.permission_flags
+        """
+        stats = self.appearance_stats
+        try:
+            recogs = looker.recog.obj2recog
+        except AttributeError:
+            recogs = {}
+        if recogs:
+            recog_stamp = tuple(sorted(
+                (obj.id, recog) for obj, recog in recogs.items()
+                if obj.id in base['ids']
+            ))
+        else:
+            recog_stamp = ()
+        account = getattr(looker, 'account', None)
+        quelled = bool(account and account.attributes.has('_quell'))
+        stamp = (base['stamp'], recog_stamp, permission_flags.PERMISSION_VERSION, quelled)
+        views = self.ndb.appearance_views
+        if views is None:
+            views = {}
+            self.ndb.appearance_views = views
+        view = views.get(looker.id)
+        if view and view[0] == stamp:
+            stats['view_hits'] += 1
+            return view[1], view[2]
+        stats['view_misses'] += 1
+        things_str = self.things_string(looker, base['things'])
+        exits_str = self.exits_string(looker, base['exits'])
+        views[looker.id] = (stamp, things_str, exits_str)
+        return things_str, exits_str
+
+    def things_string(self, looker, things):
+        """
+        Returns the on the ground string of the room's appearance.
+
+        Arguments:
+            looker (Object): Object doing the looking.
+            things (iterable): Objects to display, that are not exits or characters.
+
+        Returns:
+            things_str (str): "On the ground is ...", empty if looker can see no things.
+        """
+        grouped_things = defaultdict(list)
+        for con in things:
+            if con != looker and con.cached_access(looker, "view"):
+                # things can be pluralized
+                grouped_things[con.get_display_name(looker, pose=True)].append(con)
+        if not grouped_things:
+            return ""
+        # handle pluralization of things (never pluralize users)
+        thing_strings = []
+        for key, itemlist in sorted(grouped_things.items()):
+            nitem = len(itemlist)
+            if nitem == 1:
+                key, _ = itemlist[0].get_numbered_name(nitem, looker, key=key)
+            else:
+                key = [item.get_numbered_name(nitem, looker, key=key)[1] for item in itemlist][0]
+            thing_strings.append(key.strip())
+        # floor description.
+        if len(grouped_things) > 1:
+            fl_plu = "are"
+        else:
+            fl_plu = "is"
+        return f"On the ground {fl_plu} {list_to_string(thing_strings)}."
+
+    def exits_string(self, looker, exits):
+        """
+        Returns the exits string of the room's appearance.
+
+        Arguments:
+            looker (Object): Object doing the looking.
+            exits (iterable): Exits to display.
+
+        Returns:
+            exits_str (str): "You may leave by ...", empty if the looker can see no exits.
+        """
+        exit_names = [con.get_display_name(looker, pose=True) for con in exits
+                      if con != looker and con.cached_access(looker, "view")]
+        if not exit_names:
+            return ""
+        return "|wYou may leave by|n " + list_to_string(exit_names, endsep="or") + "."
+
     def return_appearance(self, looker):
         """
         This formats a description. It is the hook a 'look' command
@@ -57,54 +285,28 @@ class Room(AllObjectsMixin, ExObjAndRoomMixin, ContribRPRoom, ExtendedRoom):
 
         Args:
             looker (Object): Object doing the looking.
+
+        UniqueMud:
+            Uses the room's two level appearance cache.
+            See Room.appearance_base and Room.appearance_view.
         """
         if not looker:
             return ""
 
-        # update for seasons and time, IE: ExtendedRoom
-        # ensures that our description is current based on time/season
-        self.update_current_description()
-
-        # get and identify all objects
-        visible = (con for con in self.contents if con != looker and con.access(looker, "view"))
-        exits, users, things = [], [], defaultdict(list)
-        for con in visible:
-            key = con.get_display_name(looker, pose=True)
-            if con.destination:
-                exits.append(key)
-            elif inherits_from(con, "typeclasses.characters.Character"):
-                users.append(key)
-            else:
-                # things can be pluralized
-                things[key].append(con)
+        # viewer independent portion, description and objects in the room
+        base = self.appearance_base()
+        # looker's portion, exits and things as the looker sees them
+        things_str, exits_str = self.appearance_view(looker, base)
+        # Characters are always rendered, poses change without objects moving
+        users = [con.get_display_name(looker, pose=True) for con in base['users']
+                 if con != looker and con.cached_access(looker, "view")]
 
-        # get description, build string
-        string = ""
-        desc = self.db.desc
-        if desc:
-            string += f"{desc.capitalize()}"
-        else:
-            string += "You are in a space devoid of description."
-        if things:
-            # handle pluralization of things (never pluralize users)
-            thing_strings = []
-            for key, itemlist in sorted(things.items()):
-                nitem = len(itemlist)
-                if nitem == 1:
-                    key, _ = itemlist[0].get_numbered_name(nitem, looker, key=key)
-                else:
-                    key = [item.get_numbered_name(nitem, looker, key=key)[1] for item in itemlist][0]
-                thing_strings.append(key.strip())
-            # floor description.
-            if len(things) > 1:
-                fl_plu = "are"
-            else:
-                fl_plu = "is"
-            things_str = list_to_string(thing_strings)
-            string += f"\nOn the ground {fl_plu} {things_str}."
+        # build string
+        string = base['desc']
+        if things_str:
+            string += f"\n{things_str}"
         if users:
             string += f"\n{' '.join(users)}"
-        if exits:
-            exit_str = list_to_string(exits, endsep="or")
-            string += "\n|wYou may leave by|n " + exit_str + "."
+        if exits_str:
+            string += f"\n{exits_str}"
         return string
@@ -12,7 +12,16 @@ just overloads its hooks to have it perform its function.
 
 """
 
-from evennia import DefaultScript
+from array import array
+from bisect import insort
+
+from django.db import transaction
+from evennia import DefaultScript, create_script, search_script, utils
+from evennia.objects.models import ObjectDB
+from evennia.server.sessionhandler import SESSIONS
+from evennia.utils import logger
+
+from world.rules import damage
 
 
 class Script(DefaultScript):
@@ -90,3 +99,422 @@ class Script(DefaultScript):
     """
 
     pass
+
+
+# key of the global regeneration script
+REGENERATION_KEY = "regeneration_service"
+# number of Characters restored per database transaction
+REGENERATION_BATCH_SIZE = 100
+# 'ticker', registered Characters are restored each interval.
+# 'lazy', Characters store last_regen_time and catch up when next accessed.
+#   Only puppeted Characters are restored each interval.
+#   See Character.catch_up_regeneration
+REGENERATION_MODE = 'ticker'
+# handle of the global RegenerationService, see get_regeneration_service
+_REGENERATION_SERVICE = None
+
+
+class RegenerationService(Script):
+    """
+    One global script that naturally restores every registered Character.
+        Replaces the per Character NaturalHealing scripts.
+
+    Each HEALING_INTERVAL seconds, registered Characters are restored in batches of
+        REGENERATION_BATCH_SIZE. Each batch's writes are done in one transaction.
+    Characters at full hp, END, WILL and PERM are unregistered, so they are not loaded each interval.
+        They register again when a stat falls below max, Character.at_stat_below_max
+        See Character.regenerate
+
+    Attributes:
+        char_ids (array): ids of registered Characters. Saved to self.db.char_ids when changed.
+
+    Usage:
+        get_regeneration_service().register(char)
+
+    Notes:
+        With REGENERATION_MODE 'lazy' only puppeted Characters are restored by the service.
+            Others catch up when they are puppeted, targeted or view their
+            status or condition. See Character.catch_up_regeneration
+        Characters register in Character.at_object_creation and Character.at_stat_below_max.
+        Deleted Characters are removed from the service when a tick does not find them.
+        migrate_natural_healing, moves Characters with a NaturalHealing script to
+            this service and deletes the script. Called at server start.
+
+    Unit Tests:
+        typeclasses.tests.TestRestoration
+    """
+
+    def at_script_creation(self):
+        self.key = REGENERATION_KEY
+        self.desc = "Natural restoration of Character stats."
+        self.interval = damage.HEALING_INTERVAL  # reapeat time
+        self.persistent = True  # survies a reboot
+        self.db.char_ids = []
+
+    @property
+    def char_ids(self):
+        try:
+            if self._char_ids:
+                pass
+        except AttributeError:
+            self._char_ids = array('l', self.db.char_ids or [])
+        return self._char_ids
+
+    def register(self, char):
+        """Register a Character to be restored each interval."""
+        if char.id not in self.char_ids:
+            self.char_ids.append(char.id)
+            self.db.char_ids = list(self.char_ids)
+
+    def unregister(self, *char_ids):
+        """Stop restoring Characters, by id."""
+        removed = set(char_ids)
+        self._char_ids = array('l', (char_id for char_id in self.char_ids if char_id not in removed))
+        self.db.char_ids = list(self._char_ids)
+
+    def at_repeat(self):
+        # restore registered Characters when the script interval time passes
+        self.regenerate()
+
+    def regenerate(self):
+        """
+        Restore every registered Character.
+            In lazy mode only puppeted Characters.
+
+        Returns:
+            restored (int): the number of Characters that were restored.
+        """
+        if REGENERATION_MODE == 'lazy':
+            restored = 0
+            for char in SESSIONS.all_connected_puppets():
+                if hasattr(char, 'catch_up_regeneration') and char.catch_up_regeneration():
+                    restored += 1
+            return restored
+        char_ids = self.char_ids
+        restored = 0
+        removed = []
+        for start in range(0, len(char_ids), REGENERATION_BATCH_SIZE):
+            batch = char_ids[start:start + REGENERATION_BATCH_SIZE]
+            chars = resolve_objects(batch)
+            with transaction.atomic():
+                for char_id in batch:
+                    char = chars.get(char_id)
+                    if char is None:  # the Character was deleted
+                        removed.append(char_id)
+                    elif char.regenerate():
+                        restored += 1
+                    elif not char.condition.dead:  # the Character is at full
+                        removed.append(char_id)
+        if removed:
+            self.unregister(*removed)
+        return restored
+
+
+# key of the global reference sweeper script
+SWEEPER_KEY = "reference_sweeper"
+# seconds between sweeps of a batch
+SWEEPER_INTERVAL = 60
+# number of Characters swept each interval
+SWEEPER_BATCH_SIZE = 50
+# types of references the sweeper fixes, see Character.sweep_references
+SWEEP_TYPES = ('occupied', 'wielding', 'covered_by')
+
+
+class ReferenceSweeper(Script):
+    """
+    One global script that incrementally fixes dangling hand and clothing references.
+        Hand slots, occupied and wielding, and worn items' covered_by.
+
+    Each SWEEPER_INTERVAL seconds the next SWEEPER_BATCH_SIZE Characters are swept.
+        Characters, of every Character typeclass, are walked in id order.
+        See Character.sweep_references
+
+    Attributes:
+        db.cursor (int): id of the last Character swept, 0 at the start of a pass.
+        db.pass_counts (dict): references fixed in the current pass over all Characters.
+        db.last_pass (dict): references fixed in the last complete pass.
+            {'characters': int, 'occupied': int, 'wielding': int, 'covered_by': int}
+
+    Usage:
+        get_reference_sweeper().sweep()  # sweep the next batch now
+
+    Notes:
+        Object.at_after_move and Object.at_object_delete keep references valid.
+            Character.hands clears hands holding deleted items it has cached.
+            The sweeper fixes what they miss.
+        A pass that fixed references is logged when it completes.
+        Started at server start.
+
+    Unit Tests:
+        typeclasses.tests.TestReferenceSweeper
+    """
+
+    def at_script_creation(self):
+        self.key = SWEEPER_KEY
+        self.desc = "Fixes dangling hand and clothing references."
+        self.interval = SWEEPER_INTERVAL  # reapeat time
+        self.persistent = True  # survies a reboot
+        self.db.cursor = 0
+        self.db.pass_counts = None
+        self.db.last_pass = None
+
+    def at_repeat(self):
+        # sweep the next batch when the script interval time passes
+        self.sweep()
+
+    def sweep(self, batch_size=None):
+        """
+        Sweep the next batch of Characters.
+
+        Arguments:
+            batch_size (int): number of Characters to sweep, defaults to SWEEPER_BATCH_SIZE
+
+        Returns:
+            fixed (dict): references fixed in this batch, by type.
+                {'characters': int, 'occupied': int, 'wielding': int, 'covered_by': int}
+                characters is the number of Characters swept.
+        """
+        from typeclasses.characters import Character  # characters imports this module
+        batch_size = batch_size if batch_size else SWEEPER_BATCH_SIZE
+        cursor = self.db.cursor or 0
+        batch = list(Character.objects.filter_family(id__gt=cursor).order_by('id')
+                     .values_list('id', flat=True)[:batch_size])
+        chars = resolve_objects(batch)
+        fixed = dict.fromkeys(('characters',) + SWEEP_TYPES, 0)
+        with transaction.atomic():
+            for char_id in batch:
+                char = chars.get(char_id)
+                if char is None or not hasattr(char, 'sweep_references'):
+                    continue
+                fixed['characters'] += 1
+                for sweep_type, count in char.sweep_references().items():
+                    fixed[sweep_type] += count
+        pass_counts = self.db.pass_counts or dict.fromkeys(fixed, 0)
+        for count_type, count in fixed.items():
+            pass_counts[count_type] += count
+        cursor = batch[-1] if batch else cursor
+        if len(batch) < batch_size:  # a pass over all Characters is complete
+            self.db.last_pass = pass_counts
+            if any(pass_counts[sweep_type] for sweep_type in SWEEP_TYPES):
+                logger.log_info(f"Reference sweeper fixed {format_sweep_counts(pass_counts)}")
+            pass_counts = None
+            cursor = 0
+        self.db.cursor = cursor
+        self.db.pass_counts = pass_counts
+        return fixed
+
+
+# key of the global learning queue script
+LEARNING_QUEUE_KEY = "learning_queue"
+
+
+class LearningQueue(Script):
+    """
+    One global script that completes every Character's skill rank learning.
+        Replaces a persistent TaskHandler task per learning Character.
+
+    Learning is queued as [due time, Character id, skill name], sorted by due time.
+        One delay is scheduled, for the earliest due time.
+        When it fires every due entry is completed with world.rules.skills.learn
+        Characters are resolved by id, from memory when loaded. See resolve_objects
+
+    Attributes:
+        db.queue (list): of [due time, Character id, skill name], sorted by due time.
+            Due times are the task handler clock's seconds, unix time on a running server.
+
+    Usage:
+        get_learning_queue().enqueue(char, 'punch', learn_time)
+
+    Notes:
+        The delay is not persistent. at_start schedules it again after a reload.
+            Learning due while the server was down completes at start.
+        Entries of deleted Characters are dropped when they come due.
+        Created by the learn command, and at server start.
+
+    Unit Tests:
+        commands.tests.TestLearn
+    """
+
+    def at_script_creation(self):
+        self.key = LEARNING_QUEUE_KEY
+        self.desc = "Completes Character skill rank learning."
+        self.persistent = True  # survies a reboot
+        self.db.queue = []
+
+    def at_start(self, **kwargs):
+        # the scheduled delay does not survive a reload
+        self.schedule()
+
+    @staticmethod
+    def now():
+        """Returns the current time of the task handler's clock."""
+        from evennia.scripts.taskhandler import TASK_HANDLER
+        return TASK_HANDLER.clock.seconds()
+
+    def enqueue(self, char, skill_name, learn_time):
+        """
+        Queue a Character to learn a new rank in a skill.
+
+        Arguments:
+            char (Character): the Character learning.
+            skill_name (str): the skill being learned, IE: 'punch'
+            learn_time (float): seconds until the rank is learned.
+
+        Returns:
+            due (float): the time the rank will be learned.
+        """
+        due = self.now() + learn_time
+        queue = list(self.db.queue or [])
+        insort(queue, [due, char.id, skill_name])
+        self.db.queue = queue
+        self.schedule()
+        return due
+
+    def drain(self):
+        """
+        Complete every due entry in the queue.
+            Called by the scheduled delay.
+
+        Returns:
+            learned (int): number of ranks learned.
+
+        Notes:
+            The trimmed queue is saved in the same transaction as the learning.
+            Each entry is learned in its own savepoint. An entry that raises is
+                logged and its Character stops learning, the others complete.
+        """
+        from world.rules import skills
+        now = self.now()
+        queue = list(self.db.queue or [])
+        due_count = 0
+        while due_count < len(queue) and queue[due_count][0] <= now:
+            due_count += 1
+        due, queue = queue[:due_count], queue[due_count:]
+        learned = 0
+        try:
+            chars = resolve_objects({char_id for _, char_id, _ in due})
+            with transaction.atomic():
+                for _, char_id, skill_name in due:
+                    char = chars.get(char_id)
+                    if char is None:  # the Character was deleted
+                        continue
+                    try:
+                        with transaction.atomic():
+                            skills.learn(char, skill_name)
+                        learned += 1
+                    except Exception:
+                        logger.log_trace(f"LearningQueue failed to learn {skill_name} for Character {char_id}.")
+                        del char.condition.learning  # allow the Character to learn again
+                self.db.queue = queue
+        finally:
+            self.schedule()
+        return learned
+
+    def schedule(self):
+        """
+        Schedule a delay for the earliest due entry in the queue.
+            Cancels the delay if the queue is empty.
+        """
+        queue = self.db.queue
+        next_due = queue[0][0] if queue else None
+        timer = self.ndb.timer
+        if timer and timer[0] == next_due:
+            return
+        if timer:
+            timer[1].cancel()
+            timer[1].remove()
+        if next_due is None:
+            self.ndb.timer = None
+            return
+        task = utils.delay(max(0, next_due - self.now()), self._drain_due)
+        self.ndb.timer = (next_due, task)
+
+    def _drain_due(self):
+        """Called by the scheduled delay, removes its task before draining."""
+        timer, self.ndb.timer = self.ndb.timer, None
+        if timer:
+            timer[1].remove()
+        self.drain()
+
+    def entries(self, char):
+        """Returns the queue entries of a Character, [due time, Character id, skill name]"""
+        return [entry for entry in self.db.queue or [] if entry[1] == char.id]
+
+
+def get_learning_queue():
+    """Returns the global LearningQueue, creating it if it does not exist."""
+    found = search_script(LEARNING_QUEUE_KEY)
+    if found:
+        return found[0]
+    return create_script(LearningQueue)
+
+
+def format_sweep_counts(counts):
+    """Returns sweep counts as a readable string."""
+    fixed = ', '.join(f"{counts[sweep_type]} {sweep_type}" for sweep_type in SWEEP_TYPES)
+    return f"{fixed} references, on {counts['characters']} characters"
+
+
+def get_reference_sweeper():
+    """Returns the global ReferenceSweeper, creating it if it does not exist."""
+    found = search_script(SWEEPER_KEY)
+    if found:
+        return found[0]
+    return create_script(ReferenceSweeper)
+
+
+def resolve_objects(obj_ids):
+    """
+    Returns a dictionary of id: object for the ids passed.
+        Objects in memory are used, the rest are loaded in one query.
+        Ids of deleted objects are not in the dictionary.
+    """
+    objects = {}
+    uncached = []
+    for obj_id in obj_ids:
+        obj = ObjectDB.get_cached_instance(obj_id)
+        if obj is None:
+            uncached.append(obj_id)
+        else:
+            objects[obj_id] = obj
+    if uncached:
+        for obj in ObjectDB.objects.filter(id__in=uncached):
+            objects[obj.id] = obj
+    return objects
+
+
+def get_regeneration_service():
+    """
+    Returns the global RegenerationService, creating it if it does not exist.
+        The service is cached in _REGENERATION_SERVICE, the database is only
+        searched when the cached service is missing or was deleted.
+    """
+    global _REGENERATION_SERVICE
+    service = _REGENERATION_SERVICE
+    if service is not None and service.pk:
+        return service
+    found = search_script(REGENERATION_KEY)
+    service = found[0] if found else create_script(RegenerationService)
+    _REGENERATION_SERVICE = service
+    return service
+
+
+def migrate_natural_healing():
+    """
+    Move Characters with a NaturalHealing script to the RegenerationService.
+        The NaturalHealing scripts are deleted.
+
+    Returns:
+        migrated (int): number of scripts migrated.
+    """
+    scripts = search_script("Natural_Healing")
+    if not scripts:
+        return 0
+    service = get_regeneration_service()
+    migrated = 0
+    for script in scripts:
+        if script.obj:
+            service.register(script.obj)
+        script.delete()
+        migrated += 1
+    return migrated
@@ -1,4 +1,4 @@
-from mock import patch, Mock
+from mock import patch, Mock, PropertyMock
 import datetime
 
 from evennia.commands.default.tests import CommandTest
@@ -31,7 +31,9 @@ class TestRestoration(UniqueMudCmdTest):
         self.char1.PERM = 50
 
         # call the natural healing script
-        nat_heal_script = self.char1.scripts.get('Natural_Healing')
+        from typeclasses.scripts import get_regeneration_service
+        nat_heal_script = [get_regeneration_service()]
+        self.assertTrue(self.char1.id in nat_heal_script[0].char_ids)
         nat_heal_script[0].at_repeat()
 
         # verify healing occured
@@ -49,6 +51,77 @@ class TestRestoration(UniqueMudCmdTest):
                     nat_heal_script[0].at_repeat()
             self.assertTrue(stat_restoration_success)
 
+    def test_lazy_regeneration(self):
+        import time
+        from world.rules import stats
+        from commands import standard_cmds
+
+        interval = damage.HEALING_INTERVAL
+        self.char1.hp = 20
+        self.char1.db.last_regen_time = time.time() - interval * 30 - 5
+        # ticker mode does not catch up
+        self.assertEqual(self.char1.catch_up_regeneration(), 0)
+        with patch('typeclasses.scripts.REGENERATION_MODE', 'lazy'):
+            # all missed intervals are restored at once
+            self.assertEqual(self.char1.catch_up_regeneration(), 30)
+            self.assertTrue(self.char1.hp >= 50)
+            # the part of an interval not yet passed is kept
+            self.assertTrue(time.time() - self.char1.db.last_regen_time < interval)
+            self.assertEqual(self.char1.catch_up_regeneration(), 0)
+            # viewing condition catches up
+            self.char1.hp = 20
+            self.char1.db.last_regen_time = time.time() - interval * 2
+            self.call(standard_cmds.CmdCondition(), "")
+            self.assertTrue(self.char1.hp > 20)
+        # sampled sums stay within the possible range
+        for count in (5, 500):
+            total = stats.uniform_sum(count, 1, 4)
+            self.assertTrue(count <= total <= count * 4)
+
+    def test_regeneration_service(self):
+        from typeclasses.scripts import get_regeneration_service, migrate_natural_healing
+        from typeclasses.characters import NaturalHealing
+
+        service = get_regeneration_service()
+        # the service handle is cached, the database is not searched again
+        with patch('typeclasses.scripts.search_script') as search_script:
+            self.assertIs(get_regeneration_service(), service)
+            search_script.assert_not_called()
+        # Characters at full are skipped
+        self.char2.hp = self.char2.hp.max
+        self.char2.END = self.char2.END.max
+        self.char2.WILL = self.char2.WILL.max
+        self.char2.PERM = self.char2.PERM.max
+        self.char2.db.last_regen_time = 0
+        self.assertFalse(self.char2.regenerate())
+        # nothing is written for Characters at full
+        self.assertEqual(self.char2.db.last_regen_time, 0)
+        self.char1.hp = 50
+        self.char1.db.last_regen_time = 0
+        self.assertEqual(service.regenerate(), 1)
+        self.assertTrue(self.char1.hp > 50)
+        # ticker restoration stamps last_regen_time, lazy mode does not replay it
+        self.assertTrue(self.char1.db.last_regen_time > 0)
+        # Characters at full are unregistered
+        self.assertFalse(self.char2.id in service.char_ids)
+        self.assertTrue(self.char1.id in service.char_ids)
+        # and register again when a stat falls below max
+        self.char2.hp -= 10
+        self.assertTrue(self.char2.id in service.char_ids)
+        # deleted Characters are unregistered
+        char = create_object(Human, key="short lived", location=self.room1)
+        char_id = char.id
+        self.assertTrue(char_id in service.char_ids)
+        char.delete()
+        service.regenerate()
+        self.assertFalse(char_id in service.char_ids)
+        # NaturalHealing scripts are migrated to the service
+        service.unregister(self.char1.id)
+        self.char1.scripts.add(NaturalHealing)
+        self.assertEqual(migrate_natural_healing(), 1)
+        self.assertFalse(self.char1.scripts.get('Natural_Healing'))
+        self.assertTrue(self.char1.id in service.char_ids)
+
     def test_hp_random_restoration(self):
         # test hp restoration
         self.char1.hp = 50
@@ -142,6 +215,17 @@ class TestObjects(CommandTest):
         self.assertEqual(gendersub._RE_GENDER_PRONOUN.sub(char._get_pronoun, txt), "Test her gender")
         char.execute_cmd("sex neutral")
         self.assertEqual(gendersub._RE_GENDER_PRONOUN.sub(char._get_pronoun, txt), "Test its gender")
+        # pronouns are a cached table, rebuilt when gender changes
+        self.assertIs(char.pronouns, char.pronouns)
+        self.assertEqual(char.get_pronoun('|p'), 'its')
+        self.assertEqual(char.get_pronoun('|A'), 'Its')
+        self.assertEqual(char.get_pronoun('|s and |o'), 'it and it')
+        char.execute_cmd("gender male")
+        self.assertEqual(char.get_pronoun('|S'), 'He')
+        self.assertEqual(char.get_pronoun('|a'), 'his')
+        # gender set without the command
+        char.db.gender = "female"
+        self.assertEqual(char.get_pronoun('|S'), 'She')
 
         # test Character stats
         for stat in (char.END, char.WILL, char.PERM,
@@ -943,3 +1027,433 @@ class TestCharacterStatus(UniqueMudCmdTest):
 
         # test that no statuses exist
         self.assertFalse(self.char1.statuses())
+
+
+class TestRoomAppearanceCache(UniqueMudCmdTest):
+
+    def test_appearance_cache(self):
+
+        room = self.room1
+        room.clear_appearance_cache()
+        # first look builds the cache
+        first_look = room.return_appearance(self.char1)
+        stats = room.appearance_stats
+        self.assertEqual(stats['base_misses'], 1)
+        self.assertEqual(stats['view_misses'], 1)
+        # a second look by the same looker uses the cache
+        self.assertEqual(room.return_appearance(self.char1), first_look)
+        self.assertEqual(stats['base_hits'], 1)
+        self.assertEqual(stats['view_hits'], 1)
+        # a new looker shares the room level cache
+        room.return_appearance(self.char2)
+        self.assertEqual(stats['base_hits'], 2)
+        self.assertEqual(stats['view_misses'], 2)
+        # moving an object out of the room invalidates the cache
+        version = room.appearance_version
+        self.test_hat.move_to(self.room2, quiet=True)
+        self.assertTrue(room.appearance_version > version)
+        self.assertFalse('test hat' in room.return_appearance(self.char1))
+        self.assertEqual(stats['base_misses'], 2)
+        # moving it back shows the object again
+        self.test_hat.move_to(room, quiet=True)
+        self.assertTrue('test hat' in room.return_appearance(self.char1))
+        # renaming an object in the room rebuilds the cache
+        self.test_hat.usdesc = 'test cap'
+        appearance = room.return_appearance(self.char1)
+        self.assertTrue('test cap' in appearance)
+        self.assertFalse('test hat' in appearance)
+        # editing an object's locks rebuilds the cache
+        self.test_hat.locks.add("view:false()")
+        self.assertFalse('test cap' in room.return_appearance(self.char1))
+        self.test_hat.locks.add("view:all()")
+        self.assertTrue('test cap' in room.return_appearance(self.char1))
+        # renaming an object's key or aliases invalidates the cache
+        version = room.appearance_version
+        self.test_hat.key = "test bonnet"
+        self.assertTrue(room.appearance_version > version)
+        self.assertTrue(self.test_hat in room.search_index.search("bonnet"))
+        version = room.appearance_version
+        self.test_hat.aliases.add("beanie")
+        self.assertTrue(room.appearance_version > version)
+        self.assertTrue(self.test_hat in room.search_index.search("beanie"))
+        # permission changes rebuild the looker's view
+        room.return_appearance(self.char1)
+        view_misses = stats['view_misses']
+        self.account.permissions.add('TestPerm')
+        room.return_appearance(self.char1)
+        self.assertEqual(stats['view_misses'], view_misses + 1)
+        self.account.permissions.remove('TestPerm')
+        # changing the description rebuilds the cache
+        room.db.desc = "A cached test description."
+        self.assertTrue('A cached test description.' in room.return_appearance(self.char1))
+
+
+class TestContentsIndex(UniqueMudCmdTest):
+
+    def test_contents_index(self):
+
+        room_index = self.room1.contents_index
+        # the room's partitions match it's contents
+        self.assertTrue(self.exit in room_index.exits)
+        self.assertTrue(self.char1 in room_index.characters)
+        self.assertTrue(self.char2 in room_index.characters)
+        self.assertTrue(self.obj1 in room_index.things)
+        self.assertFalse(self.obj1 in room_index.characters)
+        # moving an object updates the index of both locations
+        char_index = self.char1.contents_index
+        self.test_hat.move_to(self.char1, quiet=True)
+        self.assertFalse(self.test_hat in room_index.things)
+        self.assertTrue(self.test_hat in char_index.things)
+        # wearing and removing clothing re-indexes it
+        self.test_hat.wear(self.char1, True, quiet=True)
+        self.assertTrue(self.test_hat in char_index.worn)
+        self.assertFalse(self.test_hat in char_index.things)
+        self.test_hat.remove(self.char1, quiet=True)
+        self.assertFalse(self.test_hat in char_index.worn)
+        # setting location directly updates the index through the contents cache
+        self.test_shirt.location = self.char1
+        self.assertTrue(self.test_shirt in char_index.things)
+        self.assertFalse(self.test_shirt in room_index.things)
+        # reads trust the index, they do not walk the contents
+        with patch.object(type(self.room1), 'contents', new_callable=PropertyMock) as contents:
+            room_index.characters
+            contents.assert_not_called()
+        # deleted objects are removed
+        crate = create_object(Object, key="crate", location=self.room1)
+        self.assertTrue(crate in room_index.things)
+        crate.delete()
+        self.assertFalse(crate in room_index.things)
+        # exits receive emotes
+        with patch.object(self.exit, 'msg') as exit_msg:
+            self.room1.emote_contents("/Me waves.", self.char1)
+            exit_msg.assert_called()
+
+
+class TestExitPeek(UniqueMudCmdTest):
+
+    def test_peek_snapshot(self):
+
+        # exit leads from room1 to room2
+        destination = self.exit.destination
+        for number in range(3):
+            thing = create_object(Object, key=f"crate{number}")
+            thing.location = destination
+        # only the peek limit number of things are listed
+        self.exit.peek_limit = 1
+        appearance = self.exit.return_appearance(self.char1)
+        self.assertTrue(appearance.startswith("Through"))
+        self.assertRegex(appearance, r"There are \d+ more things you can not make out\.")
+        # the snapshot is served until the destination's contents change
+        snapshot = self.exit.peek_snapshot()
+        self.assertIs(self.exit.peek_snapshot(), snapshot)
+        new_thing = create_object(Object, key="barrel")
+        new_thing.move_to(destination, quiet=True)
+        self.assertIsNot(self.exit.peek_snapshot(), snapshot)
+        # removing the limit lists everything
+        self.exit.peek_limit = 10
+        appearance = self.exit.return_appearance(self.char1)
+        self.assertFalse("can not make out" in appearance)
+        self.assertTrue("barrel" in appearance)
+        # objects the looker can not view do not fill the limit, and are not counted
+        self.exit.peek_limit = 1
+        for con in destination.contents:
+            if con.key.startswith("crate"):
+                con.locks.add("view:false()")
+        users, things, hidden = self.exit.peek_view(self.char1, self.exit.peek_snapshot())
+        self.assertEqual(len(users) + len(things), 1)
+        visible = [con for con in destination.contents
+                   if con != self.char1 and not con.destination and con.access(self.char1, "view")]
+        self.assertEqual(hidden, len(visible) - 1)
+        # deleted objects are not served from the snapshot
+        snapshot = self.exit.peek_snapshot()
+        new_thing.delete()
+        self.assertIsNot(self.exit.peek_snapshot(), snapshot)
+
+
+class TestSearchIndex(UniqueMudCmdTest):
+
+    def test_search_index(self):
+
+        search_index = self.room1.search_index
+        # words from keys and sdescs are indexed
+        self.assertTrue(self.sword in search_index.search("sword"))
+        self.assertTrue(self.test_hat in search_index.search("te ha"))
+        self.assertTrue(self.char2 in search_index.search("char2"))
+        self.assertFalse(search_index.search("sword hat"))
+        # changing an sdesc re-indexes the Character
+        self.char2.usdesc = 'a tall droid'
+        self.assertTrue(self.char2 in search_index.search("droid"))
+        self.assertFalse(search_index.search("char2"))
+        # moving removes the object from the index
+        self.sword.move_to(self.room2, quiet=True)
+        self.assertFalse(search_index.search("sword"))
+        self.assertTrue(self.sword in self.room2.search_index.search("sword"))
+        # matches are in contents order
+        droid = create_object(Object, key="a short droid")
+        droid.location = self.room1
+        self.assertEqual(search_index.search("droid"), [self.char2, droid])
+        command = Command()
+        command.caller = self.char1
+        containers = (self.room1, self.char1)
+        # unique matches resolve with the index
+        self.assertEqual(command.indexed_search("short droid", containers), [droid])
+        self.assertEqual(command.target_search("short droid"), droid)
+        # multimatches and numbered targets are left to the standard search
+        self.assertEqual(command.indexed_search("droid", containers), [])
+        self.assertEqual(command.indexed_search("droid", containers, 2), [])
+        self.assertEqual(command.indexed_search("2-droid", containers), [])
+        self.assertEqual(command.target_search("droid"), self.char2)
+        self.assertEqual(command.target_search("2 droid"), droid)
+
+
+class TestEquipmentIndex(UniqueMudCmdTest):
+
+    def test_equipment_index(self):
+        from typeclasses.equipment import clothing
+
+        undershirt = create_object(clothing.UMClothing, key="test undershirt")
+        undershirt.db.clothing_type = "undershirt"
+        for item in (undershirt, self.test_shirt, self.test_hat):
+            item.move_to(self.char1, quiet=True)
+        equipment = self.char1.equipment
+        undershirt.wear(self.char1, True, quiet=True)
+        self.test_hat.wear(self.char1, True, quiet=True)
+        version = equipment.version
+        # the top covers the undershirt
+        self.test_shirt.wear(self.char1, True, quiet=True)
+        self.assertTrue(equipment.version > version)
+        self.assertEqual(undershirt.db.covered_by, self.test_shirt)
+        self.assertEqual(equipment.covering(self.test_shirt), [undershirt])
+        self.assertEqual(equipment.slot('top'), [self.test_shirt])
+        # worn clothing is in display order
+        self.assertEqual(equipment.worn(), [self.test_hat, self.test_shirt, undershirt])
+        self.assertEqual(clothing.get_worn_clothes(self.char1, exclude_covered=True),
+                         [self.test_hat, self.test_shirt])
+        self.assertEqual(clothing.order_clothes_list([undershirt, self.test_hat]),
+                         [self.test_hat, undershirt])
+        # removing the top reveals the undershirt
+        self.test_shirt.remove(self.char1, quiet=True)
+        self.assertFalse(undershirt.db.covered_by)
+        self.assertEqual(equipment.worn(exclude_covered=True), [self.test_hat, undershirt])
+        # moving a worn item away, even without move hooks, removes it
+        self.test_hat.location = self.room1
+        self.assertEqual(equipment.worn(), [undershirt])
+
+
+class TestBodyDRCache(UniqueMudCmdTest):
+
+    def test_body_dr_cache(self):
+        from typeclasses.equipment import clothing
+
+        face_guard = create_object(clothing.HumanoidArmor, key="face guard")
+        face_guard.db.clothing_type = "head"
+        self.test_helmet.dr.PRC = 2
+        face_guard.dr.PRC = 3
+        for item in (self.test_helmet, face_guard):
+            item.move_to(self.char1, quiet=True)
+        # quietly worn armor is cached
+        self.test_helmet.wear(self.char1, True, quiet=True)
+        self.assertEqual(self.char1.body.head.dr.PRC, 2)
+        # layers on the same part are summed
+        face_guard.wear(self.char1, True, quiet=True)
+        self.assertEqual(self.char1.body.head.dr.PRC, 5)
+        self.assertFalse(hasattr(self.char1.body.chest.dr, 'PRC'))
+        # or the best layer is used
+        self.char1.DR_STACKING = 'max'
+        self.char1.cache_body_dr()
+        self.assertEqual(self.char1.body.head.dr.PRC, 3)
+        # removing a layer updates the part
+        face_guard.remove(self.char1, quiet=True)
+        self.assertEqual(self.char1.body.head.dr.PRC, 2)
+        self.test_helmet.remove(self.char1, quiet=True)
+        self.assertFalse(hasattr(self.char1.body.head.dr, 'PRC'))
+        self.assertEqual(self.char1.body.head.dr.el_list, [])
+
+
+class TestClothedAppearanceCache(UniqueMudCmdTest):
+
+    def test_appearance_cache(self):
+
+        for item in (self.test_hat, self.test_shirt):
+            item.move_to(self.char1, quiet=True)
+            item.wear(self.char1, True, quiet=True)
+        appearance = self.char1.return_appearance(self.char2)
+        self.assertTrue(appearance.startswith("Char is wearing test hat"))
+        self.assertTrue("test shirt" in appearance)
+        # the worn string is cached and shared between lookers
+        cached = self.char1.ndb.appearance_worn
+        self.assertEqual(cached[0], self.char1.equipment.version)
+        self.assertTrue(self.char1.return_appearance(self.char1).startswith("You are wearing"))
+        self.assertIs(self.char1.ndb.appearance_worn, cached)
+        # removing clothing rebuilds it
+        self.test_hat.remove(self.char1, quiet=True)
+        self.assertFalse("test hat" in self.char1.return_appearance(self.char2))
+        # renaming worn clothing rebuilds it
+        self.test_shirt.usdesc = "blue shirt"
+        self.assertTrue("blue shirt" in self.char1.return_appearance(self.char2))
+
+
+class TestReferenceSweeper(UniqueMudCmdTest):
+
+    def test_reference_sweeper(self):
+        from typeclasses.equipment import clothing
+        from typeclasses.scripts import get_reference_sweeper
+
+        char = self.char1
+        # a wielded sword moved away without move hooks leaves dangling hand references
+        self.sword.move_to(char, quiet=True)
+        hand = char.open_hands()[0]
+        hand.occupied = self.sword.dbref
+        hand.wielding = self.sword.dbref
+        self.sword.location = self.room1
+        # hands trusts the cached state
+        self.assertEqual(char.hands()[0].occupied, self.sword.dbref)
+        # an undershirt covered by a shirt that is not worn
+        undershirt = create_object(clothing.UMClothing, key="test undershirt")
+        undershirt.db.clothing_type = "undershirt"
+        undershirt.move_to(char, quiet=True)
+        undershirt.wear(char, True, quiet=True)
+        char.equipment.cover(undershirt, self.test_shirt)
+        fixed = char.sweep_references()
+        self.assertEqual(fixed, {'occupied': 1, 'wielding': 1, 'covered_by': 1})
+        self.assertFalse(hand.occupied)
+        self.assertFalse(hand.wielding)
+        self.assertFalse(undershirt.db.covered_by)
+        self.assertEqual(char.equipment.covering(self.test_shirt), [])
+        # a clean Character needs no fixes
+        self.assertEqual(char.sweep_references(), {'occupied': 0, 'wielding': 0, 'covered_by': 0})
+        # the sweeper walks Characters in batches and reports a complete pass
+        hand.occupied = self.sword.dbref
+        sweeper = get_reference_sweeper()
+        fixed = sweeper.sweep(batch_size=1000)
+        self.assertTrue(fixed['characters'] >= 2)
+        self.assertEqual(fixed['occupied'], 1)
+        self.assertEqual(sweeper.db.last_pass['occupied'], 1)
+        self.assertEqual(sweeper.db.cursor, 0)
+        self.assertFalse(hand.occupied)
+        # smaller batches continue from the last Character swept
+        fixed = sweeper.sweep(batch_size=1)
+        self.assertEqual(fixed['characters'], 1)
+        self.assertTrue(sweeper.db.cursor > 0)
+
+
+class TestPermissionFlags(UniqueMudCmdTest):
+
+    def test_permission_flags(self):
+        from utils import permission_flags
+        from typeclasses.mixins import ACCESS_CACHE_SIZE
+
+        account = self.account
+        # flags are cached until a permission changes
+        flags = permission_flags.permission_flags(account)
+        self.assertIs(permission_flags.permission_flags(account), flags)
+        account.permissions.add('TestPerm')
+        self.assertIn('testperm', permission_flags.permission_flags(account))
+        account.permissions.remove('TestPerm')
+        self.assertNotIn('testperm', permission_flags.permission_flags(account))
+        # developer flag of a Character's account
+        self.char1.account = account
+        account.permissions.add('Developer')
+        self.assertTrue(permission_flags.is_developer(self.char1))
+        account.permissions.remove('Developer')
+        self.assertFalse(permission_flags.is_developer(self.char1))
+        self.assertFalse(permission_flags.is_developer(self.obj1))
+        # access results are cached until permissions or locks change
+        expected = self.char2.access(self.char1, 'control')
+        with patch.object(self.char2, 'access', return_value=expected) as access:
+            self.assertEqual(self.char2.cached_access(self.char1, 'control'), expected)
+            self.assertEqual(self.char2.cached_access(self.char1, 'control'), expected)
+            self.assertEqual(access.call_count, 1)
+            account.permissions.add('TestPerm')
+            self.char2.cached_access(self.char1, 'control')
+            self.assertEqual(access.call_count, 2)
+        # locks that depend on more than permissions are never cached
+        self.assertTrue(permission_flags.permission_only("control:id(1) or perm(Admin)"))
+        self.assertFalse(permission_flags.permission_only("view:attr(test_attr)"))
+        self.char2.locks.add("view:attr(test_attr)")
+        with patch.object(self.char2, 'access', return_value=True) as access:
+            self.char2.cached_access(self.char1, 'view')
+            self.char2.cached_access(self.char1, 'view')
+            self.assertEqual(access.call_count, 2)
+        # the cache size is capped, the oldest result is dropped
+        access_cache = self.char2._access_cache
+        access_cache.clear()
+        for number in range(ACCESS_CACHE_SIZE):
+            access_cache[(-number, 'control')] = (None, True)
+        self.char2.cached_access(self.char1, 'control')
+        self.assertEqual(len(access_cache), ACCESS_CACHE_SIZE)
+        self.assertNotIn((0, 'control'), access_cache)
+
+
+class TestConditionFlags(UniqueMudCmdTest):
+
+    def test_condition_flags(self):
+        char = self.char2
+        # conditions are mirrored into in memory booleans
+        self.assertFalse(char.condition.flags['unconscious'])
+        char.condition.unconscious = True
+        self.assertTrue(char.condition.flags['unconscious'])
+        self.assertFalse(char.receives_msg())
+        self.assertTrue(char.receives_msg(force_on_unconscious=True))
+        del char.condition.unconscious
+        self.assertFalse(char.condition.flags['unconscious'])
+        char.set_unconscious(True)
+        self.assertTrue(char.condition.flags['unconscious'])
+        # broadcasts skip Characters that would drop the message
+        with patch.object(char, 'msg') as msg:
+            self.room1.msg_contents("A bell rings.")
+            self.char1.emote_location("/Me waves.")
+            msg.assert_not_called()
+            self.room1.msg_contents("A bell rings.", force=True)
+            msg.assert_called_once()
+        char.set_unconscious(False)
+        self.assertFalse(char.condition.flags['unconscious'])
+        char.condition.dead = True
+        self.assertFalse(char.at_msg_receive("text"))
+        self.assertTrue(char.at_msg_receive("text", force=True))
+
+
+class TestTypeTags(UniqueMudCmdTest):
+
+    def test_type_tags(self):
+        """
+        Lint typeclasses: every object typeclass must inherit AllObjectsMixin,
+        so its type tags are registered and match utils.inherits_from.
+        """
+        import inspect
+        from django.conf import settings
+        from evennia import DefaultObject
+        from evennia.utils.utils import inherits_from, class_from_module
+        from typeclasses import mixins, objects, characters, rooms, exits, races
+        from typeclasses.equipment import clothing, wieldable
+
+        classes = set()
+        for module in (objects, characters, rooms, exits, races, clothing, wieldable):
+            for _, cls in inspect.getmembers(module, inspect.isclass):
+                if issubclass(cls, DefaultObject) and cls.__module__.startswith('typeclasses'):
+                    classes.add(cls)
+        for setting in ('BASE_OBJECT_TYPECLASS', 'BASE_CHARACTER_TYPECLASS',
+                        'BASE_ROOM_TYPECLASS', 'BASE_EXIT_TYPECLASS'):
+            classes.add(class_from_module(getattr(settings, setting)))
+        # building block parents of typeclasses, as UMClothedCharacter, are not typeclasses
+        parents = {parent for cls in classes for parent in cls.__mro__[1:]}
+        for cls in classes:
+            path = mixins.class_path(cls)
+            if cls in parents and not issubclass(cls, mixins.AllObjectsMixin):
+                continue
+            self.assertTrue(issubclass(cls, mixins.AllObjectsMixin),
+                            f"{path} does not inherit AllObjectsMixin")
+            self.assertIn(path, mixins.TYPE_TAG_REGISTRY)
+            for tag, tag_paths in mixins.TYPE_TAGS.items():
+                expected = any(inherits_from(cls, tag_path) for tag_path in tag_paths)
+                self.assertEqual(getattr(cls, tag), expected, f"{path}.{tag}")
+        # instances read the class tags
+        self.assertTrue(self.char1.is_character and self.char1.is_container)
+        self.assertTrue(self.room1.is_room and not self.room1.is_character)
+        self.assertTrue(self.exit.is_exit)
+        self.assertTrue(self.sword.is_wieldable)
+        self.assertTrue(self.test_hat.is_clothing and not self.test_hat.is_container)
+        # objects without AllObjectsMixin, as evennia's defaults, are indexed as things
+        plain = create_object(DefaultObject, key="plain object", location=self.room1)
+        self.assertEqual(self.room1.contents_index.classify(plain), 'things')
+        plain.delete()
@@ -0,0 +1,263 @@
+"""
+Command latency and query count instrumentation.
+
+Records wall time and django query counts of each phase of a command, per command key.
+Measurements are aggregated into in memory HDR style histograms.
+    Values are stored in log linear buckets, so memory use does not grow with the
+    number of measurements and percentiles have a small relative error.
+
+Phases:
+    parse, Command.at_pre_cmd. Parsing, target search and requirements checks.
+    requirements, Command.requirements
+    defer, Command.defer
+    completion, world.status_functions.complete
+    deferred_action, the command's deferred_action and def_act_comp.
+        Measured within completion.
+    emote, utils.emote.um_emote. Emote fan-out to receivers.
+        Recorded under the key of the command being measured when the emote is sent.
+
+Usage:
+    with cmd_metrics.measure(cmd.key, 'deferred_action'):
+        cmd.deferred_action()
+
+    @cmd_metrics.measured('defer')
+    def defer(self):
+
+    @cmd_metrics.measured('emote', method=False)
+    def um_emote(emote, sender, receivers=None, target=None, anonymous_add=None):
+
+    cmd_metrics.percentiles('punch', 'parse')  # {'p50': ..., 'p95': ..., 'p99': ...}
+
+Notes:
+    ENABLED turns measurement on and off for the running server. Off by default.
+        Set it with enable, cmd_metrics.enable(True)
+        When off measure and measured do nothing but call the measured code,
+            and no queries are counted.
+    The developer command cmd_metrics displays p50, p95 and p99 of each phase.
+        commands.developer_cmds.CmdCmdMetrics
+
+Unit Tests:
+    commands.tests.TestCmdMetrics
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+
+# measurement is enabled, off unless CMD_METRICS_ENABLED is set in server/conf/settings.py
+#   turn it on and off on a running server with enable, or the cmd_metrics command.
+ENABLED = getattr(settings, 'CMD_METRICS_ENABLED', False)
+# phases in the order they are displayed
+PHASES = ('parse', 'requirements', 'defer', 'completion', 'deferred_action', 'emote')
+# key used for phases measured outside of a command
+NO_COMMAND = 'no command'
+# 2 ** SUB_BUCKET_BITS buckets per power of 2, about 3% relative error
+SUB_BUCKET_BITS = 5
+
+# {cmd_key: {phase: {'time': Histogram, 'queries': Histogram}}}
+METRICS = defaultdict(dict)
+# keys of commands currently being measured, the last is the innermost
+_ACTIVE_KEYS = []
+# number of queries django has executed since the counter was installed
+_QUERY_COUNT = [0]
+
+
+class Histogram:
+    """
+    A log linear histogram of positive integers.
+    Modeled after HDR histograms.
+
+    Values below 2 ** (SUB_BUCKET_BITS + 1) are stored exactly.
+    Larger values are stored in buckets with 2 ** SUB_BUCKET_BITS buckets
+        for each power of 2.
+
+    Attributes:
+        counts (dict): bucket: number of values recorded in that bucket.
+        count (int): number of values recorded.
+        total (int): sum of values recorded.
+        max (int): largest value recorded.
+    """
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(value):
+        """
+        Returns the bucket of a value.
+            A tuple of (shift, value >> shift)
+            Sorting buckets sorts them by the values they hold.
+        """
+        shift = max(0, value.bit_length() - (SUB_BUCKET_BITS + 1))
+        return (shift, value >> shift)
+
+    def record(self, value):
+        """
+        Record a value.
+
+        Arguments:
+            value (int or float): value to record, is rounded to an int.
+        """
+        value = max(0, int(round(value)))
+        self.counts[self.bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """
+        Returns the value at a percentile.
+
+        Arguments:
+            percent (float): percentile to return. IE: 99 for p99
+
+        Returns:
+            value (int): the highest value the percentile's bucket can hold.
+                Capped at the largest value recorded. 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        wanted = self.count * percent / 100
+        seen = 0
+        for shift, mantissa in sorted(self.counts):
+            seen += self.counts[(shift, mantissa)]
+            if seen >= wanted:
+                return min(((mantissa + 1) << shift) - 1, self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+
+def _count_queries(execute, sql, params, many, context):
+    """django execute wrapper, counts queries executed."""
+    _QUERY_COUNT[0] += 1
+    return execute(sql, params, many, context)
+
+
+def query_count():
+    """
+    Returns the number of queries django has executed since counting started.
+    Starts counting the first time it is called.
+    """
+    if _count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_queries)
+    return _QUERY_COUNT[0]
+
+
+def enable(state=True):
+    """
+    Turn measurement on or off.
+        Turning it off stops counting django queries.
+
+    Arguments:
+        state (bool): True to measure commands.
+    """
+    global ENABLED
+    ENABLED = bool(state)
+    if not ENABLED and _count_queries in connection.execute_wrappers:
+        connection.execute_wrappers.remove(_count_queries)
+
+
+def record(cmd_key, phase, seconds, queries):
+    """
+    Record a measurement of a command phase.
+
+    Arguments:
+        cmd_key (str): key of the command measured.
+        phase (str): phase measured, IE: 'parse'
+        seconds (float): wall time of the phase.
+        queries (int): number of django queries executed during the phase.
+    """
+    histograms = METRICS[cmd_key].get(phase)
+    if not histograms:
+        histograms = {'time': Histogram(), 'queries': Histogram()}
+        METRICS[cmd_key][phase] = histograms
+    histograms['time'].record(seconds * 1000000)  # recorded in microseconds
+    histograms['queries'].record(queries)
+
+
+@contextmanager
+def measure(cmd_key, phase):
+    """
+    Context manager that measures the code within it as a command phase.
+
+    Arguments:
+        cmd_key (str): key of the command measured.
+            If None the key of the command being measured is used.
+        phase (str): phase measured, IE: 'deferred_action'
+    """
+    if not ENABLED:
+        yield
+        return
+    if cmd_key is None:
+        cmd_key = _ACTIVE_KEYS[-1] if _ACTIVE_KEYS else NO_COMMAND
+    _ACTIVE_KEYS.append(cmd_key)
+    start_queries = query_count()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(cmd_key, phase, time.perf_counter() - start, query_count() - start_queries)
+        _ACTIVE_KEYS.pop()
+
+
+def measured(phase, method=True):
+    """
+    Decorator that measures a Command method or function as a command phase.
+
+    Arguments:
+        phase (str): phase measured, IE: 'defer'
+        method (bool): If True the decorated is a Command method, the command's
+            key is used as the command key. If False the key of the command
+            being measured is used. IE: an emote sent during deferred_action.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            cmd_key = args[0].key if method else None
+            with measure(cmd_key, phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def percentiles(cmd_key, phase, metric='time'):
+    """
+    Returns p50, p95 and p99 of a command phase.
+
+    Arguments:
+        cmd_key (str): key of the command.
+        phase (str): phase of the command, IE: 'parse'
+        metric (str): 'time' for microseconds, 'queries' for query counts.
+
+    Returns:
+        percentiles (dict): {'count': int, 'p50': int, 'p95': int, 'p99': int}
+            Empty if the phase has not been measured.
+    """
+    histograms = METRICS.get(cmd_key, {}).get(phase)
+    if not histograms:
+        return {}
+    histogram = histograms[metric]
+    return {
+        'count': histogram.count,
+        'p50': histogram.percentile(50),
+        'p95': histogram.percentile(95),
+        'p99': histogram.percentile(99),
+    }
+
+
+def reset():
+    """Remove all measurements."""
+    METRICS.clear()
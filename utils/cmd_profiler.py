@@ -0,0 +1,212 @@
+"""
+Profile commands in a running server with cProfile.
+
+A profile session profiles either:
+    The next N runs of a command, by command key.
+    The next N seconds of a Character's commands.
+
+A run of a command includes at_pre_cmd, func and at_post_cmd.
+    If the command deferred, the run ends after it's deferred_action and
+    def_act_comp complete.
+
+When the session ends the profile is written to a .pstats file in
+    settings.LOG_DIR/profiles and a top 20 summary is sent to the
+    Character that started the session.
+
+Usage:
+    cmd_profiler.start_session(caller, cmd_key='look', runs=10)
+    cmd_profiler.start_session(caller, char=target, seconds=30)
+
+Notes:
+    Only one session can run at a time, cProfile allows one active profiler.
+    When no session is running, SESSION is None and the command hooks only
+        check that. There is no other overhead.
+    Hooks:
+        commands.command.Command.at_pre_cmd, decorated with profile_pre_cmd
+        commands.command.Command.at_post_cmd
+        world.status_functions.complete, when a deferred command completes or is cancelled
+    The developer command profile_cmd starts and stops sessions.
+        commands.developer_cmds.CmdProfileCmd
+
+Unit Tests:
+    commands.tests.TestCmdProfiler
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from evennia.utils import delay
+
+# number of functions in the summary sent to the requester
+SUMMARY_LENGTH = 20
+# directory .pstats files are written to
+PROFILE_DIR = os.path.join(settings.LOG_DIR, 'profiles')
+# characters not allowed in a .pstats file name, replaced with _
+_RE_UNSAFE_FILE_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+# the running ProfileSession, None if no session is running
+SESSION = None
+
+
+class ProfileSession:
+    """
+    A running profile of a command or a Character's commands.
+
+    Arguments:
+        requester (Character): receives the summary when the session ends.
+        cmd_key (str): key of the command to profile.
+        char (Character): Character whose commands are profiled.
+        runs (int): number of command runs to profile, with cmd_key.
+        seconds (int): seconds to profile, with char.
+
+    Attributes:
+        profile (cProfile.Profile): the profile, enabled while a matching command runs.
+        completed_runs (int): number of profiled runs completed.
+        active (bool): the profile is enabled.
+    """
+
+    def __init__(self, requester, cmd_key=None, char=None, runs=None, seconds=None):
+        self.requester = requester
+        self.cmd_key = cmd_key
+        self.char = char
+        self.runs = runs
+        self.seconds = seconds
+        self.profile = cProfile.Profile()
+        self.completed_runs = 0
+        self.active = False
+        self.start_time = time.time()
+
+    @property
+    def label(self):
+        """
+        name of the session, used in the file name and summary.
+            Only letters, numbers, _ and - are kept, so the file stays in PROFILE_DIR.
+        """
+        if self.cmd_key:
+            return f"cmd_{_RE_UNSAFE_FILE_CHARS.sub('_', self.cmd_key)}"
+        return f"char_{self.char.id}"
+
+    def matches(self, cmd):
+        """Returns True if the command should be profiled."""
+        if self.cmd_key:
+            return cmd.key == self.cmd_key
+        return cmd.caller == self.char
+
+
+def start_session(requester, cmd_key=None, char=None, runs=10, seconds=30):
+    """
+    Start a profile session.
+
+    Arguments:
+        requester (Character): receives the summary when the session ends.
+        cmd_key (str): key of the command to profile, the next runs runs are profiled.
+        char (Character): if no cmd_key, the next seconds seconds of this
+            Character's commands are profiled.
+        runs (int): number of runs to profile when profiling a command.
+        seconds (int): number of seconds to profile when profiling a Character.
+
+    Returns:
+        session (ProfileSession): the session started, None if a session was already running.
+    """
+    global SESSION
+    if SESSION:
+        return None
+    if cmd_key:
+        SESSION = ProfileSession(requester, cmd_key=cmd_key, runs=runs)
+    else:
+        SESSION = ProfileSession(requester, char=char, seconds=seconds)
+        delay(seconds, end_session, SESSION)
+    return SESSION
+
+
+def end_session(session=None):
+    """
+    End the running profile session.
+    Writes the .pstats file and sends the summary to the requester.
+
+    Arguments:
+        session (ProfileSession): if provided, only end the session if it is still running.
+            Used by the delayed end of a Character session.
+
+    Returns:
+        path (str): path of the .pstats file written. None if no session was ended.
+    """
+    global SESSION
+    if not SESSION or (session and session is not SESSION):
+        return None
+    session, SESSION = SESSION, None
+    if session.active:
+        session.profile.disable()
+        session.active = False
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    file_name = f"{session.label}_{int(session.start_time)}.pstats"
+    path = os.path.join(PROFILE_DIR, file_name)
+    session.profile.dump_stats(path)
+    # top functions by cumulative time
+    stream = io.StringIO()
+    try:
+        stats = pstats.Stats(session.profile, stream=stream)
+        stats.sort_stats('cumulative').print_stats(SUMMARY_LENGTH)
+        summary = stream.getvalue()
+    except TypeError:  # nothing was profiled
+        summary = "Nothing was profiled."
+    session.requester.msg(f"Profile of {session.label}, {session.completed_runs} runs, "
+                          f"saved to {path}\n{summary}")
+    return path
+
+
+def start(cmd):
+    """
+    Enable the profile if the running session profiles this command.
+    Only call if SESSION is not None.
+    """
+    session = SESSION
+    if session and not session.active and session.matches(cmd):
+        session.profile.enable()
+        session.active = True
+
+
+def stop(cmd, run_complete=False):
+    """
+    Disable the profile, if it was enabled for this command.
+    Only call if SESSION is not None.
+
+    Arguments:
+        cmd (Command): the command that was running.
+        run_complete (bool): If True the command's run is done.
+            The session ends if it has profiled the number of runs requested.
+    """
+    session = SESSION
+    if not session or not session.matches(cmd):
+        return
+    if session.active:
+        session.profile.disable()
+        session.active = False
+    if run_complete:
+        session.completed_runs += 1
+        if session.runs and session.completed_runs >= session.runs:
+            end_session(session)
+
+
+def profile_pre_cmd(method):
+    """
+    Decorator for Command.at_pre_cmd
+    Starts profiling a command run if a session is running.
+    If at_pre_cmd stops the command, the run is complete.
+    """
+    @wraps(method)
+    def wrapper(cmd):
+        if SESSION is None:
+            return method(cmd)
+        start(cmd)
+        stop_cmd = method(cmd)
+        if stop_cmd:
+            stop(cmd, run_complete=True)
+        return stop_cmd
+    return wrapper
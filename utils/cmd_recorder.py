@@ -0,0 +1,343 @@
+"""
+Record command streams from a running server and replay them in a test world.
+
+A recording is a gzip compressed text file, one command per line:
+    offset in milliseconds \t character slot \t room slot \t raw command string
+
+Anonymization:
+    Characters are recorded as slots, numbered in the order they are first seen.
+        When they issue a command, or are named in a command.
+        Characters that are only present in the room are not given a slot.
+    Rooms are recorded as slots the same way.
+    Names of Characters in the room of the command are replaced with the
+        name of the Character's slot in a load test world, loader<slot>
+        IE: "punch Bob" becomes "punch loader3"
+    The free text of commands in FREE_TEXT_CMDS, as say and whisper, is scrubbed.
+        Each letter and digit is replaced with x, so the text keeps its length.
+        Emote references to Characters, IE: /loader3, are kept.
+        IE: "say Hi Bob" becomes "say xx xxx"
+
+Slot table:
+    The number of Character and room slots is written to the recording each time it
+        is flushed, as a "# slots" line. Replay sizes its world from the last one.
+
+Usage:
+    cmd_recorder.start_recording()  # recording starts
+    cmd_recorder.stop_recording()  # returns (path, number of commands recorded)
+
+    report = cmd_recorder.replay(path, speed=4)  # replay 4 times faster
+    print(load_test.format_report(report))
+
+Notes:
+    The recording is flushed to disk every FLUSH_INTERVAL seconds, and when it stops.
+        A crash loses at most FLUSH_INTERVAL seconds of commands.
+    Recording is opt-in. When no recording is running RECORDER is None and
+        Command.at_pre_cmd only checks that.
+    Only commands inheriting commands.command.Command are recorded.
+        Developer commands are not recorded.
+    Replay is done in a utils.load_test.LoadTest world, on its simulated clock.
+        speed 1 replays commands at the simulated times they were recorded.
+        A higher speed compresses the time between commands, deferred commands
+            take the time they always do.
+        A Character waiting on a deferred command skips a replayed command,
+            as in a load test.
+    The developer command record_cmds starts and stops recordings.
+        commands.developer_cmds.CmdRecordCmds
+
+Unit Tests:
+    commands.tests.TestCmdRecorder
+"""
+
+import gzip
+import os
+import re
+import time
+
+from django.conf import settings
+
+# directory recordings are written to
+RECORD_DIR = os.path.join(settings.LOG_DIR, 'recordings')
+# first line of a recording
+RECORDING_HEADER = '# uniquemud command recording v1'
+# start of a slot table line, followed by the number of Character and room slots
+SLOTS_HEADER = '# slots'
+# seconds between flushes of a recording to disk
+FLUSH_INTERVAL = 5
+# command key: separators, free text after the first separator is scrubbed from recordings
+#   None scrubs all of the command's arguments.
+FREE_TEXT_CMDS = {
+    'say': None,
+    'whisper': ('=', '"'),
+    'emote': None,
+    'pose': None,
+    'sdesc': None,
+    'mask': None,
+    'recog': ('=',),
+}
+# words of free text, words starting with / are emote references and kept
+_RE_FREE_WORD = re.compile(r"(?<![/\w])\w+")
+# characters not allowed in a recording's file name, replaced with _
+_RE_UNSAFE_FILE_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+# the running CommandRecorder, None if nothing is recording
+RECORDER = None
+
+
+class CommandRecorder:
+    """
+    Writes commands to a recording.
+
+    Arguments:
+        path (str): path of the recording to write.
+
+    Attributes:
+        char_slots (dict): Character id: slot
+        room_slots (dict): Room id: slot
+        count (int): number of commands recorded.
+        name_patterns (dict): Room id: (names stamp, lower case name: Character, compiled pattern)
+            The pattern of a room's Character names, rebuilt when the names change.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.start_time = time.time()
+        self.char_slots = dict()
+        self.room_slots = dict()
+        self.name_patterns = dict()
+        self.count = 0
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self.file.write(RECORDING_HEADER + '\n')
+        self.last_flush = time.time()
+
+    @staticmethod
+    def slot(slots, obj):
+        """Returns the slot of an object, assigning the next slot if it has none."""
+        slot = slots.get(obj.id)
+        if slot is None:
+            slot = slots[obj.id] = len(slots)
+        return slot
+
+    def name_pattern(self, location):
+        """
+        Returns the Character names of location and a compiled pattern matching them.
+            Cached per room in name_patterns, rebuilt when the names in the room change.
+
+        Returns:
+            names (dict): lower case name: Character
+            pattern (re.Pattern): matches any name, None if there are no names.
+        """
+        chars = location.contents_index.characters
+        stamp = tuple((char.id, char.key, getattr(char, 'usdesc', None)) for char in chars)
+        cached = self.name_patterns.get(location.id)
+        if cached and cached[0] == stamp:
+            return cached[1], cached[2]
+        names = dict()
+        for char in chars:
+            for name in (char.key, getattr(char, 'usdesc', None)):
+                if name:
+                    names[name.lower()] = char
+        pattern = None
+        if names:
+            # longest names first, so "bob smith" is replaced before "bob"
+            pattern = '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+            pattern = re.compile(rf'\b({pattern})\b', re.IGNORECASE)
+        self.name_patterns[location.id] = (stamp, names, pattern)
+        return names, pattern
+
+    def anonymize(self, raw_string, location):
+        """
+        Returns the raw string with the names of Characters in location replaced
+            by the name of their slot, loader<slot>
+            Only Characters named in the string are given a slot.
+        """
+        names, pattern = self.name_pattern(location)
+        if not pattern:
+            return raw_string
+
+        def replace(match):
+            return f"loader{self.slot(self.char_slots, names[match.group(0).lower()])}"
+
+        return pattern.sub(replace, raw_string)
+
+    @staticmethod
+    def scrub(raw_string, cmd):
+        """
+        Returns the raw string with the free text of the command scrubbed.
+            Only commands in FREE_TEXT_CMDS are scrubbed.
+        """
+        if cmd.key not in FREE_TEXT_CMDS:
+            return raw_string
+        cmd_name = getattr(cmd, 'cmdstring', '') or ''
+        if not cmd_name or not raw_string.lower().startswith(cmd_name.lower()):
+            cmd_name = raw_string.split(' ', 1)[0]
+        head, text = raw_string[:len(cmd_name)], raw_string[len(cmd_name):]
+        positions = [text.find(separator) for separator in FREE_TEXT_CMDS[cmd.key] or ()
+                     if separator in text]
+        if positions:  # keep the text before the separator, IE: the whisper's target
+            position = min(positions) + 1
+            head, text = head + text[:position], text[position:]
+        return head + _RE_FREE_WORD.sub(lambda match: 'x' * len(match.group(0)), text)
+
+    def flush(self):
+        """Write the slot table and flush the recording to disk."""
+        self.file.write(f"{SLOTS_HEADER}\t{len(self.char_slots)}\t{len(self.room_slots)}\n")
+        self.file.flush()
+        self.last_flush = time.time()
+
+    def record(self, cmd):
+        """
+        Record a command.
+
+        Arguments:
+            cmd (Command): the command being run, called in Command.at_pre_cmd
+        """
+        caller = cmd.caller
+        location = getattr(caller, 'location', None)
+        if not location or cmd.help_category == 'developer':
+            return
+        raw_string = cmd.raw_string.strip()
+        if not raw_string:
+            return
+        raw_string = self.anonymize(raw_string, location)
+        raw_string = self.scrub(raw_string, cmd).replace('\t', ' ').replace('\n', ' ')
+        char_slot = self.slot(self.char_slots, caller)
+        room_slot = self.slot(self.room_slots, location)
+        offset = int((time.time() - self.start_time) * 1000)
+        self.file.write(f"{offset}\t{char_slot}\t{room_slot}\t{raw_string}\n")
+        self.count += 1
+        if time.time() - self.last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def start_recording(name=None):
+    """
+    Start recording commands.
+
+    Arguments:
+        name (str): file name of the recording, without extension.
+            Defaults to recording_<unix time>
+            Only the base name is used, with letters, numbers, _ and -.
+            So the recording is always written to RECORD_DIR.
+
+    Returns:
+        recorder (CommandRecorder): the recorder started, None if a recording was already running.
+    """
+    global RECORDER
+    if RECORDER:
+        return None
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    name = _RE_UNSAFE_FILE_CHARS.sub('_', os.path.basename(name)) if name else None
+    name = name if name else f"recording_{int(time.time())}"
+    RECORDER = CommandRecorder(os.path.join(RECORD_DIR, f"{name}.cmds.gz"))
+    return RECORDER
+
+
+def stop_recording():
+    """
+    Stop recording commands.
+
+    Returns:
+        path (str): path of the recording, None if nothing was recording.
+        count (int): number of commands recorded.
+    """
+    global RECORDER
+    if not RECORDER:
+        return None, 0
+    recorder, RECORDER = RECORDER, None
+    recorder.close()
+    return recorder.path, recorder.count
+
+
+def load_recording(path):
+    """
+    Read a recording.
+
+    Returns:
+        entries (list): of (seconds, char slot, room slot, raw command string)
+            seconds is the offset from the start of the recording.
+    """
+    return [entry for entry in _read_lines(path) if entry[0] is not None]
+
+
+def load_slots(path):
+    """
+    Read the slot table of a recording.
+        The last slot table written is used, the one written when the recording stopped.
+        Recordings without a slot table are sized from their entries.
+
+    Returns:
+        characters (int): number of Character slots.
+        rooms (int): number of room slots.
+    """
+    characters = rooms = 0
+    for offset, char_slot, room_slot, _ in _read_lines(path):
+        if offset is None:  # a slot table line
+            characters, rooms = char_slot, room_slot
+        else:
+            characters = max(characters, char_slot + 1)
+            rooms = max(rooms, room_slot + 1)
+    return characters, rooms
+
+
+def _read_lines(path):
+    """
+    Yields (seconds, char slot, room slot, raw command string) for each entry of a recording.
+        Slot table lines are yielded as (None, characters, rooms, None).
+        A recording cut short by a crash is read up to its last flush.
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as recording:
+        try:
+            for line in recording:
+                fields = line.rstrip('\n').split('\t', 3)
+                if fields[0] == SLOTS_HEADER:
+                    yield None, int(fields[1]), int(fields[2]), None
+                elif not line.startswith('#') and len(fields) == 4:
+                    offset, char_slot, room_slot, raw_string = fields
+                    yield int(offset) / 1000, int(char_slot), int(room_slot), raw_string
+        except EOFError:  # the recording was not closed
+            return
+
+
+def replay(path, speed=1.0, tick=0.5, seed=0):
+    """
+    Replay a recording in a fresh load test world.
+
+    Arguments:
+        path (str): path of the recording.
+        speed (float): 1 replays at the recorded times, 2 twice as fast.
+        tick (float): simulated seconds per step when completing pending deferred commands.
+        seed (int): seed of the load test, see utils.load_test.LoadTest
+
+    Returns:
+        report (dict): see utils.load_test.LoadTest.run
+    """
+    from utils.load_test import LoadTest
+    entries = load_recording(path)
+    characters, rooms = load_slots(path)
+    harness = LoadTest(characters=characters, rooms=rooms, seed=seed, tick=tick)
+    harness.build()
+    try:
+        harness.start()
+        try:
+            for seconds, char_slot, room_slot, raw_string in entries:
+                wait = seconds / speed - harness.clock.seconds()
+                if wait > 0:
+                    harness.advance(wait)
+                char = harness.chars[char_slot]
+                if harness.waiting(char):
+                    harness.waits += 1
+                    continue
+                room = harness.rooms[room_slot]
+                if char.location != room:
+                    char.move_to(room, quiet=True)
+                harness.issue(char, raw_string)
+            harness.drain()
+        finally:
+            harness.stop()
+        return harness.report()
+    finally:
+        harness.cleanup()
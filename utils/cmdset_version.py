@@ -0,0 +1,44 @@
+"""
+Cmdset version, for caches built from merged cmdsets.
+
+CMDSET_VERSION is incremented each time a cmdset is added to or removed from
+any object or account through a NotifyCmdSetHandler, and when an exit, which
+carries its own cmdset, is moved or deleted.
+A cache tagged with an older version is rebuilt when next read.
+
+Usage:
+    if cached[0] == cmdset_version.CMDSET_VERSION:  # the cache is current
+
+Notes:
+    Account and all UniqueMud objects use NotifyCmdSetHandler as their cmdset handler.
+        typeclasses.accounts.Account and typeclasses.mixins.AllObjectsMixin
+    Session cmdsets are not tracked, they are not changed in play.
+    Used by the trie command parser, server.conf.cmdparser.get_trie
+
+Unit Tests:
+    commands.tests.TestCmdParser
+"""
+
+from evennia.commands.cmdsethandler import CmdSetHandler
+
+# incremented each time a cmdset is added or removed, invalidates all caches
+CMDSET_VERSION = 0
+
+
+def invalidate():
+    """Invalidate all caches built from merged cmdsets."""
+    global CMDSET_VERSION
+    CMDSET_VERSION += 1
+
+
+class NotifyCmdSetHandler(CmdSetHandler):
+    """
+    Cmdset handler that invalidates caches built from merged cmdsets when its cmdsets change.
+        CmdSetHandler.update runs after every add, remove and clear.
+    """
+
+    def update(self, init_mode=False):
+        result = super().update(init_mode=init_mode)
+        if not init_mode:  # loading stored cmdsets is not a change
+            invalidate()
+        return result
@@ -398,6 +398,48 @@ class ListElement:
         return iter(ret)
 
 
+class FlagListElement(ListElement):
+    """
+    A ListElement that mirrors its attributes into in memory booleans.
+        Used where attributes are read far more often than they are set.
+        IE: Character.condition, read on every message a Character receives.
+
+    Attributes:
+        flags (dict): attribute name: bool, of every attribute in el_list.
+            Read from the database the first time it is used.
+            Kept in sync when an attribute is set or deleted through the ListElement.
+
+    Usage:
+        if char.condition.flags['dead']:
+
+    Notes:
+        Setting the database entry directly, IE: char.db.condition_dead = True,
+            is not mirrored. As with any ListElement, do not access the database entry.
+    """
+
+    @property
+    def flags(self):
+        element_dict = object.__getattribute__(self, '__dict__')
+        flags = element_dict.get('_flags')
+        if flags is None:
+            self.verify()
+            flags = {attr: bool(getattr(self, attr)) for attr in self.el_list}
+            element_dict['_flags'] = flags
+        return flags
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        flags = object.__getattribute__(self, '__dict__').get('_flags')
+        if flags is not None and name in flags:
+            flags[name] = bool(value)
+
+    def __delattr__(self, name):
+        super().__delattr__(name)
+        flags = object.__getattribute__(self, '__dict__').get('_flags')
+        if flags is not None and name in flags:
+            flags[name] = False
+
+
 # element attributes that will be saved to database
 ELEMENT_DB_FIELDS = [
     ('value', 100),
@@ -411,7 +453,8 @@ ELEMENT_LOCAL_ATTRIBUTES = [
     ('min_func', None),
     ('max_func', None),
     ('descending_breakpoint_func', None),
-    ('ascending_breakpoint_func', None)
+    ('ascending_breakpoint_func', None),
+    ('below_max_func', None)
 ]
 ELEMENT_OPTIONS = ELEMENT_DB_FIELDS + ELEMENT_LOCAL_ATTRIBUTES
 # Used to check if an attribute of the Element is a database element
@@ -441,6 +484,7 @@ class Element:
                     will run Element.ascending_breakpoint_func when the element's value rises above the breakpoint after being below it.
                         Will only run when it is passed
                         Rising an element that is already above the breakpoint will not trigger this function
+                will run Element.below_max_func when the element's value falls below max after being at max.
         Declaration of the Element requires creating a class attribute that is a proper which steps to do so is covered here.
 
     Creation:
@@ -482,6 +526,7 @@ class Element:
             'ascending_breakpoint_func': None,  # When Element's value rises above breakpoint after being below it, this function is called
             'max': 100,  # the max number the Element can be. When reached self.max_fun() runs
             'max_func': None  # reference to a function to run when the self.value attribute reachs the self.max
+            'below_max_func': None  # When Element's value falls below max after being at max, this function is called
             'dbtype': 'db',  # the database type to use can be 'db' or 'ndb'
         }
 
@@ -622,10 +667,12 @@ class Element:
         Checks if Elements min, max or breakpoint has been reached.
         Call only after verify_num_arg has been
         Call only after the the math has been completed on the value but before it has been written to the database.
+        The Element's current value is read once and shared by the max and breakpoint checks.
         """
+        current_value = self.get()
         value = self._min_check(value)
-        value = self._max_check(value)
-        value = self._breakpoint_check(value)
+        value = self._max_check(value, current_value)
+        value = self._breakpoint_check(value, current_value)
         return value
 
     def _min_check(self, value):
@@ -645,11 +692,13 @@ class Element:
             return value
         return value
 
-    def _max_check(self, value):
+    def _max_check(self, value, current_value):
         """
         Internal method, do not use.
         Checks is Element's max number has been reached.
         Runs self.max_func if max was reached.
+        Runs self.below_max_func if the value falls below max after being at max.
+            current_value is the Element's value before this change, from _state_check.
         Call only after value was verified by verify_num_arg
         Call only after the the math has been completed on the value but before it has been written to the database.
         """
@@ -660,17 +709,20 @@ class Element:
             if self.max_func:
                 self.max_func()
             return value
+        if self.below_max_func:
+            if current_value >= self.max:  # the Element was at max
+                self.below_max_func()
         return value
 
-    def _breakpoint_check(self, value):
+    def _breakpoint_check(self, value, el_current_value):
         """
         Internal method, do not use.
         Checks is Element's breakpoint number has been reached.
         Runs self.descending_breakpoint_func if breakpoint was reached.
+            el_current_value is the Element's value before this change, from _state_check.
         Call only after value was verified by verify_num_arg
         Call only after the the math has been completed on the value but before it has been written to the database.
         """
-        el_current_value = self.get()
         if el_current_value > self.breakpoint:
             if value <= self.breakpoint:
                 if self.log:
@@ -1096,7 +1148,7 @@ class Element:
     def __getattribute__(self, name):
         """
         Used to access any attribute in the Element.
-        Including min, min_func, max, max_func, breakpoint, descending_breakpoint_func and ascending_breakpoint_func
+        Including min, min_func, max, max_func, below_max_func, breakpoint, descending_breakpoint_func and ascending_breakpoint_func
         """
         # if the attribute is a database attribute retreive it from the database
         if super(Element, self).__getattribute__('verified'):
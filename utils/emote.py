@@ -4,6 +4,7 @@ Cotanins functions for unique muds emote system.
 
 from evennia.utils import utils
 from evennia.contrib import rpsystem
+from utils import cmd_metrics
 
 def replace_cap(msg, switch, rep_txt, upper=False, lower=False, allow_upper=False):
     """
@@ -57,6 +58,7 @@ def support_upper(name, obj):
         allow_upper = True
     return name, allow_upper
 
+@cmd_metrics.measured('emote', method=False)
 def um_emote(emote, sender, receivers=None, target=None, anonymous_add=None):
     """
     Distribute an emote.
@@ -104,9 +106,12 @@ def um_emote(emote, sender, receivers=None, target=None, anonymous_add=None):
     # change color codes in object.process_sdesc
     """
     if not receivers:
-        receivers = sender.location.contents
+        receivers = sender.location.contents_index.get('exits', 'characters', 'worn', 'things')
     else:
         receivers = utils.make_iter(receivers)
+    # do not render the emote for Characters that would drop it, IE: unconscious
+    receivers = [receiver for receiver in receivers
+                 if not hasattr(receiver, 'receives_msg') or receiver.receives_msg()]
     sender_emote = False
     # If me is in msg, create custom message for sender
     if '/me' in emote.lower():
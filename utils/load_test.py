@@ -0,0 +1,342 @@
+"""
+Headless load test harness.
+
+Creates Characters in Rooms without sessions and drives them with a scripted
+mix of commands through Character.execute_cmd.
+Deferred commands complete on a twisted task.Clock that is advanced one tick at
+a time, so a run is deterministic for a seed and does not wait on real time.
+
+Reports:
+    throughput, commands issued per wall second.
+    latency, wall time of execute_cmd per command key, in microseconds.
+        Parsing, targeting, requirements and deferring. Not the deferred action.
+    completion lag, wall time from the moment a tick's deferred completions became
+        due until each completion finished, in microseconds.
+        Completions due in the same tick run one after another, so this grows with
+        the number of Characters completing commands at the same time.
+
+Usage:
+    from utils import load_test
+    report = load_test.run_load_test(characters=50, rooms=5, seconds=120)
+    print(load_test.format_report(report))
+
+    Or step by step:
+        harness = load_test.LoadTest(characters=50, rooms=5, seed=1)
+        harness.build()
+        report = harness.run(seconds=120)
+        harness.cleanup()
+
+Notes:
+    Do not run against a running server. While running the task handler's clock is
+        replaced with a task.Clock, delays for real players would not complete.
+        Run it from a unit test or an evennia shell.
+    Characters waiting on a deferred command (busy or stunned) do not issue
+        commands, as a player would wait.
+    Latency and completion lag use utils.cmd_metrics.Histogram.
+        Command phases are also recorded in cmd_metrics while it is enabled, see cmd_metrics.enable
+
+Unit Tests:
+    commands.tests.TestLoadTest
+"""
+
+import random
+import time
+
+from evennia import create_object
+from twisted.internet import task
+
+from typeclasses.races import Human
+from typeclasses.rooms import Room
+from typeclasses.exits import Exit
+from typeclasses.objects import Object
+from utils.cmd_metrics import Histogram
+
+# (command template, weight)
+# {thing} is an object in every room, {target} another Character in the room and
+# {exit} an exit out of the room.
+COMMAND_MIX = (
+    ('look', 4),
+    ('say hello', 2),
+    ('get {thing}', 1),
+    ('drop {thing}', 1),
+    ('punch {target}', 2),
+    ('dodge', 1),
+    ('{exit}', 1),
+)
+# key of objects in every room, to get and drop
+THING_KEY = 'rock'
+# names of exits between rooms, rooms are linked in a ring
+EXIT_NAMES = ('north', 'south')
+# status types that keep a Character from issuing commands
+WAIT_STATUSES = ('busy', 'stunned')
+
+
+def _summary(histogram):
+    """Returns count, p50, p95 and p99 of a histogram."""
+    return {
+        'count': histogram.count,
+        'p50': histogram.percentile(50),
+        'p95': histogram.percentile(95),
+        'p99': histogram.percentile(99),
+    }
+
+
+class LoadTest:
+    """
+    A load test of simulated Characters.
+
+    Arguments:
+        characters (int): number of Characters to create.
+        rooms (int): number of Rooms to create, Characters are spread evenly among them.
+        mix (tuple): of (command template, weight) tuples, defaults to COMMAND_MIX
+        seed (int): seed of the random choices. The same seed results in the same commands.
+        tick (float): simulated seconds the clock advances between rounds of commands.
+        command_chance (float): chance each waiting Character issues a command each tick.
+
+    Attributes:
+        chars (list): Characters created by build.
+        rooms (list): Rooms created by build.
+        clock (task.Clock): the clock deferred commands complete on while running.
+    """
+
+    def __init__(self, characters=10, rooms=2, mix=None, seed=0, tick=0.5, command_chance=0.5):
+        self.character_count = characters
+        self.room_count = max(1, rooms)
+        self.mix = mix if mix else COMMAND_MIX
+        self.random = random.Random(seed)
+        self.tick = tick
+        self.command_chance = command_chance
+        self.chars = []
+        self.rooms = []
+        self.objects = []
+        self.clock = task.Clock()
+        self._old_clock = None
+        self._templates = [template for template, _ in self.mix]
+        self._weights = [weight for _, weight in self.mix]
+
+    def build(self):
+        """
+        Create the test world.
+            Rooms linked in a ring by exits, a THING_KEY object in each room and
+            the Characters spread evenly among the Rooms.
+        """
+        for number in range(self.room_count):
+            room = create_object(Room, key=f"load room {number}")
+            self.rooms.append(room)
+            self.objects.append(room)
+        if self.room_count > 1:
+            for number, room in enumerate(self.rooms):
+                for exit_name, step in zip(EXIT_NAMES, (1, -1)):
+                    destination = self.rooms[(number + step) % self.room_count]
+                    link = create_object(Exit, key=exit_name, location=room,
+                                         destination=destination)
+                    self.objects.append(link)
+        for room in self.rooms:
+            thing = create_object(Object, key=THING_KEY, location=room)
+            thing.targetable = True
+            self.objects.append(thing)
+        for number in range(self.character_count):
+            room = self.rooms[number % self.room_count]
+            char = create_object(Human, key=f"loader{number}", location=room, home=room)
+            char.usdesc = f"loader{number}"
+            self.chars.append(char)
+            self.objects.append(char)
+
+    def command(self, char):
+        """
+        Returns the next command a Character will issue.
+            A template from the mix is chosen by weight. If the template's
+            placeholder can not be filled, the Character looks instead.
+        """
+        template = self.random.choices(self._templates, self._weights)[0]
+        location = char.location
+        fields = {'thing': THING_KEY}
+        if '{target}' in template:
+            targets = [con for con in location.contents if con in self.chars and con != char]
+            if not targets:
+                return 'look'
+            fields['target'] = self.random.choice(targets).key
+        if '{exit}' in template:
+            exits = location.exits if location else None
+            if not exits:
+                return 'look'
+            fields['exit'] = self.random.choice(exits).key
+        return template.format(**fields)
+
+    def waiting(self, char):
+        """Returns True if the Character is waiting on a deferred command."""
+        return any(char.nattributes.has(status_type) for status_type in WAIT_STATUSES)
+
+    def run(self, seconds=60):
+        """
+        Run the load test.
+
+        Arguments:
+            seconds (float): simulated seconds to issue commands for.
+                Deferred commands still pending are then completed, and measured.
+
+        Returns:
+            report (dict): {
+                'characters': int, 'rooms': int,
+                'sim_seconds': float, 'wall_seconds': float,
+                'commands': int, 'throughput': float,  # commands per wall second
+                'waits': int,  # times a Character waited on a deferred command
+                'latency': {command key: {'count', 'p50', 'p95', 'p99'}},
+                'completion_lag': {'count', 'p50', 'p95', 'p99'}
+            }
+            Latency and completion lag are microseconds.
+        """
+        self.start()
+        try:
+            ticks = int(seconds / self.tick)
+            for _ in range(ticks):
+                for char in self.chars:
+                    if self.waiting(char):
+                        self.waits += 1
+                        continue
+                    if self.random.random() >= self.command_chance:
+                        continue
+                    self.issue(char, self.command(char))
+                self.advance(self.tick)
+            # complete deferred commands still pending
+            self.drain()
+        finally:
+            self.stop()
+        return self.report()
+
+    def start(self):
+        """
+        Start measuring.
+        Replaces the task handler's clock with this load test's clock.
+        """
+        from evennia.scripts.taskhandler import TASK_HANDLER
+        self._old_clock = TASK_HANDLER.clock
+        TASK_HANDLER.clock = self.clock
+        self.latency = dict()
+        self.completion_lag = Histogram()
+        self.commands = self.waits = 0
+        # ids of deferreds whose completion is already measured
+        self._tracked = set()
+        self._tick_start = 0.0
+        self._wall_start = time.perf_counter()
+        self._wall_seconds = 0.0
+
+    def stop(self):
+        """Stop measuring, restores the task handler's clock."""
+        from evennia.scripts.taskhandler import TASK_HANDLER
+        TASK_HANDLER.clock = self._old_clock
+        self._wall_seconds = time.perf_counter() - self._wall_start
+
+    def issue(self, char, raw_string):
+        """
+        Have a Character issue a command and measure the latency of execute_cmd.
+
+        Arguments:
+            char (Character): Character issuing the command.
+            raw_string (str): the command as a player would type it.
+        """
+        cmd_key = raw_string.split(' ', 1)[0]
+        start = time.perf_counter()
+        char.execute_cmd(raw_string)
+        elapsed = time.perf_counter() - start
+        histogram = self.latency.get(cmd_key)
+        if not histogram:
+            histogram = self.latency[cmd_key] = Histogram()
+        histogram.record(elapsed * 1000000)
+        self.commands += 1
+
+    def _record_lag(self, result):
+        """deferred callback, records the lag of a completion"""
+        self.completion_lag.record((time.perf_counter() - self._tick_start) * 1000000)
+        return result
+
+    def track_completions(self):
+        """Measure the completion of each new deferred command."""
+        for char in self.chars:
+            for status_type in WAIT_STATUSES:
+                status = char.nattributes.get(status_type)
+                if not status or not status.get('task'):
+                    continue
+                deferred = status['task'].get_deferred()
+                if deferred and id(deferred) not in self._tracked:
+                    self._tracked.add(id(deferred))
+                    deferred.addCallback(self._record_lag)
+
+    def advance(self, seconds):
+        """
+        Advance the clock, completing deferred commands that become due.
+
+        Arguments:
+            seconds (float): simulated seconds to advance.
+        """
+        self.track_completions()
+        self._tick_start = time.perf_counter()
+        self.clock.advance(seconds)
+
+    def drain(self):
+        """Advance the clock a tick at a time until no deferred commands are pending."""
+        while self.clock.getDelayedCalls():
+            self.advance(self.tick)
+
+    def report(self):
+        """Returns the report of the last run, see LoadTest.run"""
+        wall_seconds = self._wall_seconds
+        return {
+            'characters': len(self.chars),
+            'rooms': len(self.rooms),
+            'sim_seconds': self.clock.seconds(),
+            'wall_seconds': wall_seconds,
+            'commands': self.commands,
+            'throughput': self.commands / wall_seconds if wall_seconds else 0,
+            'waits': self.waits,
+            'latency': {key: _summary(histogram) for key, histogram in self.latency.items()},
+            'completion_lag': _summary(self.completion_lag),
+        }
+
+    def cleanup(self):
+        """Delete everything build created."""
+        for obj in reversed(self.objects):
+            if obj.pk:
+                obj.delete()
+        self.objects = []
+        self.chars = []
+        self.rooms = []
+
+
+def run_load_test(characters=10, rooms=2, seconds=60, **kwargs):
+    """
+    Build, run and clean up a load test.
+
+    Arguments:
+        characters (int): number of Characters to create.
+        rooms (int): number of Rooms to create.
+        seconds (float): simulated seconds to issue commands for.
+        kwargs: passed to LoadTest. IE: seed, tick, mix, command_chance
+
+    Returns:
+        report (dict): see LoadTest.run
+    """
+    harness = LoadTest(characters=characters, rooms=rooms, **kwargs)
+    harness.build()
+    try:
+        return harness.run(seconds=seconds)
+    finally:
+        harness.cleanup()
+
+
+def format_report(report):
+    """Returns a load test report as a readable string."""
+    lines = [
+        f"{report['characters']} characters in {report['rooms']} rooms, "
+        f"{report['sim_seconds']:.1f} simulated seconds in {report['wall_seconds']:.2f} wall seconds",
+        f"{report['commands']} commands, {report['throughput']:.1f} commands per second, "
+        f"{report['waits']} waits on deferred commands",
+        "latency (microseconds)",
+    ]
+    for cmd_key, summary in sorted(report['latency'].items()):
+        lines.append(f"    {cmd_key}: count {summary['count']}, p50 {summary['p50']}, "
+                     f"p95 {summary['p95']}, p99 {summary['p99']}")
+    lag = report['completion_lag']
+    lines.append(f"completion lag (microseconds): count {lag['count']}, p50 {lag['p50']}, "
+                 f"p95 {lag['p95']}, p99 {lag['p99']}")
+    return '\n'.join(lines)
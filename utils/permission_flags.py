@@ -0,0 +1,106 @@
+"""
+Cached permission flags and access checks, for hot paths.
+
+Permissions of an account or object are cached as a frozen set of lower case
+permission strings. Every cache is tagged with PERMISSION_VERSION, which is
+incremented each time any permission is added or removed through a
+PermFlagsHandler. A cache with an older version is rebuilt when next read.
+
+Usage:
+    if is_developer(char):  # the Character's account has the developer permission
+    if 'builder' in permission_flags(account):
+    idstr = f"(#{obj.id})" if obj.cached_access(looker, 'control') else ""
+
+Notes:
+    Account and all UniqueMud objects use PermFlagsHandler as their permissions handler.
+        typeclasses.accounts.Account and typeclasses.mixins.AllObjectsMixin
+    Permissions changed without the handler, directly on the database, are not
+        seen until the server reloads.
+    Access results are cached per object, see AllObjectsMixin.cached_access
+        Only locks whose lock functions depend on permissions alone are cached, PERMISSION_LOCKFUNCS
+        They are rebuilt when permissions change, the object's locks change,
+        the accessing Character's account changes or an account quells, commands.standard_cmds.CmdQuell
+
+Unit Tests:
+    typeclasses.tests.TestPermissionFlags
+"""
+
+import re
+
+from evennia.typeclasses.tags import PermissionHandler
+
+# incremented each time a permission is added or removed, invalidates all caches
+PERMISSION_VERSION = 0
+# lock functions whose result depends only on permissions and ids, their results can be cached
+PERMISSION_LOCKFUNCS = frozenset(('all', 'none', 'true', 'false', 'superuser', 'id', 'dbref',
+                                  'pid', 'pdbref', 'perm', 'perm_above', 'pperm', 'pperm_above'))
+# lock string: True if every lock function in it is in PERMISSION_LOCKFUNCS
+_PERMISSION_ONLY = dict()
+_LOCKFUNC_RE = re.compile(r"(\w+)\s*\(")
+
+
+def invalidate():
+    """Invalidate all cached permission flags and access results."""
+    global PERMISSION_VERSION
+    PERMISSION_VERSION += 1
+
+
+class PermFlagsHandler(PermissionHandler):
+    """
+    Permission handler that invalidates cached permission flags when permissions change.
+    """
+
+    def add(self, *args, **kwargs):
+        invalidate()
+        return super().add(*args, **kwargs)
+
+    def remove(self, *args, **kwargs):
+        invalidate()
+        return super().remove(*args, **kwargs)
+
+    def clear(self, *args, **kwargs):
+        invalidate()
+        return super().clear(*args, **kwargs)
+
+
+def permission_flags(entity):
+    """
+    Returns the permissions of an account or object as a frozen set of lower case strings.
+        Cached on the entity until any permission changes.
+
+    Arguments:
+        entity (Account or Object): anything with a permissions handler.
+    """
+    cached = getattr(entity, '_permission_flags', None)
+    if cached and cached[0] == PERMISSION_VERSION:
+        return cached[1]
+    flags = frozenset(perm.lower() for perm in entity.permissions.all())
+    entity._permission_flags = (PERMISSION_VERSION, flags)
+    return flags
+
+
+def is_developer(char):
+    """
+    Returns True if the Character's account has the developer permission.
+        Characters without an account are never developers.
+    """
+    account = getattr(char, 'account', None)
+    if not account or not hasattr(account, 'permissions'):
+        return False
+    return 'developer' in permission_flags(account)
+
+
+def permission_only(lock_string):
+    """
+    Returns True if every lock function in a lock string is in PERMISSION_LOCKFUNCS.
+        An empty lock string is permission only.
+
+    Arguments:
+        lock_string (str): a lock, IE: 'view:all()' or 'control:id(1) or perm(Admin)'
+    """
+    result = _PERMISSION_ONLY.get(lock_string)
+    if result is None:
+        result = all(func.lower() in PERMISSION_LOCKFUNCS
+                     for func in _LOCKFUNC_RE.findall(lock_string))
+        _PERMISSION_ONLY[lock_string] = result
+    return result
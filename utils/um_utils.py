@@ -3,6 +3,7 @@ This module contains misc small functions
 """
 from evennia.utils.logger import log_err
 from evennia.utils import utils
+from utils.permission_flags import is_developer
 
 
 def string_to_data(value=None):
@@ -112,11 +113,8 @@ def error_report(error_message, char=None):
     """
 
     if char:
-        perm_str = ""  # default permision string, incase the account is missions the permissions class
         if hasattr(char, 'account'):  # if there is an account attached to the Character
-            if hasattr(char.account, 'permissions'):
-                perm_str = str(char.account.permissions)  # get premissions in string form
-            if 'developer' in perm_str:  # if the user is a developer
+            if is_developer(char):  # if the user is a developer, from cached permission flags
                 dev_msg = f"|RError message:|n {error_message}|/This has |RNOT|n been logged. System detects you are a developer."
                 char.msg(dev_msg)
                 return_msg = dev_msg
@@ -15,9 +15,11 @@ from typeclasses.exits import Exit
 from typeclasses.rooms import Room
 from typeclasses.objects import Object
 from typeclasses.scripts import Script
+from typeclasses import scripts as um_scripts
 from typeclasses.equipment.wieldable import OneHandedWeapon
 from typeclasses.equipment import clothing
 from commands import developer_cmds
+from world import exp_ledger
 
 # set up signal here since we are not starting the server
 _RE = re.compile(r"^\+|-+\+|\+-+|--+|\|(?:\s|$)", re.MULTILINE)
@@ -53,8 +55,12 @@ class UniqueMudTest(EvenniaTest):
         """
         Sets up testing environment
         """
+        # discard the regeneration service cached by a previous test's database
+        um_scripts._REGENERATION_SERVICE = None
         # call inherited setUp
         super().setUp()
+        # discard experience left in the ledger by a previous test
+        exp_ledger.clear()
         # make character names something easy to tell apart,
         self.char1.usdesc = 'Char'
         self.char2.usdesc = 'Char2'
@@ -0,0 +1,295 @@
+"""
+Effects engine, damage over time and condition effects on Characters.
+
+Effects:
+    bleeding, from a body part. Sets the part's bleeding status, damages hp.
+    poison, sets the poisoned condition, damages hp.
+    sick, sets the sick condition, drains endurance.
+
+Every active effect on every Character is held in one priority queue, ordered by
+    the time of the effect's next tick.
+    One task handler delay is scheduled, for the earliest tick.
+    When it fires every due tick is processed together:
+        Damage is grouped per Character and stat, each stat is set once.
+        The writes of all Characters are done in one transaction.
+    With no active effects nothing is scheduled, idle effects cost nothing.
+
+Stacking, per effect type in EFFECT_TYPES:
+    'stack', adding an active effect adds a stack and refreshes its duration.
+        Damage is multiplied by the stacks, up to max_stacks.
+    'refresh', adding an active effect only refreshes its duration.
+
+Active effects are saved in Character.db.effects, as
+    {effect_key: {'type': str, 'part': str, 'stacks': int, 'expires': float}}
+    effect_key is the effect type, or 'type:part' for effects on a body part.
+    Character.at_init restores them to the queue after a reload.
+
+Usage:
+    effects.add_effect(char, 'bleeding', part='left_arm')
+    effects.add_effect(char, 'poison', duration=300)
+    effects.remove_effect(char, 'poison')
+
+Unit Tests:
+    world.tests.TestEffects
+"""
+
+import heapq
+import itertools
+
+from django.db import transaction
+from evennia import utils
+
+# effect type: settings
+#   interval, seconds between ticks.
+#   duration, default seconds an effect lasts.
+#   stat, name of the stat damaged each tick.
+#   damage, damage per tick per stack.
+#   stacking, 'stack' or 'refresh'
+#   max_stacks, maximum number of stacks.
+#   condition, Character condition set while the effect is active.
+#   part_status, body part status set while the effect is active.
+#   message, sent to the Character when the effect ticks.
+EFFECT_TYPES = {
+    'bleeding': {
+        'interval': 10, 'duration': 60, 'stat': 'hp', 'damage': 1,
+        'stacking': 'stack', 'max_stacks': 5,
+        'condition': None, 'part_status': 'bleeding',
+        'message': 'You are bleeding.',
+    },
+    'poison': {
+        'interval': 15, 'duration': 120, 'stat': 'hp', 'damage': 1,
+        'stacking': 'refresh', 'max_stacks': 1,
+        'condition': 'poisoned', 'part_status': None,
+        'message': 'You feel the poison in your veins.',
+    },
+    'sick': {
+        'interval': 30, 'duration': 600, 'stat': 'END', 'damage': 1,
+        'stacking': 'refresh', 'max_stacks': 1,
+        'condition': 'sick', 'part_status': None,
+        'message': 'You feel sick.',
+    },
+}
+
+# heap of (tick time, entry, Character id, effect_key)
+#   entry is a sequence number, matching the effect's entry while the tick is current
+_QUEUE = []
+_SEQUENCE = itertools.count()
+# Character id: {effect_key: effect}, effects in the queue
+ACTIVE = dict()
+# Character id: Character, Characters with active effects
+_CHARS = dict()
+# [tick time, task] of the scheduled delay, or [None, None]
+_TIMER = [None, None]
+
+
+def _now():
+    """Returns the current time of the task handler's clock."""
+    from evennia.scripts.taskhandler import TASK_HANDLER
+    return TASK_HANDLER.clock.seconds()
+
+
+def effect_key(effect_type, part=None):
+    """Returns the key of an effect, 'type' or 'type:part'"""
+    return f"{effect_type}:{part}" if part else effect_type
+
+
+def add_effect(char, effect_type, part=None, stacks=1, duration=None):
+    """
+    Start an effect on a Character, or stack it on an active effect.
+
+    Arguments:
+        char (Character): Character to affect.
+        effect_type (str): a key of EFFECT_TYPES. IE: 'bleeding'
+        part (str): body part the effect is on. IE: 'left_arm'
+        stacks (int): number of stacks to add.
+        duration (float): seconds the effect lasts, defaults to the effect type's duration.
+
+    Returns:
+        key (str): the effect's key, used to remove it.
+    """
+    settings = EFFECT_TYPES[effect_type]
+    key = effect_key(effect_type, part)
+    now = _now()
+    expires = now + (duration if duration else settings['duration'])
+    char_effects = ACTIVE.setdefault(char.id, dict())
+    _CHARS[char.id] = char
+    effect = char_effects.get(key)
+    if effect:  # the effect is active, apply stacking rules
+        if settings['stacking'] == 'stack':
+            effect['stacks'] = min(effect['stacks'] + stacks, settings['max_stacks'])
+        effect['expires'] = max(effect['expires'], expires)
+    else:
+        effect = {'type': effect_type, 'part': part,
+                  'stacks': min(stacks, settings['max_stacks']), 'expires': expires}
+        char_effects[key] = effect
+        _push(char.id, key, effect, now + settings['interval'])
+        _set_status(char, effect, True)
+    _save(char)
+    _schedule()
+    return key
+
+
+def remove_effect(char, key):
+    """
+    End an active effect.
+
+    Arguments:
+        char (Character): the Character affected.
+        key (str): key of the effect, IE: 'poison' or 'bleeding:left_arm'
+
+    Returns:
+        removed (bool): True if the effect was active.
+    """
+    char_effects = ACTIVE.get(char.id, {})
+    effect = char_effects.pop(key, None)
+    if not effect:
+        return False
+    _set_status(char, effect, False)
+    if not char_effects:
+        ACTIVE.pop(char.id, None)
+        _CHARS.pop(char.id, None)
+    _save(char)
+    # the queue entry is skipped when it comes due
+    return True
+
+
+def get_effects(char):
+    """Returns a dictionary of the Character's active effects, effect_key: effect"""
+    return dict(ACTIVE.get(char.id, {}))
+
+
+def restore_effects(char):
+    """
+    Queue the effects saved on a Character.
+        Called in Character.at_init, after a reload.
+        Effects that expired while unloaded are removed.
+    """
+    saved = char.attributes.get('effects')
+    if not saved or char.id in ACTIVE:
+        return
+    now = _now()
+    char_effects = ACTIVE.setdefault(char.id, dict())
+    _CHARS[char.id] = char
+    for key, effect in saved.items():
+        effect = dict(effect)
+        if effect['expires'] <= now:
+            _set_status(char, effect, False)
+            continue
+        char_effects[key] = effect
+        _push(char.id, key, effect, now + EFFECT_TYPES[effect['type']]['interval'])
+    if not char_effects:
+        ACTIVE.pop(char.id, None)
+        _CHARS.pop(char.id, None)
+    _save(char)
+    _schedule()
+
+
+def process_due():
+    """
+    Process every effect tick that is due.
+        Called by the scheduled delay.
+        Damage is grouped per Character and stat. Expired effects are removed.
+    """
+    _TIMER[0] = None
+    task, _TIMER[1] = _TIMER[1], None
+    if task:
+        task.remove()
+    now = _now()
+    # Character id: {stat name: damage}
+    damage = dict()
+    expired = []
+    while _QUEUE and _QUEUE[0][0] <= now:
+        tick_time, entry, char_id, key = heapq.heappop(_QUEUE)
+        effect = ACTIVE.get(char_id, {}).get(key)
+        # removed or re-added effects leave stale entries
+        if not effect or effect['entry'] != entry:
+            continue
+        settings = EFFECT_TYPES[effect['type']]
+        char_damage = damage.setdefault(char_id, dict())
+        char_damage[settings['stat']] = (char_damage.get(settings['stat'], 0)
+                                         + settings['damage'] * effect['stacks'])
+        if effect['expires'] < tick_time + settings['interval']:
+            expired.append((char_id, key))
+        else:
+            _push(char_id, key, effect, tick_time + settings['interval'])
+    with transaction.atomic():
+        for char_id, stats_damage in damage.items():
+            char = _CHARS.get(char_id)
+            if not char or not char.pk:  # the Character was deleted
+                ACTIVE.pop(char_id, None)
+                _CHARS.pop(char_id, None)
+                continue
+            if char.condition.dead:
+                for key in list(ACTIVE.get(char_id, {})):
+                    remove_effect(char, key)
+                continue
+            for stat_name, amount in stats_damage.items():
+                stat = getattr(char, stat_name)
+                stat.set(stat - amount)
+            messages = {EFFECT_TYPES[effect['type']]['message']
+                        for effect in ACTIVE.get(char_id, {}).values()}
+            char.msg(' '.join(sorted(messages)))
+        for char_id, key in expired:
+            char = _CHARS.get(char_id)
+            if char and char.pk:
+                remove_effect(char, key)
+    _schedule()
+
+
+def _push(char_id, key, effect, tick_time):
+    """Queue an effect's next tick."""
+    effect['entry'] = next(_SEQUENCE)  # identifies the effect's current queue entry
+    heapq.heappush(_QUEUE, (tick_time, effect['entry'], char_id, key))
+
+
+def _schedule():
+    """
+    Schedule a delay for the earliest tick in the queue.
+        Cancels the delay if the queue is empty.
+    """
+    # drop stale entries at the front of the queue
+    while _QUEUE:
+        _, entry, char_id, key = _QUEUE[0]
+        effect = ACTIVE.get(char_id, {}).get(key)
+        if effect and effect['entry'] == entry:
+            break
+        heapq.heappop(_QUEUE)
+    next_tick = _QUEUE[0][0] if _QUEUE else None
+    if next_tick == _TIMER[0]:
+        return
+    if _TIMER[1]:
+        _TIMER[1].cancel()
+        _TIMER[1].remove()
+    if next_tick is None:
+        _TIMER[0] = _TIMER[1] = None
+        return
+    _TIMER[0] = next_tick
+    _TIMER[1] = utils.delay(max(0, next_tick - _now()), process_due)
+
+
+def _set_status(char, effect, state):
+    """
+    Set or clear the condition or body part status of an effect.
+        A status is only cleared if no other active effect sets it.
+    """
+    settings = EFFECT_TYPES[effect['type']]
+    others = [other for other in ACTIVE.get(char.id, {}).values()
+              if other is not effect and other['type'] == effect['type']]
+    if settings['condition']:
+        if state or not others:
+            setattr(char.condition, settings['condition'], state)
+    if settings['part_status'] and effect['part']:
+        part = getattr(char.body, effect['part'], None)
+        if part is not None:
+            if state or not [other for other in others if other['part'] == effect['part']]:
+                setattr(part, settings['part_status'], state)
+
+
+def _save(char):
+    """Save the Character's active effects, without their queue times."""
+    char_effects = ACTIVE.get(char.id)
+    if char_effects:
+        char.db.effects = {key: {name: value for name, value in effect.items() if name != 'entry'}
+                           for key, effect in char_effects.items()}
+    elif char.attributes.has('effects'):
+        char.attributes.remove('effects')
@@ -0,0 +1,161 @@
+"""
+Experience ledger, experience gained by Characters is held in memory and written in batches.
+
+Command.gain_exp adds experience to the ledger instead of writing the skill's
+    <skill_name>_exp Attribute on every completed command.
+    Pending experience is written to the database:
+        FLUSH_WINDOW seconds after the first experience gained since the last flush.
+        When a Character is unpuppeted, Character.at_post_unpuppet
+        When the server stops or reloads, server.conf.at_server_startstop.at_server_stop
+    All pending experience is written in one transaction.
+    A crash loses at most FLUSH_WINDOW seconds of experience.
+
+Reading experience:
+    The experience in a Character's skills does not include pending experience.
+    Use get_exp to get the total, stored and pending.
+    Rank thresholds are checked against the total, world.rules.skills.rank_increasable
+    The stored experience is read once, on a skill's first gain since the last flush.
+        Later gains read only the ledger. Experience written directly to a skill
+        while it has pending experience is overwritten by the flush.
+
+Writing experience:
+    Each skill is written as its stored experience plus its pending experience.
+    Entries are removed from the ledger only after the transaction commits.
+        A flush that fails keeps them, the next flush writes the same totals again.
+
+Usage:
+    total = exp_ledger.add_exp(char, 'unarmed', 'punch', 3.0)
+    total = exp_ledger.get_exp(char, 'unarmed', 'punch')
+    exp_ledger.flush(char)  # write the Character's pending experience
+    exp_ledger.flush()  # write all pending experience
+
+Unit Tests:
+    world.tests.TestExpLedger
+"""
+
+from django.conf import settings
+from django.db import transaction
+from evennia import utils
+
+# seconds pending experience is held before it is written to the database
+#   set EXP_FLUSH_WINDOW in server/conf/settings.py to change it.
+#   0 writes experience as it is gained.
+FLUSH_WINDOW = getattr(settings, 'EXP_FLUSH_WINDOW', 30)
+
+# Character id: {(skill set name, skill name): [stored experience, pending experience]}
+PENDING = dict()
+# Character id: Character, Characters with pending experience
+_CHARS = dict()
+# the scheduled flush task, or None
+_TIMER = [None]
+
+
+def add_exp(char, skill_set_name, skill_name, amount):
+    """
+    Add experience to a Character's skill.
+
+    Arguments:
+        char (Character): the Character gaining experience.
+        skill_set_name (str): name of the skill set, IE: 'unarmed'
+        skill_name (str): name of the skill, IE: 'punch'
+        amount (float): experience gained.
+
+    Returns:
+        total (float): the skill's experience, stored and pending.
+            None if the Character does not have the skill, nothing is added.
+    """
+    char_pending = PENDING.get(char.id)
+    key = (skill_set_name, skill_name)
+    entry = char_pending.get(key) if char_pending else None
+    if entry is None:  # first gain since the last flush, read the stored experience
+        skill_set = getattr(char.skills, skill_set_name, None)
+        if not skill_set or skill_name+'_exp' not in skill_set:
+            return None
+        entry = [skill_set[skill_name+'_exp'], 0]
+        PENDING.setdefault(char.id, dict())[key] = entry
+        _CHARS[char.id] = char
+    entry[1] += amount
+    total = entry[0] + entry[1]
+    if FLUSH_WINDOW <= 0:
+        flush(char)
+    elif not _TIMER[0]:
+        _TIMER[0] = utils.delay(FLUSH_WINDOW, _flush_due)
+    return total
+
+
+def get_exp(char, skill_set_name, skill_name):
+    """
+    Returns a skill's experience, stored and pending.
+
+    Arguments:
+        char (Character): the Character to check.
+        skill_set_name (str): name of the skill set, IE: 'unarmed'
+        skill_name (str): name of the skill, IE: 'punch'
+
+    Notes:
+        Skills with pending experience are read from the ledger only.
+    """
+    entry = PENDING.get(char.id, {}).get((skill_set_name, skill_name))
+    if entry is not None:
+        return entry[0] + entry[1]
+    skill_set = getattr(char.skills, skill_set_name)
+    return skill_set[skill_name+'_exp']
+
+
+def flush(char=None):
+    """
+    Write pending experience to the database.
+
+    Arguments:
+        char (Character, optional): write only this Character's pending experience.
+            Writes all pending experience if not passed.
+
+    Returns:
+        written (int): number of skills written.
+
+    Notes:
+        Ledger entries are removed after the transaction commits.
+            If it raises, they are kept for the next flush.
+    """
+    char_ids = [char.id] if char else list(PENDING)
+    written = 0
+    with transaction.atomic():
+        for char_id in char_ids:
+            char_pending = PENDING.get(char_id)
+            pending_char = _CHARS.get(char_id)
+            if not char_pending or not pending_char or not pending_char.pk:
+                continue  # the Character was deleted
+            for (skill_set_name, skill_name), (stored, amount) in char_pending.items():
+                skill_set = getattr(pending_char.skills, skill_set_name)
+                skill_set[skill_name+'_exp'] = stored + amount
+                written += 1
+    # the transaction committed, the entries are written
+    for char_id in char_ids:
+        PENDING.pop(char_id, None)
+        _CHARS.pop(char_id, None)
+    if not PENDING:
+        _cancel_timer()
+    return written
+
+
+def clear():
+    """Discard all pending experience, without writing it."""
+    PENDING.clear()
+    _CHARS.clear()
+    _cancel_timer()
+
+
+def _flush_due():
+    """Called FLUSH_WINDOW seconds after experience was added to an empty ledger."""
+    task, _TIMER[0] = _TIMER[0], None
+    if task:
+        task.remove()
+    flush()
+
+
+def _cancel_timer():
+    """Cancel the scheduled flush."""
+    task, _TIMER[0] = _TIMER[0], None
+    if task:
+        task.cancel()
+        task.remove()
@@ -4,7 +4,6 @@ Contains functions intended for use with combat commands
 
 from random import randint
 from evennia.utils.logger import log_info, log_warn
-from evennia.utils import inherits_from
 from utils import um_utils
 from world.rules import skills
 
@@ -54,7 +53,7 @@ def targeted_action(char, target, status_type='busy', log=False):
     action_result = action_roll(char, log)
     # only roll an evade if the target is a Character
     evade_result = EVADE_MIN  # default evade for non Character Objects
-    if inherits_from(target, 'typeclasses.characters.Character'):
+    if getattr(target, 'is_character', False):
         evade_result = evade_roll(target, action_cmd.evade_mod_stat, log)
     if log:
         log_info(f'actions.targeted_action, char id {char.id}: ' \
@@ -44,7 +44,7 @@ Notes
 from random import randint
 from evennia.utils.logger import log_info, log_warn
 from utils.um_utils import error_report
-from world.rules.stats import STATS, STAT_MAP_DICT
+from world.rules.stats import STATS, STAT_MAP_DICT, uniform_sum
 
 # a mapping of damage types and full names
 MAP_DICT = {
@@ -255,6 +255,21 @@ def get_dmg_after_dr(command, dmg_dealt=None, max_defense=False, body_part=None,
     return result
 
 
+def restoration_total(rolls, restoration_modifier=0):
+    """
+    Get the total of a number of restoration_roll calls.
+        Used to catch up on health a Character missed while idle.
+
+    Arguments:
+        rolls (int): number of restoration rolls to total.
+        restoration_modifier=0, gets added to the max number that can be rolled.
+    """
+    restoration_max = 4 + restoration_modifier
+    if restoration_max < 1:  # restoration max can not be less than 1
+        restoration_max = 1
+    return uniform_sum(rolls, 1, restoration_max)
+
+
 def restoration_roll(restoration_modifier=0):
     """
     Get a number to restore health on an object
@@ -1,6 +1,9 @@
 import math
+from collections import namedtuple
 
-from evennia.objects.models import ObjectDB
+from evennia.utils.utils import class_from_module
+
+from world import exp_ledger
 
 """
 Variables used to describe UM skills.
@@ -91,6 +94,22 @@ SKILLS = {
     'one_handed': tuple(ONE_HANDED)+('skill_points',)
 }
 
+# every skill name, in the order skills are shown
+SKILL_NAMES = EVASION + UNARMED + ONE_HANDED
+
+# command sets holding the command of each skill, read by build_skill_registry
+SKILL_CMDSETS = (
+    'commands.combat.evasion.EvasionCmdSet',
+    'commands.combat.unarmed.UnarmedCmdSet',
+    'commands.combat.one_handed.OneHandedCmdSet',
+)
+
+# metadata of a skill, values of SKILL_REGISTRY
+SkillInfo = namedtuple('SkillInfo', ('skill_set', 'cmd_class', 'learn_diff', 'comp_diff'))
+
+# skill name: SkillInfo, built once by build_skill_registry
+SKILL_REGISTRY = dict()
+
 # this is created in function rank_requirement
 # It is added to as rank requirements are requested.
 _RANK_REQUIREMENTS = {
@@ -107,6 +126,119 @@ _RANK_REQUIREMENTS = {
 }
 
 
+def build_skill_registry():
+    """
+    Build SKILL_REGISTRY from the commands in SKILL_CMDSETS.
+        Called at server start, and by get_skill if the registry is empty.
+        Commands are instanced once, to read learn_diff and comp_diff.
+
+    Returns:
+        registry (dict): SKILL_REGISTRY, skill name: SkillInfo
+    """
+    # skill name: skill set name
+    skill_sets = {skill_name: skill_set_name for skill_set_name, skill_names in SKILLS.items()
+                  for skill_name in skill_names if skill_name != 'skill_points'}
+    SKILL_REGISTRY.clear()
+    for cmdset_path in SKILL_CMDSETS:
+        cmdset = class_from_module(cmdset_path)()
+        for cmd in cmdset.commands:
+            skill_set_name = skill_sets.get(cmd.skill_name)
+            if skill_set_name:
+                SKILL_REGISTRY[cmd.skill_name] = SkillInfo(skill_set_name, type(cmd),
+                                                           cmd.learn_diff, cmd.comp_diff)
+    return SKILL_REGISTRY
+
+
+def get_skill(skill_name):
+    """
+    Returns the SkillInfo of a skill, or None if it is not a skill.
+        SkillInfo(skill_set, cmd_class, learn_diff, comp_diff)
+
+    Usage:
+        skills.get_skill('punch').learn_diff
+    """
+    if not SKILL_REGISTRY:
+        build_skill_registry()
+    return SKILL_REGISTRY.get(skill_name)
+
+
+def rank_increasable(char, skill_name):
+    """
+    Returns True if the Character can learn the next rank of a skill.
+        Rank 0 skills are purchased with the skill set's skill points.
+        Other ranks require experience in the skill, including experience pending
+            in world.exp_ledger
+
+    Arguments:
+        char (Character): the Character to check.
+        skill_name (str): name of the skill, IE: 'punch'
+    """
+    skill_info = get_skill(skill_name)
+    skill_set = getattr(char.skills, skill_info.skill_set)
+    ranks = skill_set[skill_name]
+    exp_required = rank_requirement(ranks+1, skill_info.learn_diff)
+    if ranks == 0:
+        return skill_set['skill_points'] >= exp_required
+    return exp_ledger.get_exp(char, skill_info.skill_set, skill_name) >= exp_required
+
+
+def find_increasable(char):
+    """
+    Returns a set of the skill names the Character can learn a new rank in.
+        Reads every skill, used to build Character.increasable_skills
+    """
+    return {skill_name for skill_name in SKILL_NAMES if rank_increasable(char, skill_name)}
+
+
+def update_increasable(char, skill_name, increasable=None):
+    """
+    Update a skill in the Character's increasable_skills set.
+        Called by Command.gain_exp, learn and grant_skill_points.
+        Character.at_increasable_skills_change is called if the set changed.
+
+    Arguments:
+        char (Character): the Character to update.
+        skill_name (str): name of the skill, IE: 'punch'
+        increasable (bool, optional): True if the skill is ready for a new rank.
+            Checked with rank_increasable if not passed.
+
+    Returns:
+        changed (bool): True if the set changed.
+    """
+    if increasable is None:
+        increasable = rank_increasable(char, skill_name)
+    increasable_skills = char.increasable_skills
+    if increasable == (skill_name in increasable_skills):
+        return False
+    if increasable:
+        increasable_skills.add(skill_name)
+    else:
+        increasable_skills.discard(skill_name)
+    char.at_increasable_skills_change()
+    return True
+
+
+def grant_skill_points(char, skill_set_name, points):
+    """
+    Give a Character skill points in a skill set.
+        Updates the Character's increasable skills.
+
+    Arguments:
+        char (Character): the Character receiving the skill points.
+        skill_set_name (str): name of the skill set, IE: 'unarmed'
+        points (int): number of skill points to add, negative numbers remove points.
+
+    Returns:
+        skill_points (int): the skill set's skill points after the grant.
+    """
+    skill_set = getattr(char.skills, skill_set_name)
+    skill_set['skill_points'] += points
+    for skill_name in SKILLS[skill_set_name]:
+        if skill_name != 'skill_points' and skill_set[skill_name] == 0:
+            update_increasable(char, skill_name)
+    return skill_set['skill_points']
+
+
 def cmd_diff_mod(cmd_comp_diff, skill_ranks):
     """
     Arguments:
@@ -266,22 +398,13 @@ def learn_time(char, skill_name=False, rank=False, learn_diff=False):
 
     """
     if skill_name:
-        # get an instance of the skill set the skill is in.
-        for skill_set_name in char.skills.skills:
-            skill_set = getattr(char.skills, skill_set_name, False)
-            if skill_name in skill_set:
-                break
-        # get an instance of the command
-        for cmd_set in char.cmdset.get():
-            cmd_inst = cmd_set.get(skill_name)
-            if cmd_inst:
-                continue
-    rank = rank if rank else skill_set[skill_name] + 1
+        skill_info = get_skill(skill_name)
+        if not rank:
+            rank = getattr(char.skills, skill_info.skill_set)[skill_name] + 1
+        if not learn_diff:
+            learn_diff = skill_info.learn_diff
     # get base exp required by rank and learning difficulty
-    if learn_diff:
-        exp_required = rank_requirement(rank, learn_diff)
-    else:
-        exp_required = rank_requirement(rank, cmd_inst.learn_diff)
+    exp_required = rank_requirement(rank, learn_diff)
     # calculate the learning time required
     if rank < 10:
         time_required = exp_required * 3
@@ -298,26 +421,29 @@ def learn_time(char, skill_name=False, rank=False, learn_diff=False):
     return time_required
 
 
-def learn(char_dbref, skill_name):
+def learn(char, skill_name):
     """Cause a Character to learn a new skil rank.
 
-    Made to survive serialization into database.
+    Called by the learning queue, typeclasses.scripts.LearningQueue, when learning is due.
 
     Args:
-        char_dbref (str): the db_ref of the Character learning a new skill rank.
+        char (Character or str): the Character learning a new skill rank.
+            A dbref string is accepted, from learning tasks saved before the learning queue.
         skill_name (str): The skill the Character is learning.
 
     Returns:
         finished (True): Returns true to support twisted's deferred chain methods.
     """
-    # get a reference of the Character
-    char = ObjectDB.objects.object_search(char_dbref)
-    char = char[0]
+    if isinstance(char, str):  # resolve the Character by id, from memory when loaded
+        from typeclasses.scripts import resolve_objects
+        char_id = int(char.lstrip('#'))
+        char = resolve_objects((char_id,)).get(char_id)
+        if char is None:
+            return True
     # Get a reference of the skill set and increase the skill
-    for skill_set_name, skill_names in SKILLS.items():
-        if skill_name in skill_names:
-            skill_set = getattr(char.skills, skill_set_name, False)
-            skill_set[skill_name] += 1
+    skill_set = getattr(char.skills, get_skill(skill_name).skill_set)
+    skill_set[skill_name] += 1
+    update_increasable(char, skill_name)
     # remove the learning dictionary from the character.
     del char.condition.learning
     return True
@@ -7,10 +7,13 @@ Contains all equations for stat modifiers.
 All functions have been documented in their docstrings.
 """
 
-from random import randint
+from random import randint, gauss
 import math
 from evennia.utils.logger import log_info
 
+# number of rolls summed one by one in uniform_sum, larger sums are sampled
+EXACT_SUM_LIMIT = 20
+
 # a mapping of stat type and full names
 STAT_MAP_DICT = {
     'STR':  'strength',
@@ -468,6 +471,38 @@ def purchase_mod(caller, log=False):
     return purchase_modifier
 
 
+def restoration_total(rolls, restoration_modifier=0):
+    """
+    Get the total of a number of restoration_roll calls.
+        Used to catch up on restoration a Character missed while idle.
+
+    Arguments:
+        rolls (int): number of restoration rolls to total.
+        restoration_modifier=0, gets added to the max number that can be rolled.
+    """
+    restoration_max = 1 + restoration_modifier
+    if restoration_max < 1:  # restoration max can not be less than 1
+        restoration_max = 1
+    return uniform_sum(rolls, 0, restoration_max)
+
+
+def uniform_sum(count, low, high):
+    """
+    Returns the sum of count random whole numbers from low to high.
+
+    Notes:
+        Up to EXACT_SUM_LIMIT numbers are rolled individually.
+        Above that the sum is sampled from a normal distribution with the
+            same mean and variance as the sum, kept within the possible range.
+    """
+    if count <= EXACT_SUM_LIMIT:
+        return sum(randint(low, high) for _ in range(count))
+    mean = count * (low + high) / 2
+    variance = count * ((high - low + 1) ** 2 - 1) / 12
+    total = round(gauss(mean, math.sqrt(variance)))
+    return min(max(total, count * low), count * high)
+
+
 def restoration_roll(restoration_modifier=0):
     """
     Get a number to restore a Characte stat.
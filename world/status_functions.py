@@ -22,6 +22,7 @@ Unit testing for these functions is done in the commands unit test.
 import time
 import weakref
 from evennia import utils
+from utils import cmd_metrics, cmd_profiler
 
 
 STATUS_TYPES = ('stunned', 'busy')
@@ -131,6 +132,15 @@ def complete(char, status_type='busy', complete_cmd=True):
     if not status:
         return False
 
+    # measure completion under the key of the command completed, utils.cmd_metrics
+    cmd = status['cmd']
+    with cmd_metrics.measure(cmd.key if cmd else None, 'completion'):
+        return _complete(char, status, status_type, complete_cmd)
+
+
+def _complete(char, status, status_type, complete_cmd):
+    """Completes a deferred status, called by complete."""
+
     # get the status' task
     task = status['task']
 
@@ -154,12 +164,20 @@ def complete(char, status_type='busy', complete_cmd=True):
 
         # run the deferred command if specified
         if complete_cmd and cmd:
+            # resume a profile of the command, utils.cmd_profiler
+            if cmd_profiler.SESSION:
+                cmd_profiler.start(cmd)
             # check all command requirements
             if cmd.requirements(basic=True, custom=True, target=True):
-                cmd_successful = cmd.deferred_action()  # run the action
-                # Run command completion tasks. Evasion cmds do this in actions.evade_roll
-                if cmd.cmd_type != 'evasion' and cmd_successful:
-                    cmd.def_act_comp()
+                with cmd_metrics.measure(cmd.key, 'deferred_action'):
+                    cmd_successful = cmd.deferred_action()  # run the action
+                    # Run command completion tasks. Evasion cmds do this in actions.evade_roll
+                    if cmd.cmd_type != 'evasion' and cmd_successful:
+                        cmd.def_act_comp()
+
+        # the deferred command's run is complete or was cancelled, utils.cmd_profiler
+        if cmd and cmd_profiler.SESSION:
+            cmd_profiler.stop(cmd, run_complete=True)
 
         # remove the deferred task
         task.remove()
@@ -16,7 +16,7 @@ from utils import um_utils
 from utils.unit_test_resources import UniqueMudCmdTest
 from world.rules.stats import STATS
 from world.rules import skills
-from world import status_functions
+from world import status_functions, effects, exp_ledger
 from commands.command import Command
 
 
@@ -178,6 +178,30 @@ class TestSkills(CommandTest):
         for learn_diff in skills. DIFFICULTY_LEVELS.values():
             self.assertEqual(len(skills._RANK_REQUIREMENTS[learn_diff]), 4)
 
+    def test_skill_registry(self):
+        """Test the skill registry, world.rules.skills.SKILL_REGISTRY"""
+        from commands.combat.unarmed import CmdPunch
+        registry = skills.build_skill_registry()
+        # every skill in SKILLS is registered
+        for skill_set_name, skill_names in skills.SKILLS.items():
+            for skill_name in skill_names:
+                if skill_name == 'skill_points':
+                    continue
+                self.assertEqual(registry[skill_name].skill_set, skill_set_name)
+        punch = skills.get_skill('punch')
+        self.assertEqual(punch.skill_set, 'unarmed')
+        self.assertIs(punch.cmd_class, CmdPunch)
+        self.assertEqual(punch.learn_diff, CmdPunch().learn_diff)
+        self.assertEqual(punch.comp_diff, CmdPunch().comp_diff)
+        self.assertIsNone(skills.get_skill('not_a_skill'))
+        # learn_time reads the registry, without the Character's cmdsets
+        self.char1.skills.unarmed.punch = 1
+        self.assertEqual(skills.learn_time(self.char1, 'punch'),
+                         skills.learn_time(self.char1, rank=2, learn_diff=punch.learn_diff))
+        # get_skill builds an empty registry
+        skills.SKILL_REGISTRY.clear()
+        self.assertEqual(skills.get_skill('punch'), punch)
+
 
 class TestUtils(UniqueMudCmdTest):
     """
@@ -643,3 +667,88 @@ class TestStatusFunctions(UniqueMudCmdTest):
 
             # verify the status no longer exists
             self.assertFalse(self.char1.get_status(status_type))
+
+
+class TestEffects(UniqueMudCmdTest):
+
+    def test_effects(self):
+        char = self.char1
+        clock = self.task_handler.clock
+        # bleeding sets the body part's status
+        key = effects.add_effect(char, 'bleeding', part='left_arm')
+        self.assertEqual(key, 'bleeding:left_arm')
+        self.assertTrue(char.body.left_arm.bleeding)
+        self.assertTrue(char.attributes.has('effects'))
+        # one tick does the effect's damage
+        char.hp = 50
+        clock.advance(10)
+        self.assertEqual(char.hp, 49)
+        # bleeding stacks, damage is multiplied by the stacks
+        effects.add_effect(char, 'bleeding', part='left_arm')
+        self.assertEqual(effects.get_effects(char)[key]['stacks'], 2)
+        char.hp = 50
+        clock.advance(10)
+        self.assertEqual(char.hp, 48)
+        # poison refreshes, it does not stack
+        effects.add_effect(char, 'poison')
+        self.assertTrue(char.condition.poisoned)
+        effects.add_effect(char, 'poison')
+        self.assertEqual(effects.get_effects(char)['poison']['stacks'], 1)
+        # both effects tick
+        char.hp = 50
+        clock.advance(15)
+        self.assertEqual(char.hp, 47)
+        # removing an effect clears its status
+        self.assertTrue(effects.remove_effect(char, 'poison'))
+        self.assertFalse(char.condition.poisoned)
+        self.assertFalse(effects.remove_effect(char, 'poison'))
+        # effects expire, nothing is scheduled without effects
+        clock.advance(120)
+        self.assertFalse(effects.get_effects(char))
+        self.assertFalse(char.body.left_arm.bleeding)
+        self.assertIsNone(effects._TIMER[1])
+        self.assertFalse(char.attributes.has('effects'))
+
+
+class TestExpLedger(UniqueMudCmdTest):
+
+    def test_exp_ledger(self):
+        char = self.char1
+        punch = char.skills.unarmed
+        # experience is held in memory
+        self.assertEqual(exp_ledger.add_exp(char, 'unarmed', 'punch', 3), 3)
+        self.assertEqual(exp_ledger.add_exp(char, 'unarmed', 'punch', 2), 5)
+        self.assertEqual(punch.punch_exp, 0)
+        self.assertEqual(exp_ledger.get_exp(char, 'unarmed', 'punch'), 5)
+        self.assertIsNotNone(exp_ledger._TIMER[0])
+        # the stored experience is read once, later gains read the ledger
+        with mock.patch.object(type(char), 'skills', new_callable=mock.PropertyMock) as char_skills:
+            self.assertEqual(exp_ledger.add_exp(char, 'unarmed', 'punch', 1), 6)
+            char_skills.assert_not_called()
+        # thresholds see pending experience
+        exp_ledger.add_exp(char, 'unarmed', 'punch', 595)
+        self.assertTrue(skills.rank_increasable(char, 'punch'))
+        # the ledger is written after the flush window
+        self.task_handler.clock.advance(exp_ledger.FLUSH_WINDOW)
+        self.assertEqual(punch.punch_exp, 601)
+        self.assertFalse(exp_ledger.PENDING)
+        self.assertIsNone(exp_ledger._TIMER[0])
+        # flush writes a single Character
+        exp_ledger.add_exp(char, 'unarmed', 'kick', 4)
+        exp_ledger.add_exp(self.char2, 'evasion', 'dodge', 1)
+        self.assertEqual(exp_ledger.flush(char), 1)
+        self.assertEqual(punch.kick_exp, 4)
+        self.assertEqual(self.char2.skills.evasion.dodge_exp, 0)
+        # unpuppeting writes the Character's experience
+        self.char2.at_post_unpuppet(self.account)
+        self.assertEqual(self.char2.skills.evasion.dodge_exp, 1)
+        self.assertIsNone(exp_ledger._TIMER[0])
+        # a flush that fails keeps the ledger entries
+        self.assertEqual(exp_ledger.add_exp(char, 'unarmed', 'kick', 4), 8)
+        with mock.patch.object(type(punch), '__setitem__', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                exp_ledger.flush(char)
+        self.assertEqual(exp_ledger.get_exp(char, 'unarmed', 'kick'), 8)
+        # clear discards pending experience
+        exp_ledger.clear()
+        self.assertEqual(exp_ledger.get_exp(char, 'unarmed', 'kick'), 4)